@@ -0,0 +1,265 @@
+# Arquivo: benchmarks/fixture_server.py
+"""
+Servidor local de sites sintéticos para os benchmarks.
+
+Cada site roda em uma porta própria (os módulos usam caminhos absolutos como /favicon.ico)
+e é gerado de forma determinística a partir de uma especificação: número de páginas,
+itens de menu, links, imagens, breadcrumbs, latência, taxa de erros e endpoints que
+rejeitam HEAD. Também há substitutos locais das APIs do W3C.
+"""
+import asyncio
+import json
+import random
+import struct
+import zlib
+
+from aiohttp import web
+
+DEFAULT_SITE_SPEC = {
+    "pages": 20,               # páginas internas (/pagina-N), listadas no sitemap
+    "menu_items": 8,           # links do menu principal
+    "anchors": 100,            # links na home (além do menu)
+    "images": 30,              # imagens na home
+    "footer_images": 5,        # imagens no <footer> (com loading="lazy")
+    "breadcrumbs": True,       # JSON-LD BreadcrumbList nas páginas internas
+    "latency_ms": 20,          # latência média por resposta
+    "latency_jitter_ms": 10,   # desvio padrão da latência
+    "error_rate": 0.05,        # fração de links/imagens que apontam para 404
+    "server_error_rate": 0.0,  # fração de respostas que viram 503 aleatoriamente
+    "head_reject_rate": 0.1,   # fração de links para endpoints que respondem 405 ao HEAD
+    "unique_anchors": False,   # cada link da home com URL própria (?ref=N), sem repetições
+    "seed": 42,
+}
+
+
+def make_site_spec(**overrides):
+    spec = dict(DEFAULT_SITE_SPEC)
+    unknown = set(overrides) - set(spec)
+    if unknown:
+        raise ValueError(f"Parâmetros desconhecidos para o site sintético: {', '.join(sorted(unknown))}")
+    spec.update(overrides)
+    return spec
+
+
+def _png(width, height):
+    """Gera um PNG válido (todo branco) sem depender do Pillow."""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+    raw = b''.join(b'\x00' + b'\xff' * (width * 3) for _ in range(height))
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw)) + chunk(b'IEND', b''))
+
+
+FAVICON_PNG = _png(32, 32)
+IMAGE_PNG = _png(8, 8)
+
+
+class SyntheticSite:
+    """Um site sintético servido por uma aplicação aiohttp, com contadores de requisições."""
+
+    def __init__(self, spec=None):
+        self.spec = spec or make_site_spec()
+        self.random = random.Random(self.spec['seed'])
+        self.requests = 0
+        self.requests_by_method = {}
+        self.base_url = None
+        self._runner = None
+        self._build()
+
+    def _build(self):
+        spec = self.spec
+        rnd = random.Random(spec['seed'])
+        self.page_paths = [f"/pagina-{i}" for i in range(spec['pages'])]
+
+        self.anchor_paths = []
+        for i in range(spec['anchors']):
+            roll = rnd.random()
+            if roll < spec['error_rate']:
+                self.anchor_paths.append(f"/inexistente-{i}")
+            elif roll < spec['error_rate'] + spec['head_reject_rate']:
+                self.anchor_paths.append(f"/sem-head/{i}")
+            else:
+                path = rnd.choice(self.page_paths) if self.page_paths else "/"
+                self.anchor_paths.append(f"{path}?ref={i}" if spec['unique_anchors'] else path)
+
+        self.image_paths = [
+            f"/img/quebrada-{i}.png" if rnd.random() < spec['error_rate'] else f"/img/{i}.png"
+            for i in range(spec['images'])
+        ]
+
+    # --- Geração de HTML ---
+
+    def _head(self, title):
+        return (
+            f"<head><meta charset='utf-8'><title>{title}</title>"
+            f"<meta name='viewport' content='width=device-width, initial-scale=1.0'>"
+            f"<link rel=\"icon\" href=\"/favicon.ico\">"
+            f"<link rel='stylesheet' href='/css/fontawesome.min.css'></head>"
+        )
+
+    def _menu(self):
+        items = ''.join(
+            f"<li><a href='{path}'>Pagina {path.rsplit('-', 1)[-1]}</a></li>"
+            for path in self.page_paths[:self.spec['menu_items']]
+        )
+        return f"<nav><ul>{items}</ul></nav>"
+
+    def _footer(self):
+        images = ''.join(
+            f"<img src='/img/rodape-{i}.png' loading='lazy'>" for i in range(self.spec['footer_images'])
+        )
+        return f"<footer>{images}</footer>"
+
+    def home_html(self):
+        anchors = ''.join(f"<a href='{path}'>link {i}</a> " for i, path in enumerate(self.anchor_paths))
+        images = ''.join(f"<img src='{path}' alt=''>" for path in self.image_paths)
+        banner = "<div class='hero-section'><a href='/pagina-0'>Oferta</a></div>" if self.page_paths else ""
+        return (
+            f"<!DOCTYPE html><html lang='pt-br'>{self._head('Home')}<body>"
+            f"{self._menu()}{banner}<h1>Home</h1><p>{anchors}</p>{images}{self._footer()}</body></html>"
+        )
+
+    def page_html(self, path):
+        number = path.rsplit('-', 1)[-1]
+        breadcrumb = ""
+        if self.spec['breadcrumbs']:
+            data = {
+                "@context": "https://schema.org",
+                "@type": "BreadcrumbList",
+                "itemListElement": [
+                    {"@type": "ListItem", "position": 1, "item": {"@id": f"{self.base_url}/", "name": "Home"}},
+                    {"@type": "ListItem", "position": 2, "item": {"@id": f"{self.base_url}{path}", "name": f"Pagina {number}"}},
+                ],
+            }
+            breadcrumb = f"<script type='application/ld+json'>{json.dumps(data)}</script>"
+        return (
+            f"<!DOCTYPE html><html lang='pt-br'>{self._head(f'Pagina {number}')}<body>"
+            f"{self._menu()}{breadcrumb}<h1>Pagina {number}</h1>{self._footer()}</body></html>"
+        )
+
+    def sitemap_xml(self):
+        urls = ''.join(f"<url><loc>{self.base_url}{path}</loc></url>" for path in self.page_paths)
+        return f"<?xml version='1.0' encoding='UTF-8'?><urlset xmlns='http://www.sitemaps.org/schemas/sitemap/0.9'>{urls}</urlset>"
+
+    # --- Aplicação aiohttp ---
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        self.requests += 1
+        self.requests_by_method[request.method] = self.requests_by_method.get(request.method, 0) + 1
+
+        latency = max(0.0, self.random.gauss(self.spec['latency_ms'], self.spec['latency_jitter_ms'])) / 1000
+        if latency:
+            await asyncio.sleep(latency)
+        if self.spec['server_error_rate'] and self.random.random() < self.spec['server_error_rate']:
+            return web.Response(status=503, text="Serviço indisponível")
+        return await handler(request)
+
+    async def _home(self, request):
+        return web.Response(text=self.home_html(), content_type='text/html')
+
+    async def _page(self, request):
+        path = request.path.rstrip('/')
+        if path not in self.page_paths:
+            raise web.HTTPNotFound()
+        return web.Response(text=self.page_html(path), content_type='text/html')
+
+    async def _no_head(self, request):
+        if request.method == 'HEAD':
+            return web.Response(status=405)
+        return web.Response(text="<html><body>ok</body></html>", content_type='text/html')
+
+    async def _image(self, request):
+        if request.match_info['name'].startswith('quebrada-'):
+            raise web.HTTPNotFound()
+        return web.Response(body=IMAGE_PNG, content_type='image/png')
+
+    async def _favicon(self, request):
+        return web.Response(body=FAVICON_PNG, content_type='image/png')
+
+    async def _css(self, request):
+        return web.Response(text="body{margin:0}", content_type='text/css')
+
+    async def _robots(self, request):
+        return web.Response(text=f"User-agent: *\nSitemap: {self.base_url}/sitemap.xml\n")
+
+    async def _sitemap(self, request):
+        return web.Response(text=self.sitemap_xml(), content_type='application/xml')
+
+    def make_app(self):
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get('/', self._home)
+        app.router.add_get('/robots.txt', self._robots)
+        app.router.add_get('/sitemap.xml', self._sitemap)
+        app.router.add_get('/favicon.ico', self._favicon)
+        app.router.add_get('/css/{name}', self._css)
+        app.router.add_get('/img/{name}', self._image)
+        app.router.add_route('*', '/sem-head/{n}', self._no_head)
+        app.router.add_get(r'/pagina-{n:\d+}', self._page)
+        return app
+
+    async def start(self, host='127.0.0.1', port=0):
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{bound_port}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+class W3CStandIn:
+    """Substituto local das APIs do W3C (HTML nu e CSS jigsaw) com latência configurável."""
+
+    def __init__(self, latency_ms=200, html_errors=2, css_errors=1):
+        self.latency_ms = latency_ms
+        self.html_errors = html_errors
+        self.css_errors = css_errors
+        self.requests = 0
+        self.base_url = None
+        self._runner = None
+
+    async def _html(self, request):
+        self.requests += 1
+        await asyncio.sleep(self.latency_ms / 1000)
+        messages = [
+            {"type": "error", "lastLine": i + 1, "message": f"Erro sintético {i + 1}"} for i in range(self.html_errors)
+        ]
+        return web.json_response({"messages": messages})
+
+    async def _css(self, request):
+        self.requests += 1
+        await asyncio.sleep(self.latency_ms / 1000)
+        uri = request.query.get('uri', '')
+        errors = [
+            {"uri": f"{uri}/css/site.css", "line": i + 1, "message": f"Erro sintético {i + 1}"} for i in range(self.css_errors)
+        ]
+        return web.json_response({"cssvalidation": {"errors": errors, "warnings": []}})
+
+    async def start(self, host='127.0.0.1', port=0):
+        app = web.Application()
+        app.router.add_get('/nu/', self._html)
+        app.router.add_get('/css-validator/validator', self._css)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{bound_port}"
+        return self.base_url
+
+    @property
+    def html_url(self):
+        return f"{self.base_url}/nu/"
+
+    @property
+    def css_url(self):
+        return f"{self.base_url}/css-validator/validator"
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
@@ -0,0 +1,342 @@
+# Arquivo: benchmarks/run_benchmarks.py
+"""
+Benchmark ponta a ponta do validador contra sites sintéticos locais.
+
+Mede, para a validação completa e para cada módulo isolado: tempo total, requisições
+emitidas, pico de memória e sites por minuto. Os resultados são gravados em JSON para
+comparação entre versões.
+
+Uso:
+    python -m benchmarks.run_benchmarks --sites 5 --pages 50 --anchors 300 --label minha-branch
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/base.json
+    python -m benchmarks.run_benchmarks --transports --anchors 500
+    python -m benchmarks.run_benchmarks --transports --transport-url https://exemplo.com.br/pagina-com-links
+    python -m benchmarks.run_benchmarks --memory --urls 100000
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.fixture_server import SyntheticSite, W3CStandIn, make_site_spec, DEFAULT_SITE_SPEC
+from core.http import create_session
+from core.compact import BloomFilter, Finding, StatusTable, UrlTable
+from core.http2 import Http2Session, http2_available
+from core.probe_scheduler import ProbeScheduler
+from core.validator import WebsiteValidator
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+# Orçamento de memória (pico, em MB) do escalonador de links a cada 100 mil URLs
+MEMORY_BUDGET_MB_PER_100K = 16
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def _module_name(func):
+    return func.__module__.rsplit('.', 1)[-1]
+
+
+def _point_w3c_modules_to(stand_in):
+    """Aponta os módulos do W3C para o substituto local."""
+    import modules.w3c_html as w3c_html
+    import modules.w3c_css as w3c_css
+    w3c_html.W3C_HTML_VALIDATOR_URL = stand_in.html_url
+    w3c_css.W3C_CSS_VALIDATOR_URL = stand_in.css_url
+
+
+async def _measure(label, sites, stand_in, run):
+    """Executa `run(site)` para todos os sites e coleta as métricas."""
+    requests_before = sum(site.requests for site in sites) + stand_in.requests
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+
+    results = [await run(site) for site in sites]
+
+    wall_time = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    requests = sum(site.requests for site in sites) + stand_in.requests - requests_before
+    return {
+        "name": label,
+        "wall_time_s": round(wall_time, 3),
+        "requests": requests,
+        "peak_memory_mb": round(peak / (1024 * 1024), 2),
+        "sites_per_minute": round(len(sites) / wall_time * 60, 2) if wall_time else None,
+        "statuses": _statuses(results),
+    }
+
+
+def _statuses(results):
+    counts = {}
+    for result in results:
+        validations = result.get('validations', [result]) if isinstance(result, dict) else []
+        for validation in validations:
+            status = validation.get('result', 'erro')
+            counts[status] = counts.get(status, 0) + 1
+    return counts
+
+
+async def run_benchmarks(num_sites, spec, modules=None, per_module=True):
+    stand_in = W3CStandIn()
+    await stand_in.start()
+    _point_w3c_modules_to(stand_in)
+
+    sites = []
+    for i in range(num_sites):
+        site = SyntheticSite(make_site_spec(**{**spec, "seed": spec['seed'] + i}))
+        await site.start()
+        sites.append(site)
+
+    validator = WebsiteValidator()
+    if modules:
+        validator.modules = [m for m in validator.modules if _module_name(m) in modules]
+
+    tracemalloc.start()
+    measurements = []
+    try:
+        measurements.append(await _measure(
+            "validate_website", sites, stand_in,
+            lambda site: validator.validate_website(site.base_url + '/')
+        ))
+
+        if per_module:
+            for module in validator.modules:
+                async def _run_module(site, module=module):
+                    params = module.__code__.co_varnames[:module.__code__.co_argcount]
+                    async with create_session() as session:
+                        kwargs = {'session': session} if 'session' in params else {}
+                        return await module(site.base_url + '/', **kwargs)
+                measurements.append(await _measure(_module_name(module), sites, stand_in, _run_module))
+    finally:
+        tracemalloc.stop()
+        for site in sites:
+            await site.stop()
+        await stand_in.stop()
+
+    return measurements
+
+
+async def _probe_with(transport, page_url, links, runs):
+    """Executa o broken_links na página com o transporte informado e mede a vazão dos testes."""
+    from modules.broken_links import validate_broken_links
+
+    timings = []
+    versions = {}
+    for _ in range(runs):
+        session = create_session(http2=(transport == 'http2'))
+        try:
+            started = time.perf_counter()
+            await validate_broken_links(page_url, session=session)
+            timings.append(time.perf_counter() - started)
+        finally:
+            await session.close()
+        if isinstance(session, Http2Session):
+            for version, count in session.stats().items():
+                versions[version] = versions.get(version, 0) + count
+
+    best = min(timings)
+    return {
+        "name": f"broken_links [{transport}]",
+        "wall_time_s": round(best, 3),
+        "links": links,
+        "links_per_second": round(links / best, 1) if best else None,
+        "http_versions": versions,
+    }
+
+
+async def compare_transports(spec, page_url=None, runs=3):
+    """
+    Compara a vazão dos testes de links em HTTP/1.1 (aiohttp) e HTTP/2 (httpx) na mesma página.
+    O site sintético fala só HTTP/1.1 em texto puro, então nele o HTTP/2 mede o custo da
+    alternativa; para a comparação real informe uma página HTTPS de um servidor com HTTP/2.
+    """
+    site = None
+    if page_url is None:
+        site = SyntheticSite(make_site_spec(**{**spec, "unique_anchors": True}))
+        await site.start()
+        page_url = site.base_url + '/'
+
+    from modules.broken_links import _get_links_from_html
+
+    transports = ['http1'] + (['http2'] if http2_available() else [])
+    if len(transports) == 1:
+        print("Aviso: httpx[http2] não está instalado; medindo apenas HTTP/1.1.")
+    try:
+        async with create_session() as session:
+            async with session.get(page_url, ssl=False) as response:
+                links = len(_get_links_from_html(await response.text(), page_url))
+        return [await _probe_with(transport, page_url, links, runs) for transport in transports]
+    finally:
+        if site is not None:
+            await site.stop()
+
+
+def _print_transports(measurements):
+    print(f"{'Transporte':<28}{'Tempo (s)':>12}{'Links':>8}{'Links/s':>10}   Versões")
+    for m in measurements:
+        print(f"{m['name']:<28}{m['wall_time_s']:>12}{m['links']:>8}{str(m['links_per_second']):>10}   {m['http_versions'] or '-'}")
+
+
+def _synthetic_urls(count):
+    return [f"https://site-{i % 500}.com.br/categoria-{i % 37}/produto-{i}?ref={i}" for i in range(count)]
+
+
+def _memory_of(build):
+    """Memória retida e pico (MB) da estrutura montada por build(), sem contar as URLs de entrada."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    structure = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del structure
+    return round((current - before) / (1024 * 1024), 2), round((peak - before) / (1024 * 1024), 2)
+
+
+def measure_memory(num_urls):
+    """
+    Mede a memória das estruturas de um rastreamento de num_urls links: conjunto + tuplas
+    (formato antigo), UrlTable + StatusTable + Finding, filtro de Bloom e o escalonador de
+    links completo (com um teste que responde 200 na hora).
+    """
+    urls = _synthetic_urls(num_urls)
+    broken = urls[::20]
+
+    def _plain():
+        return set(urls), [(url, 200) for url in urls], [
+            {"kind": "Links Quebrados", "target": url, "message": f"[404] -> {url}"} for url in broken
+        ]
+
+    def _compact():
+        table, statuses = UrlTable(), StatusTable()
+        for url in urls:
+            statuses.set(table.add(url), 200)
+        return table, statuses, [Finding("Links Quebrados", url, f"[404] -> {url}") for url in broken]
+
+    def _bloom():
+        visited = BloomFilter(num_urls)
+        for url in urls:
+            visited.add(url)
+        return visited
+
+    def _scheduler():
+        async def _probe(url, attempt):
+            return 200, None
+        return asyncio.run(ProbeScheduler(_probe).run(urls))
+
+    scale = 100_000 / num_urls
+    measurements = []
+    for name, build in (("set + tuplas + dicts", _plain), ("UrlTable + StatusTable", _compact),
+                        ("BloomFilter", _bloom), ("ProbeScheduler", _scheduler)):
+        retained, peak = _memory_of(build)
+        measurements.append({
+            "name": name,
+            "urls": num_urls,
+            "retained_mb": retained,
+            "peak_mb": peak,
+            "peak_mb_per_100k": round(peak * scale, 2),
+        })
+    return measurements
+
+
+def _print_memory(measurements):
+    print(f"{'Estrutura':<28}{'Retida (MB)':>14}{'Pico (MB)':>12}{'Pico/100k URLs':>16}")
+    for m in measurements:
+        print(f"{m['name']:<28}{m['retained_mb']:>14}{m['peak_mb']:>12}{m['peak_mb_per_100k']:>16}")
+
+
+def _print_table(measurements, baseline=None):
+    base = {m['name']: m for m in (baseline or {}).get('measurements', [])}
+    print(f"{'Medição':<28}{'Tempo (s)':>12}{'Requisições':>14}{'Pico (MB)':>12}{'Sites/min':>12}")
+    for m in measurements:
+        line = f"{m['name']:<28}{m['wall_time_s']:>12}{m['requests']:>14}{m['peak_memory_mb']:>12}{str(m['sites_per_minute']):>12}"
+        if m['name'] in base and base[m['name']]['wall_time_s']:
+            delta = (m['wall_time_s'] - base[m['name']]['wall_time_s']) / base[m['name']]['wall_time_s'] * 100
+            line += f"   ({delta:+.1f}% tempo vs. base)"
+        print(line)
+
+
+def _save(report, label):
+    if not os.path.exists(RESULTS_DIR):
+        os.makedirs(RESULTS_DIR)
+    path = os.path.join(RESULTS_DIR, f"{label}_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark do validador contra sites sintéticos locais.")
+    parser.add_argument("--sites", type=int, default=3, help="Número de sites sintéticos.")
+    for key, default in DEFAULT_SITE_SPEC.items():
+        if isinstance(default, bool):
+            parser.add_argument(f"--{key.replace('_', '-')}", type=lambda v: v.lower() in ('1', 'true', 'sim'), default=default)
+        else:
+            parser.add_argument(f"--{key.replace('_', '-')}", type=type(default), default=default)
+    parser.add_argument("--modules", nargs='*', help="Restringe aos módulos informados (ex: broken_links breadcrumbs).")
+    parser.add_argument("--no-per-module", action="store_true", help="Mede apenas a validação completa.")
+    parser.add_argument("--label", default=_git_revision() or "local", help="Rótulo do resultado gravado.")
+    parser.add_argument("--compare", metavar="ARQUIVO", help="Resultado anterior (JSON) para comparação.")
+    parser.add_argument("--transports", action="store_true", help="Compara HTTP/1.1 e HTTP/2 nos testes de links de uma página.")
+    parser.add_argument("--memory", action="store_true", help="Mede a memória das estruturas de links (orçamento por 100 mil URLs).")
+    parser.add_argument("--urls", type=int, default=100_000, help="Quantidade de URLs sintéticas para --memory.")
+    parser.add_argument("--transport-url", metavar="URL", help="Página HTTPS com HTTP/2 para --transports (padrão: site sintético).")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    spec = {key: getattr(args, key) for key in DEFAULT_SITE_SPEC}
+
+    if args.memory:
+        measurements = measure_memory(args.urls)
+        _print_memory(measurements)
+        report = {"label": args.label, "revision": _git_revision(), "timestamp": time.time(),
+                  "budget_mb_per_100k": MEMORY_BUDGET_MB_PER_100K, "memory": measurements}
+        print(f"\nResultado gravado em: {_save(report, args.label + '_memoria')}")
+        scheduler = next(m for m in measurements if m['name'] == "ProbeScheduler")
+        if scheduler['peak_mb_per_100k'] > MEMORY_BUDGET_MB_PER_100K:
+            print(f"ACIMA DO ORÇAMENTO: {scheduler['peak_mb_per_100k']} MB por 100 mil URLs "
+                  f"(limite {MEMORY_BUDGET_MB_PER_100K} MB).")
+            sys.exit(1)
+        return
+
+    if args.transports:
+        measurements = asyncio.run(compare_transports(spec, args.transport_url))
+        _print_transports(measurements)
+        report = {"label": args.label, "revision": _git_revision(), "timestamp": time.time(),
+                  "spec": spec, "page_url": args.transport_url, "transports": measurements}
+        print(f"\nResultado gravado em: {_save(report, args.label + '_transportes')}")
+        return
+
+    measurements = asyncio.run(run_benchmarks(args.sites, spec, args.modules, not args.no_per_module))
+    report = {
+        "label": args.label,
+        "revision": _git_revision(),
+        "timestamp": time.time(),
+        "sites": args.sites,
+        "spec": spec,
+        "measurements": measurements,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    _print_table(measurements, baseline)
+    print(f"\nResultado gravado em: {_save(report, args.label)}")
+
+
+if __name__ == "__main__":
+    main()
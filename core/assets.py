@@ -0,0 +1,157 @@
+# Arquivo: core/assets.py
+"""
+Arquivos referenciados no HTML de uma página (CSS, JS, imagens e fontes pré-carregadas).
+
+Usado pelos módulos que medem ou auditam esses arquivos sem navegador (peso da página,
+cabeçalhos de cache, imagens quebradas). extract_assets roda no pool de parse
+(core.parsing.run_parser).
+
+Os cabeçalhos dos arquivos ficam guardados por sessão, como a amostra do sitemap em
+core.sitemap: em uma execução a página é baixada uma única vez e cada arquivo é sondado
+uma única vez, com core.probe (HEAD, ou GET parcial nos hosts que recusam HEAD) salto a
+salto pelos redirecionamentos. O corpo dos arquivos nunca é baixado.
+"""
+import aiohttp
+import asyncio
+import time
+import weakref
+from collections import namedtuple
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from core import probe
+from core.parsing import run_parser
+from core.redirects import MAX_REDIRECTS, REDIRECT_STATUSES
+
+# Timeout (segundos) do GET da página e de cada sondagem de arquivo
+PAGE_TIMEOUT = 20
+ASSET_PROBE_TIMEOUT = 10
+
+# Sondagens simultâneas dos arquivos de uma página
+ASSET_PROBE_CONCURRENCY = 10
+
+# Por quanto tempo (segundos) a página e os cabeçalhos dos arquivos ficam guardados na sessão
+ASSET_CACHE_TTL = 10 * 60
+
+# Resposta final de um arquivo. status 0 = erro de conexão, timeout ou loop de
+# redirecionamentos; headers com nomes em minúsculas; size em bytes transferidos (None se
+# desconhecido); partial = cabeçalhos de um GET parcial (206), que não mostram a compressão
+AssetHeaders = namedtuple('AssetHeaders', 'url final_url status headers size partial')
+
+# Página baixada uma vez: status, cabeçalhos, tamanho do corpo e [(url, categoria, AssetHeaders)]
+StaticPage = namedtuple('StaticPage', 'url status headers size assets')
+
+# Sessão -> {url: (expira_em, future)}
+_ASSETS = weakref.WeakKeyDictionary()
+_PAGES = weakref.WeakKeyDictionary()
+
+
+def extract_assets(html, page_url):
+    """Parse da página (roda no pool de processos): (url, categoria) de CSS, JS, imagens e fontes."""
+    soup = BeautifulSoup(html, 'html.parser')
+    assets = {}
+    for tag in soup.find_all('link', href=True):
+        rel = [r.lower() for r in (tag.get('rel') or [])]
+        if 'stylesheet' in rel:
+            assets.setdefault(urljoin(page_url, tag['href']), "css")
+        elif 'preload' in rel and tag.get('as') == 'font':
+            assets.setdefault(urljoin(page_url, tag['href']), "font")
+    for tag in soup.find_all('script', src=True):
+        assets.setdefault(urljoin(page_url, tag['src']), "js")
+    for tag in soup.find_all('img', src=True):
+        if not tag['src'].startswith('data:'):
+            assets.setdefault(urljoin(page_url, tag['src']), "image")
+    return list(assets.items())
+
+
+async def _cached(store, session, key, factory):
+    """Resultado de factory() guardado na sessão por ASSET_CACHE_TTL; chamadas simultâneas esperam o mesmo."""
+    cache = store.get(session)
+    if cache is None:
+        cache = store[session] = {}
+    entry = cache.get(key)
+    if entry is None or time.time() >= entry[0]:
+        entry = cache[key] = (time.time() + ASSET_CACHE_TTL, asyncio.ensure_future(factory()))
+    try:
+        return await asyncio.shield(entry[1])
+    except BaseException:
+        if cache.get(key) is entry:
+            del cache[key]
+        raise
+
+
+def _content_range_total(value):
+    """Tamanho total do arquivo em 'bytes 0-0/<total>'; None se desconhecido ('*')."""
+    total = (value or '').rpartition('/')[2].strip()
+    return int(total) if total.isdigit() else None
+
+
+def _size(response):
+    """Tamanho do arquivo: total do Content-Range no GET parcial, senão o Content-Length."""
+    if response.method == 'GET' and 'Content-Range' in response.headers:
+        return _content_range_total(response.headers['Content-Range'])
+    length = response.headers.get('Content-Length')
+    return int(length) if length and length.isdigit() else None
+
+
+async def _probe_asset(session, url):
+    current = url
+    seen = set()
+    try:
+        while True:
+            if current in seen or len(seen) > MAX_REDIRECTS:
+                return AssetHeaders(url, current, 0, {}, None, False)
+            seen.add(current)
+            response = await probe.probe(session, current, timeout=ASSET_PROBE_TIMEOUT)
+            location = response.headers.get('Location') if response.status in REDIRECT_STATUSES else None
+            if location is None:
+                break
+            current = urljoin(current, location)
+
+        size = _size(response)
+        if response.status < 400 and size is None and response.method == 'HEAD':
+            # HEAD sem Content-Length (ex: resposta chunked): o GET parcial traz o total no Content-Range
+            ranged = await probe.probe(session, current, method='GET', timeout=ASSET_PROBE_TIMEOUT)
+            if ranged.status < 400:
+                size = _size(ranged)
+    except (asyncio.TimeoutError, aiohttp.ClientError):
+        return AssetHeaders(url, current, 0, {}, None, False)
+
+    headers = {k.lower(): v for k, v in response.headers.items()}
+    partial = response.method == 'GET' and 'content-range' in headers
+    return AssetHeaders(url, current, response.status, headers, size, partial)
+
+
+async def asset_headers(session, url):
+    """Cabeçalhos da resposta final de um arquivo (AssetHeaders), sondados uma vez por sessão."""
+    return await _cached(_ASSETS, session, url, lambda: _probe_asset(session, url))
+
+
+async def _load_static_page(session, url):
+    async with session.get(url, timeout=PAGE_TIMEOUT) as response:
+        headers = {k.lower(): v for k, v in response.headers.items()}
+        if response.status != 200:
+            return StaticPage(url, response.status, headers, None, [])
+        body = await response.read()
+        html = body.decode(response.charset or 'utf-8', errors='replace')
+
+    found = await run_parser(extract_assets, html, url)
+    semaphore = asyncio.Semaphore(ASSET_PROBE_CONCURRENCY)
+
+    async def _probed(asset_url):
+        async with semaphore:
+            return await asset_headers(session, asset_url)
+
+    probed = await asyncio.gather(*(_probed(asset_url) for asset_url, _ in found))
+    assets = [(asset_url, category, headers) for (asset_url, category), headers in zip(found, probed)]
+    return StaticPage(url, 200, headers, len(body), assets)
+
+
+async def static_page(session, url):
+    """
+    Página sem navegador (StaticPage): GET da página e cabeçalhos de cada arquivo referenciado
+    no HTML, guardados na sessão para os módulos da mesma execução.
+    Erros de conexão/timeout do GET da página são propagados.
+    """
+    return await _cached(_PAGES, session, url, lambda: _load_static_page(session, url))
@@ -0,0 +1,334 @@
+# Arquivo: core/cassette.py
+"""
+Gravação e reprodução das requisições HTTP de uma auditoria.
+
+No modo de gravação, cada requisição feita pela sessão compartilhada é executada de verdade
+e salva (status, cabeçalhos, corpo) em um cassete gzip; corpos idênticos são guardados uma
+única vez. No modo de reprodução, a auditoria inteira é servida a partir do cassete, sem rede.
+"""
+import asyncio
+import base64
+import codecs
+import gzip
+import hashlib
+import json
+import re
+import ssl
+from collections import defaultdict, deque
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from core import tls
+
+_CHARSET_RE = re.compile(r'charset=([\w.:-]+)', re.IGNORECASE)
+
+
+# Cabeçalhos da requisição que mudam a resposta servida e por isso entram na chave
+KEY_HEADERS = ('Range',)
+
+
+def request_key(method, url, params=None, headers=None):
+    """
+    Chave da requisição no cassete: método + URL com a query já incorporada + os
+    KEY_HEADERS enviados (um GET parcial de sondagem não pode servir o GET da página).
+    """
+    full_url = URL(str(url))
+    if params:
+        full_url = full_url.update_query(params)
+    key = f"{method.upper()} {full_url}"
+    headers = CIMultiDict(headers or {})
+    for name in KEY_HEADERS:
+        if name in headers:
+            key += f" {name}={headers[name].strip()}"
+    return key
+
+
+class Cassette:
+    """Conjunto de interações gravadas, indexadas por request_key."""
+
+    def __init__(self, path):
+        self.path = path
+        self.bodies = {}
+        self.interactions = defaultdict(deque)
+        # 'host:porta' -> certificado (ou erro) dos handshakes TLS próprios (core.tls.check_host)
+        self.certificates = {}
+
+    def add(self, key, interaction, body=None):
+        if body is not None:
+            digest = hashlib.sha1(body).hexdigest()
+            self.bodies.setdefault(digest, body)
+            interaction['body'] = digest
+        self.interactions[key].append(interaction)
+
+    def next(self, key):
+        """
+        Retorna a próxima interação gravada para a chave. Requisições repetidas são servidas
+        na ordem em que foram gravadas; a última se repete se houver mais chamadas.
+        """
+        queue = self.interactions.get(key)
+        if not queue:
+            return None
+        return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def body(self, interaction):
+        digest = interaction.get('body')
+        return self.bodies.get(digest, b'') if digest else b''
+
+    def save(self):
+        with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            for digest, body in self.bodies.items():
+                f.write(json.dumps({"type": "body", "sha1": digest, "data": base64.b64encode(body).decode('ascii')}) + "\n")
+            for key, queue in self.interactions.items():
+                for interaction in queue:
+                    f.write(json.dumps({"type": "interaction", "key": key, **interaction}, ensure_ascii=False) + "\n")
+            for key, certificate in self.certificates.items():
+                f.write(json.dumps({"type": "certificate", "key": key, **certificate}, ensure_ascii=False) + "\n")
+
+    @classmethod
+    def load(cls, path):
+        cassette = cls(path)
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                kind = entry.pop('type')
+                if kind == 'body':
+                    cassette.bodies[entry['sha1']] = base64.b64decode(entry['data'])
+                elif kind == 'certificate':
+                    cassette.certificates[entry.pop('key')] = entry
+                else:
+                    cassette.interactions[entry.pop('key')].append(entry)
+        return cassette
+
+
+class _StreamReader:
+    """Substituto mínimo de response.content para leitura em blocos."""
+
+    def __init__(self, body):
+        self._body = body
+
+    async def iter_chunked(self, size):
+        for start in range(0, len(self._body), size):
+            yield self._body[start:start + size]
+
+    async def read(self, n=-1):
+        data = self._body if n < 0 else self._body[:n]
+        self._body = self._body[len(data):]
+        return data
+
+
+class CassetteResponse:
+    """Resposta servida a partir de dados já lidos (gravação ou reprodução)."""
+
+    def __init__(self, method, url, status, headers, body, reason=''):
+        self.method = method
+        self.url = URL(url)
+        self.status = status
+        self.reason = reason
+        self.headers = CIMultiDictProxy(CIMultiDict(headers))
+        self.history = ()
+        self.content = _StreamReader(body)
+        self.connection = None
+        self._body = body
+
+    @property
+    def charset(self):
+        match = _CHARSET_RE.search(self.headers.get('Content-Type', ''))
+        return match.group(1) if match else None
+
+    async def read(self):
+        return self._body
+
+    async def text(self, encoding=None, errors='strict'):
+        encoding = encoding or self.charset or 'utf-8'
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            encoding = 'utf-8'
+        return self._body.decode(encoding, errors=errors)
+
+    async def json(self, content_type='application/json', loads=json.loads, encoding=None):
+        return loads(await self.text(encoding=encoding))
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(None, (), status=self.status, message=self.reason)
+
+    def release(self):
+        pass
+
+    def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class _RequestContext:
+    """Permite usar `async with session.get(...)` e `await session.get(...)` como no aiohttp."""
+
+    def __init__(self, coro):
+        self._coro = coro
+        self._response = None
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    async def __aenter__(self):
+        self._response = await self._coro
+        return self._response
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._response.release()
+        return False
+
+
+class CertificateNotRecorded(OSError):
+    """Certificado de um host que o cassete não tem (no replay não há handshake ao vivo)."""
+
+
+def _certificate_key(host, port):
+    return f"{host.lower()}:{port}"
+
+
+def _certificate_error_entry(error):
+    entry = {"type": type(error).__name__, "message": str(error)}
+    if isinstance(error, ssl.SSLError):
+        entry['verify_message'] = getattr(error, 'verify_message', None)
+        entry['reason'] = getattr(error, 'reason', None)
+    return entry
+
+
+def _recorded_certificate_error(entry):
+    """Reconstrói o erro gravado de um handshake (SSLError, timeout ou OSError)."""
+    if entry['type'] == 'TimeoutError':
+        return asyncio.TimeoutError()
+    if entry.get('verify_message') is not None or entry.get('reason') is not None:
+        error = ssl.SSLCertVerificationError(entry['message']) if entry['type'] == 'SSLCertVerificationError' else ssl.SSLError(entry['message'])
+        error.verify_message = entry.get('verify_message')
+        error.reason = entry.get('reason')
+        return error
+    return OSError(f"{entry['type']} (gravado): {entry['message']}")
+
+
+def _raise_recorded_error(error):
+    if error.get('kind') == 'timeout':
+        raise asyncio.TimeoutError()
+    raise aiohttp.ClientConnectionError(f"{error.get('type', 'ClientError')} (gravado): {error.get('message', '')}")
+
+
+class _CassetteSessionBase:
+    """Interface comum (get/head/post/request) das sessões de gravação e reprodução."""
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        kwargs.setdefault('allow_redirects', False)
+        return self.request('HEAD', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        return _RequestContext(self._request(method, url, **kwargs))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+class RecordingSession(_CassetteSessionBase):
+    """Executa as requisições de verdade e grava cada uma no cassete."""
+
+    def __init__(self, session, cassette):
+        self._session = session
+        self.cassette = cassette
+
+    @property
+    def closed(self):
+        return self._session.closed
+
+    @property
+    def connector(self):
+        return self._session.connector
+
+    async def _request(self, method, url, **kwargs):
+        key = request_key(method, url, kwargs.get('params'), kwargs.get('headers'))
+        try:
+            async with self._session.request(method, url, **kwargs) as response:
+                tls_info = tls.info_from_response(response)
+                body = await response.read()
+                interaction = {
+                    "status": response.status,
+                    "reason": response.reason or '',
+                    "url": str(response.url),
+                    "headers": list(response.headers.items()),
+                }
+                if tls_info:
+                    interaction['tls'] = tls_info
+        except asyncio.TimeoutError:
+            self.cassette.add(key, {"error": {"kind": "timeout"}})
+            raise
+        except aiohttp.ClientError as e:
+            self.cassette.add(key, {"error": {"kind": "client", "type": type(e).__name__, "message": str(e)}})
+            raise
+
+        self.cassette.add(key, interaction, body)
+        return CassetteResponse(method, interaction['url'], interaction['status'], interaction['headers'], body, interaction['reason'])
+
+    def record_certificate(self, host, port, info, error):
+        """Grava o resultado de um core.tls.check_host para o replay."""
+        entry = {"info": info}
+        if error is not None:
+            entry['error'] = _certificate_error_entry(error)
+        self.cassette.certificates[_certificate_key(host, port)] = entry
+
+    async def close(self):
+        await self._session.close()
+        self.cassette.save()
+
+
+class ReplaySession(_CassetteSessionBase):
+    """Serve as requisições a partir do cassete, sem acessar a rede."""
+
+    def __init__(self, cassette):
+        self.cassette = cassette
+        self.closed = False
+        self.misses = []
+
+    async def _request(self, method, url, **kwargs):
+        key = request_key(method, url, kwargs.get('params'), kwargs.get('headers'))
+        interaction = self.cassette.next(key)
+        if interaction is None:
+            self.misses.append(key)
+            raise aiohttp.ClientConnectionError(f"Requisição não encontrada no cassete: {key}")
+        if 'error' in interaction:
+            _raise_recorded_error(interaction['error'])
+        if 'tls' in interaction:
+            final_url = URL(interaction['url'])
+            tls.remember(final_url.host, final_url.port, interaction['tls'])
+        return CassetteResponse(
+            method, interaction['url'], interaction['status'], interaction['headers'],
+            self.cassette.body(interaction), interaction.get('reason', '')
+        )
+
+    def recorded_certificate(self, host, port):
+        """(info, erro) gravados para o host; hosts fora do cassete ficam sem certificado."""
+        entry = self.cassette.certificates.get(_certificate_key(host, port))
+        if entry is None:
+            key = _certificate_key(host, port)
+            self.misses.append(f"TLS {key}")
+            return None, CertificateNotRecorded(f"Certificado não encontrado no cassete: {key}")
+        if 'error' in entry:
+            return None, _recorded_certificate_error(entry['error'])
+        return entry['info'], None
+
+    async def close(self):
+        self.closed = True
@@ -0,0 +1,115 @@
+# Arquivo: core/coherence.py
+import re
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+from urllib.parse import urlparse
+
+# Similaridade mínima (fração dos termos da URL presentes no H1) para considerar coerente
+COHERENCE_THRESHOLD = 0.7
+
+# Tamanho dos caches de normalização (H1s e slugs se repetem muito entre páginas e sites)
+CACHE_SIZE = 65536
+
+# Stop words já na forma normalizada (sem acentos, minúsculas)
+STOP_WORDS = frozenset({
+    'a', 'o', 'as', 'os', 'e', 'de', 'do', 'da', 'dos', 'das', 'em', 'no', 'na', 'nos', 'nas',
+    'para', 'por', 'com', 'um', 'uma', 'uns', 'umas', 'se', 'que', 'mas', 'mais', 'ou', 'sao',
+    'oito', 'sete', 'seis', 'cinco', 'quatro', 'tres', 'dois', 'zero', 'etc',
+})
+
+# Letras que a decomposição Unicode não reduz a ASCII
+_SPECIAL_FOLDS = {
+    'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'ø': 'o', 'đ': 'd', 'ð': 'd', 'ł': 'l', 'þ': 'th', 'ı': 'i',
+}
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+CoherenceScore = namedtuple('CoherenceScore', ['url', 'h1', 'url_tokens', 'h1_tokens', 'score', 'coherent'])
+
+
+def _build_fold_table():
+    """Monta a tabela de tradução que remove acentos dos blocos latinos de uma só vez."""
+    table = {}
+    ranges = [(0x00C0, 0x0250), (0x1E00, 0x1F00)]
+    for start, end in ranges:
+        for codepoint in range(start, end):
+            char = chr(codepoint).lower()
+            if char in _SPECIAL_FOLDS:
+                table[codepoint] = _SPECIAL_FOLDS[char]
+                continue
+            decomposed = unicodedata.normalize('NFKD', char)
+            base = ''.join(c for c in decomposed if not unicodedata.combining(c))
+            if base.isascii() and base.isalnum():
+                table[codepoint] = base
+    for char, folded in _SPECIAL_FOLDS.items():
+        table[ord(char)] = folded
+    return table
+
+
+FOLD_TABLE = _build_fold_table()
+
+
+def _stem(token):
+    """Reduz plurais simples (produtos -> produto) para a comparação de termos."""
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def tokenize(text):
+    """Normaliza o texto (minúsculas, sem acentos, sem stop words) e retorna seus termos."""
+    folded = text.lower().translate(FOLD_TABLE)
+    return tuple(token for token in _TOKEN_RE.findall(folded) if token not in STOP_WORDS)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _token_set(text):
+    return frozenset(_stem(token) for token in tokenize(text))
+
+
+def normalize_text(text):
+    """Forma normalizada em slug (termos separados por hífen), usada nas mensagens."""
+    return '-'.join(tokenize(text))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def url_slug(page_url):
+    """Retorna o último segmento do caminho da URL, sem extensão."""
+    path = urlparse(page_url).path
+    path_segments = [s for s in path.strip('/').split('/') if s]
+    last_segment = path_segments[-1] if path_segments else ""
+    return last_segment.rsplit('.', 1)[0]
+
+
+def similarity(url_text, h1_text):
+    """Fração dos termos da URL que aparecem no H1 (0.0 a 1.0)."""
+    url_terms = _token_set(url_text)
+    if not url_terms:
+        return 0.0
+    return len(url_terms & _token_set(h1_text)) / len(url_terms)
+
+
+def score_pairs(pairs, threshold=COHERENCE_THRESHOLD):
+    """
+    Pontua um lote de pares (URL, H1) de uma vez.
+    Pares repetidos são calculados uma única vez.
+    """
+    scored = {}
+    results = []
+    for page_url, h1_text in pairs:
+        key = (page_url, h1_text)
+        if key not in scored:
+            slug = url_slug(page_url)
+            score = similarity(slug, h1_text)
+            scored[key] = CoherenceScore(
+                url=page_url,
+                h1=h1_text,
+                url_tokens=normalize_text(slug),
+                h1_tokens=normalize_text(h1_text),
+                score=score,
+                coherent=score >= threshold,
+            )
+        results.append(scored[key])
+    return results
@@ -0,0 +1,174 @@
+# Arquivo: core/compact.py
+"""
+Estruturas compactas para rastreamentos grandes e lotes de milhares de sites.
+
+- UrlTable: cada URL é guardada uma única vez e recebe um id inteiro sequencial.
+- StatusTable: status HTTP, tentativas e observações em arrays indexados pelo id da URL,
+  em vez de uma tupla (url, status) por link.
+- Finding: registro com __slots__ para os achados individuais.
+- BloomFilter: conjunto probabilístico de URLs visitadas (sem falsos negativos; falsos
+  positivos na taxa configurada), para deduplicar fronteiras de centenas de milhares de URLs.
+"""
+import hashlib
+import math
+from array import array
+
+# Status ainda não preenchido na StatusTable
+STATUS_PENDING = 0xFFFF
+
+# Taxa de falsos positivos padrão do BloomFilter
+BLOOM_ERROR_RATE = 0.001
+
+
+class UrlTable:
+    """Tabela de URLs internadas: add(url) -> id, url(id) -> url."""
+
+    __slots__ = ('_ids', '_urls')
+
+    def __init__(self):
+        self._ids = {}
+        self._urls = []
+
+    def add(self, url):
+        url_id = self._ids.get(url)
+        if url_id is None:
+            url_id = len(self._urls)
+            self._ids[url] = url_id
+            self._urls.append(url)
+        return url_id
+
+    def id_of(self, url):
+        return self._ids.get(url)
+
+    def url(self, url_id):
+        return self._urls[url_id]
+
+    def __contains__(self, url):
+        return url in self._ids
+
+    def __len__(self):
+        return len(self._urls)
+
+    def __iter__(self):
+        return iter(self._urls)
+
+
+class StatusTable:
+    """Status (0-65534), tentativas e código de observação por id de URL, em arrays."""
+
+    __slots__ = ('statuses', 'attempts', 'notes', 'note_names')
+
+    def __init__(self):
+        self.statuses = array('H')
+        self.attempts = array('B')
+        self.notes = array('B')
+        # Código 0 = sem observação; os demais são registrados sob demanda
+        self.note_names = [None]
+
+    def _grow(self, url_id):
+        missing = url_id + 1 - len(self.statuses)
+        if missing > 0:
+            self.statuses.extend([STATUS_PENDING] * missing)
+            self.attempts.extend([0] * missing)
+            self.notes.extend([0] * missing)
+
+    def _note_code(self, note):
+        if note is None:
+            return 0
+        try:
+            return self.note_names.index(note)
+        except ValueError:
+            self.note_names.append(note)
+            return len(self.note_names) - 1
+
+    def set(self, url_id, status, attempts=1, note=None):
+        self._grow(url_id)
+        self.statuses[url_id] = status
+        self.attempts[url_id] = min(attempts, 255)
+        self.notes[url_id] = self._note_code(note)
+
+    def get(self, url_id):
+        """(status, tentativas, observação) do id, ou None se ainda não preenchido."""
+        if url_id >= len(self.statuses) or self.statuses[url_id] == STATUS_PENDING:
+            return None
+        return self.statuses[url_id], self.attempts[url_id], self.note_names[self.notes[url_id]]
+
+    def filled(self):
+        """Ids já preenchidos, em ordem."""
+        return (url_id for url_id, status in enumerate(self.statuses) if status != STATUS_PENDING)
+
+    def __len__(self):
+        return sum(1 for status in self.statuses if status != STATUS_PENDING)
+
+
+class Finding:
+    """Achado individual ({'kind', 'target', 'message'}); aceita acesso por chave como um dict."""
+
+    __slots__ = ('kind', 'target', 'message')
+
+    def __init__(self, kind, target, message):
+        self.kind = kind
+        self.target = target
+        self.message = message
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def as_dict(self):
+        return {"kind": self.kind, "target": self.target, "message": self.message}
+
+    def __eq__(self, other):
+        if isinstance(other, Finding):
+            return (self.kind, self.target, self.message) == (other.kind, other.target, other.message)
+        if isinstance(other, dict):
+            return self.as_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Finding(kind={self.kind!r}, target={self.target!r}, message={self.message!r})"
+
+
+class BloomFilter:
+    """Filtro de Bloom sobre um bytearray, dimensionado para `capacity` itens."""
+
+    __slots__ = ('capacity', 'error_rate', 'num_bits', 'num_hashes', 'count', '_bits')
+
+    def __init__(self, capacity, error_rate=BLOOM_ERROR_RATE):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item):
+        # Hash duplo (Kirsch-Mitzenmacher): k posições a partir de dois valores de 64 bits
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item):
+        """Adiciona o item. Retorna False se ele (provavelmente) já estava no filtro."""
+        new = False
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self._bits[byte] & (1 << bit):
+                self._bits[byte] |= 1 << bit
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __contains__(self, item):
+        return all(self._bits[position // 8] & (1 << (position % 8)) for position in self._positions(item))
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def size_bytes(self):
+        return len(self._bits)
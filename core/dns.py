@@ -0,0 +1,145 @@
+# Arquivo: core/dns.py
+"""
+Cache de DNS da sessão HTTP compartilhada.
+
+Cada host é resolvido uma vez por DNS_CACHE_TTL, independentemente da porta. Nomes
+inexistentes (NXDOMAIN) também ficam em cache por DNS_NEGATIVE_TTL, para que links para
+domínios mortos falhem na hora em vez de esperar o timeout de conexão. Resoluções
+simultâneas do mesmo host compartilham uma única consulta.
+"""
+import asyncio
+import socket
+import time
+import weakref
+
+from aiohttp.abc import AbstractResolver
+from aiohttp.resolver import DefaultResolver
+
+# getaddrinfo não informa o TTL dos registros, então o cache usa um TTL fixo
+DNS_CACHE_TTL = 300
+DNS_NEGATIVE_TTL = 60
+
+# Consultas simultâneas durante a pré-resolução
+PREFETCH_CONCURRENCY = 20
+
+# Erros do getaddrinfo que significam "o nome não existe" (os demais podem ser temporários)
+_NOT_FOUND_ERRORS = {
+    getattr(socket, name) for name in ('EAI_NONAME', 'EAI_NODATA') if hasattr(socket, name)
+}
+
+# Conector -> resolvedor, para que os módulos encontrem o cache da sessão recebida
+_RESOLVERS = weakref.WeakKeyDictionary()
+
+
+class CachingResolver(AbstractResolver):
+    """Resolvedor do aiohttp com cache positivo e negativo e estatísticas de uso."""
+
+    def __init__(self, resolver=None, ttl=DNS_CACHE_TTL, negative_ttl=DNS_NEGATIVE_TTL):
+        self._resolver = resolver
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        # (host, família) -> (expira_em, resultados ou exceção)
+        self._cache = {}
+        self._in_flight = {}
+        self._stats = {
+            "lookups": 0,
+            "hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "failures": 0,
+            "prefetched": 0,
+            "resolve_time_s": 0.0,
+        }
+
+    async def _query(self, host, family):
+        if self._resolver is None:
+            self._resolver = DefaultResolver()
+        self._stats['misses'] += 1
+        started = time.perf_counter()
+        try:
+            results = await self._resolver.resolve(host, 0, family)
+            self._cache[(host, family)] = (time.time() + self.ttl, results)
+            return results
+        except socket.gaierror as e:
+            self._stats['failures'] += 1
+            if e.errno in _NOT_FOUND_ERRORS:
+                self._cache[(host, family)] = (time.time() + self.negative_ttl, e)
+            raise
+        except OSError:
+            self._stats['failures'] += 1
+            raise
+        finally:
+            self._stats['resolve_time_s'] += time.perf_counter() - started
+
+    async def _lookup(self, host, family):
+        key = (host, family)
+        self._stats['lookups'] += 1
+        entry = self._cache.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if time.time() < expires_at:
+                if isinstance(value, Exception):
+                    self._stats['negative_hits'] += 1
+                    raise socket.gaierror(value.errno, value.strerror)
+                self._stats['hits'] += 1
+                return value
+            del self._cache[key]
+
+        pending = self._in_flight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._query(host, family))
+            self._in_flight[key] = pending
+            pending.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self._stats['hits'] += 1
+        return await asyncio.shield(pending)
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        results = await self._lookup(host.lower(), family)
+        # O cache é por host; a porta da conexão é aplicada a cada endereço
+        return [dict(result, port=port) for result in results]
+
+    async def prefetch(self, hosts, family=socket.AF_UNSPEC, concurrency=PREFETCH_CONCURRENCY):
+        """
+        Resolve os hosts em paralelo antes das requisições; falhas ficam no cache negativo.
+        A família padrão é a mesma que o TCPConnector usa nas conexões (AF_UNSPEC).
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _one(host):
+            async with semaphore:
+                try:
+                    await self._lookup(host.lower(), family)
+                except OSError:
+                    pass
+
+        hosts = {host for host in hosts if host}
+        self._stats['prefetched'] += len(hosts)
+        await asyncio.gather(*(_one(host) for host in hosts))
+
+    def stats(self):
+        stats = dict(self._stats)
+        stats['resolve_time_s'] = round(stats['resolve_time_s'], 3)
+        stats['cached_hosts'] = len(self._cache)
+        return stats
+
+    async def close(self):
+        if self._resolver is not None:
+            await self._resolver.close()
+
+
+def register(connector, resolver):
+    _RESOLVERS[connector] = resolver
+
+
+def resolver_for(session):
+    """Resolvedor com cache da sessão compartilhada (None em sessões próprias ou de reprodução)."""
+    connector = getattr(session, 'connector', None)
+    return _RESOLVERS.get(connector) if connector is not None else None
+
+
+async def prefetch(session, hosts):
+    """Pré-resolve os hosts no cache da sessão, se ela tiver um."""
+    resolver = resolver_for(session)
+    if resolver is not None:
+        await resolver.prefetch(hosts)
@@ -0,0 +1,50 @@
+# Arquivo: core/findings.py
+import re
+from urllib.parse import urlparse
+
+from core.compact import Finding
+
+# Resultados que não geram achados
+PASSING_RESULTS = ('aprovado', 'nao_se_aplica', 'ignorado')
+
+_URL_RE = re.compile(r'https?://[^\s,\'"<>]+')
+
+
+def site_key(url):
+    """Identificador do site usado para agrupar execuções (host sem 'www.')."""
+    host = (urlparse(url).hostname or url or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def _target_from(text):
+    match = _URL_RE.search(text)
+    return match.group(0) if match else None
+
+
+def iter_findings(validation):
+    """
+    Gera os achados individuais (link quebrado, erro de CSS, página incoerente...) de um
+    resultado de módulo, como Finding (kind, target, message; também acessíveis por chave).
+    Módulos aprovados não geram achados.
+    """
+    if validation.get('result', 'erro') in PASSING_RESULTS:
+        return
+
+    details = validation.get('details')
+    if isinstance(details, dict):
+        for key, value in details.items():
+            key = str(key)
+            if isinstance(value, (list, tuple)):
+                for item in value:
+                    if isinstance(item, dict):
+                        # Linhas de tabela (ex: peso da página por tipo) são resumo, não achados
+                        continue
+                    item = str(item)
+                    yield Finding(key, _target_from(item), item)
+            elif key.startswith(('http://', 'https://')):
+                yield Finding("pagina", key, str(value))
+            elif key.startswith('_'):
+                yield Finding(key.lstrip('_').lower(), None, str(value))
+    elif details:
+        details = str(details)
+        yield Finding("resumo", _target_from(details), details)
@@ -0,0 +1,60 @@
+# Arquivo: core/http.py
+from contextlib import asynccontextmanager
+
+import aiohttp
+
+from core import dns, tls
+from core.cassette import Cassette, RecordingSession, ReplaySession
+from core.http2 import Http2Session, http2_available
+
+# Limites do pool de conexões compartilhado entre os módulos
+HTTP_POOL_LIMIT = 100
+HTTP_POOL_LIMIT_PER_HOST = 0  # 0 = sem limite por host (os módulos já limitam com semáforos)
+KEEPALIVE_TIMEOUT = 30
+
+
+def create_session(record=None, replay=None, http2=False):
+    """
+    Cria a sessão HTTP compartilhada (pool de conexões) de uma execução ou do serviço.
+    record: caminho de um cassete onde todas as requisições serão gravadas.
+    replay: caminho de um cassete de onde as respostas serão servidas, sem rede.
+    http2: usa o transporte HTTP/2 (httpx) quando disponível, com HTTP/1.1 como alternativa.
+    """
+    if replay:
+        return ReplaySession(Cassette.load(replay))
+
+    if http2:
+        if http2_available():
+            session = Http2Session()
+            return RecordingSession(session, Cassette(record)) if record else session
+        print("Warning: httpx[http2] não está instalado; usando HTTP/1.1 (aiohttp).")
+
+    # O cache de DNS da execução substitui o cache interno do conector (sem cache negativo)
+    resolver = dns.CachingResolver()
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        resolver=resolver,
+        use_dns_cache=False,
+    )
+    dns.register(connector, resolver)
+    # A classe de resposta guarda o certificado TLS das conexões abertas (usado pelo ssl_certificate)
+    session = aiohttp.ClientSession(connector=connector, response_class=tls.CertificateCapturingResponse)
+    if record:
+        return RecordingSession(session, Cassette(record))
+    return session
+
+
+@asynccontextmanager
+async def open_session(session=None, **session_kwargs):
+    """
+    Reusa a sessão compartilhada recebida pelo módulo; sem ela, abre uma sessão própria
+    que é fechada ao final (comportamento de quando o módulo é chamado isoladamente).
+    """
+    if session is not None:
+        yield session
+        return
+
+    async with aiohttp.ClientSession(**session_kwargs) as own_session:
+        yield own_session
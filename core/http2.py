@@ -0,0 +1,242 @@
+# Arquivo: core/http2.py
+"""
+Transporte HTTP/2 opcional (httpx + h2) com a mesma interface da sessão aiohttp.
+
+Com HTTP/2 as centenas de HEAD/GET que os módulos fazem ao próprio site auditado são
+multiplexadas em poucas conexões, em vez de uma conexão por requisição em andamento.
+O protocolo é negociado por ALPN em cada conexão: servidores sem HTTP/2 (e URLs http://)
+continuam em HTTP/1.1 automaticamente. Sem httpx/h2 instalados, create_session volta a
+usar a sessão aiohttp.
+
+Instalação: pip install "httpx[http2]"
+"""
+import asyncio
+import codecs
+import json
+from collections import Counter
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from core import tls
+
+try:
+    import httpx
+    import h2  # noqa: F401 (httpx só negocia HTTP/2 com o pacote h2 instalado)
+except ImportError:
+    httpx = None
+
+# Limites do pool: com HTTP/2 cada conexão carrega muitas requisições simultâneas
+HTTP2_MAX_CONNECTIONS = 20
+HTTP2_KEEPALIVE_CONNECTIONS = 10
+HTTP2_DEFAULT_TIMEOUT = 30
+
+
+def http2_available():
+    return httpx is not None
+
+
+class _StreamAdapter:
+    """
+    Substituto de response.content (iter_chunked/read) sobre o stream do httpx. read(n)
+    consome o stream só até n bytes (ex: o início da home no http_status).
+    """
+
+    def __init__(self, response):
+        self._response = response
+        self._chunks = None
+        self._buffer = b''
+
+    def _iterator(self):
+        if self._chunks is None:
+            self._chunks = self._response.aiter_bytes().__aiter__()
+        return self._chunks
+
+    async def _next_chunk(self):
+        try:
+            return await self._iterator().__anext__()
+        except StopAsyncIteration:
+            return None
+        except httpx.TimeoutException:
+            raise asyncio.TimeoutError()
+        except httpx.HTTPError as e:
+            raise aiohttp.ClientPayloadError(f"{type(e).__name__}: {e}")
+
+    async def iter_chunked(self, size):
+        if self._buffer:
+            chunk, self._buffer = self._buffer, b''
+            yield chunk
+        while (chunk := await self._next_chunk()) is not None:
+            yield chunk
+
+    async def read(self, n=-1):
+        while n < 0 or len(self._buffer) < n:
+            chunk = await self._next_chunk()
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if n < 0:
+            n = len(self._buffer)
+        data, self._buffer = self._buffer[:n], self._buffer[n:]
+        return data
+
+
+class Http2Response:
+    """Resposta do httpx com a interface usada pelos módulos (status, headers, text...)."""
+
+    def __init__(self, method, response):
+        self.method = method
+        self._response = response
+        self.status = response.status_code
+        self.reason = response.reason_phrase
+        self.url = URL(str(response.url))
+        self.headers = CIMultiDictProxy(CIMultiDict(response.headers.multi_items()))
+        self.history = tuple(Http2Response(method, r) for r in response.history)
+        self.http_version = response.http_version
+        self.content = _StreamAdapter(response)
+        self.connection = None
+
+    @property
+    def charset(self):
+        return self._response.charset_encoding
+
+    async def read(self):
+        try:
+            return await self._response.aread()
+        except httpx.TimeoutException:
+            raise asyncio.TimeoutError()
+        except httpx.HTTPError as e:
+            raise aiohttp.ClientPayloadError(f"{type(e).__name__}: {e}")
+
+    async def text(self, encoding=None, errors='strict'):
+        body = await self.read()
+        encoding = encoding or self.charset or 'utf-8'
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            encoding = 'utf-8'
+        return body.decode(encoding, errors=errors)
+
+    async def json(self, content_type='application/json', loads=json.loads, encoding=None):
+        return loads(await self.text(encoding=encoding))
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(None, (), status=self.status, message=self.reason)
+
+    def release(self):
+        pass
+
+    async def close(self):
+        await self._response.aclose()
+
+
+class _Http2RequestContext:
+    """Permite `async with session.get(...)`; o stream é fechado na saída do bloco."""
+
+    def __init__(self, coro):
+        self._coro = coro
+        self._response = None
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    async def __aenter__(self):
+        self._response = await self._coro
+        return self._response
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._response.close()
+        return False
+
+
+def _translate_timeout(timeout):
+    if isinstance(timeout, aiohttp.ClientTimeout):
+        return timeout.total
+    return timeout if timeout is not None else HTTP2_DEFAULT_TIMEOUT
+
+
+class Http2Session:
+    """Sessão httpx com HTTP/2 atrás da interface get/head/post/request do aiohttp."""
+
+    def __init__(self):
+        # Um cliente por modo de verificação do certificado (ssl=False é por requisição no aiohttp)
+        self._clients = {}
+        self.versions = Counter()
+        self.closed = False
+
+    def _client(self, verify):
+        client = self._clients.get(verify)
+        if client is None:
+            client = httpx.AsyncClient(
+                http2=True,
+                verify=verify,
+                limits=httpx.Limits(
+                    max_connections=HTTP2_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP2_KEEPALIVE_CONNECTIONS,
+                ),
+            )
+            self._clients[verify] = client
+        return client
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        kwargs.setdefault('allow_redirects', False)
+        return self.request('HEAD', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        return _Http2RequestContext(self._request(method, url, **kwargs))
+
+    async def _request(self, method, url, params=None, headers=None, data=None, json=None,
+                       timeout=None, allow_redirects=True, ssl=None):
+        # Só as opções acima são suportadas: outra opção do aiohttp gera TypeError na chamada
+        client = self._client(verify=ssl is not False)
+        timeout = _translate_timeout(timeout)
+        request = client.build_request(
+            method, str(url), params=params, headers=headers, data=data, json=json,
+            timeout=httpx.Timeout(timeout),
+        )
+        try:
+            # O timeout total vale até os cabeçalhos; o corpo respeita o timeout de leitura
+            response = await asyncio.wait_for(
+                client.send(request, stream=True, follow_redirects=allow_redirects), timeout
+            )
+        except httpx.TimeoutException:
+            raise asyncio.TimeoutError()
+        except httpx.HTTPError as e:
+            raise aiohttp.ClientConnectionError(f"{type(e).__name__}: {e}")
+
+        self.versions[response.http_version] += 1
+        self._remember_certificate(response)
+        return Http2Response(method, response)
+
+    def _remember_certificate(self, response):
+        url = response.url
+        if url.scheme != 'https' or tls.get_cached(url.host, url.port or 443) is not None:
+            return
+        stream = response.extensions.get('network_stream')
+        ssl_object = stream.get_extra_info('ssl_object') if stream is not None else None
+        if ssl_object is not None:
+            tls.remember(url.host, url.port or 443, tls.certificate_info(ssl_object))
+
+    def stats(self):
+        """Requisições por versão do protocolo (ex: {'HTTP/2': 480, 'HTTP/1.1': 20})."""
+        return dict(self.versions)
+
+    async def close(self):
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        self.closed = True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
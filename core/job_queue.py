@@ -0,0 +1,134 @@
+# Arquivo: core/job_queue.py
+import json
+import os
+import sqlite3
+import time
+
+DEFAULT_QUEUE_DB = os.path.join('reports', 'jobs.db')
+
+# Tempo de posse de um job; se o worker morrer, o job volta para a fila depois disso
+LEASE_SECONDS = 300
+
+# Número máximo de tentativas antes de marcar o job como falho
+MAX_ATTEMPTS = 3
+
+
+class JobQueue:
+    """Fila de sites a validar, guardada em um arquivo SQLite local (sem serviço externo)."""
+
+    def __init__(self, db_path=DEFAULT_QUEUE_DB):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+        # isolation_level=None: as transações são controladas explicitamente (BEGIN IMMEDIATE)
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                lease_until REAL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status_lease ON jobs (status, lease_until);
+        """)
+
+    def enqueue(self, urls):
+        """Adiciona URLs à fila. Retorna o número de jobs criados."""
+        now = time.time()
+        rows = [(url.strip(), now, now) for url in urls if url and url.strip()]
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany("INSERT INTO jobs (url, created_at, updated_at) VALUES (?, ?, ?)", rows)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+    def claim(self, worker_id, lease_seconds=LEASE_SECONDS):
+        """
+        Reserva o próximo job disponível (pendente ou com posse expirada) para o worker.
+        Retorna (job_id, url) ou None se não houver job disponível agora.
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Jobs de workers que morreram e já esgotaram as tentativas são encerrados
+            self.conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Posse expirada após o limite de tentativas.', updated_at = ? "
+                "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, now, MAX_ATTEMPTS)
+            )
+            row = self.conn.execute(
+                "SELECT id, url FROM jobs "
+                "WHERE status = 'pending' OR (status = 'running' AND lease_until < ?) "
+                "ORDER BY id LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row:
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'running', worker = ?, lease_until = ?, attempts = attempts + 1, updated_at = ? "
+                    "WHERE id = ?",
+                    (worker_id, now + lease_seconds, now, row[0])
+                )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return row
+
+    def renew(self, job_id, worker_id, lease_seconds=LEASE_SECONDS):
+        """Estende a posse do job enquanto o worker ainda está trabalhando nele."""
+        now = time.time()
+        cursor = self.conn.execute(
+            "UPDATE jobs SET lease_until = ?, updated_at = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (now + lease_seconds, now, job_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id, worker_id, result):
+        """Grava o resultado da validação e encerra o job."""
+        self.conn.execute(
+            "UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_until = NULL, updated_at = ? "
+            "WHERE id = ? AND worker = ?",
+            (json.dumps(result, ensure_ascii=False, default=str), time.time(), job_id, worker_id)
+        )
+
+    def fail(self, job_id, worker_id, error):
+        """Devolve o job para a fila, ou o marca como falho se as tentativas acabaram."""
+        self.conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ?, lease_until = NULL, updated_at = ? WHERE id = ? AND worker = ?",
+            (MAX_ATTEMPTS, str(error), time.time(), job_id, worker_id)
+        )
+
+    def has_work(self):
+        """Indica se ainda há jobs pendentes ou em execução."""
+        row = self.conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'running')"
+        ).fetchone()
+        return row[0] > 0
+
+    def counts(self):
+        """Retorna o número de jobs por status."""
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def get_result(self, job_id):
+        row = self.conn.execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,66 @@
+# Arquivo: core/parsing.py
+"""
+Parse de HTML fora do event loop.
+
+O BeautifulSoup é síncrono e pesado: quando muitas páginas chegam juntas, parsear no loop
+trava todas as requisições em andamento e limita a execução a um núcleo. As funções de
+extração dos módulos rodam em um pool de processos e devolvem apenas fatos compactos
+(links, H1, meta tags, URLs do breadcrumb), nunca a árvore.
+
+As funções passadas a run_parser precisam ser de nível de módulo (serializáveis por
+pickle). Páginas pequenas são parseadas no próprio loop, onde custam menos que a cópia
+do HTML para outro processo; configure(0) faz o mesmo para todas as páginas.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Processos do pool (padrão: um por núcleo)
+PARSE_WORKERS = os.cpu_count() or 1
+
+# Abaixo deste tamanho (em caracteres) o parse é feito no próprio loop
+PARSE_INLINE_MAX_CHARS = 50_000
+
+_POOL = None
+_max_workers = PARSE_WORKERS
+
+
+def configure(max_workers=None):
+    """Define o tamanho do pool (ex: 1 por processo quando já há vários workers da fila).
+
+    None volta ao padrão (PARSE_WORKERS); 0 desliga o pool e parseia tudo no próprio loop.
+    """
+    global _max_workers
+    shutdown()
+    _max_workers = PARSE_WORKERS if max_workers is None else max_workers
+
+
+def _get_pool():
+    global _POOL
+    if _POOL is None:
+        # spawn: o processo pai tem threads e um event loop rodando, o que torna o fork inseguro
+        _POOL = ProcessPoolExecutor(max_workers=_max_workers, mp_context=multiprocessing.get_context('spawn'))
+    return _POOL
+
+
+def shutdown():
+    global _POOL
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = None
+
+
+async def run_parser(func, html, *args):
+    """Executa func(html, *args) no pool de processos (ou no loop, para páginas pequenas)."""
+    if html is None or len(html) < PARSE_INLINE_MAX_CHARS or _max_workers <= 0:
+        return func(html, *args)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_pool(), func, html, *args)
+    except BrokenProcessPool:
+        # Um processo do pool morreu (ex: falta de memória): recria o pool e tenta uma vez
+        shutdown()
+        return await loop.run_in_executor(_get_pool(), func, html, *args)
@@ -0,0 +1,125 @@
+# Arquivo: core/probe.py
+"""
+Sondagem barata de URLs: descobrir o status sem baixar o corpo.
+
+Cada sondagem tenta HEAD e, se o servidor recusar ou responder com erro, repete com
+GET `Range: bytes=0-0`; o corpo nunca é lido (a resposta é liberada assim que os
+cabeçalhos chegam). Hosts que recusam HEAD (405/501) ou que respondem erro no HEAD
+mas sucesso no GET HEAD_REJECT_THRESHOLD vezes são lembrados por HEAD_REJECT_TTL, e as
+próximas sondagens a eles vão direto ao GET parcial. A memória e os contadores de
+sondagens são por sessão (como o cache de saltos do core.redirects); sessões de cassete
+só contam, sem aprender recusas: gravação e replay fazem sempre a mesma sequência de
+requisições. Usado pelos links, breadcrumbs e imagens via
+core.redirects.
+"""
+import time
+import weakref
+from collections import Counter, namedtuple
+from urllib.parse import urlparse
+
+from core.cassette import RecordingSession, ReplaySession
+from core.probe_scheduler import RETRY_STATUSES
+
+# Status de HEAD que indicam "método não suportado": o host é lembrado na hora
+HEAD_NOT_ALLOWED = (405, 501)
+
+# Recusas de HEAD de um host antes de marcá-lo, e por quanto tempo (segundos) a marca vale
+HEAD_REJECT_THRESHOLD = 2
+HEAD_REJECT_TTL = 60 * 60
+
+RANGE_HEADERS = {'Range': 'bytes=0-0'}
+
+ProbeResponse = namedtuple('ProbeResponse', 'status headers method')
+
+class _HeadMemo:
+    """Recusas de HEAD por host e contadores de sondagens de uma sessão."""
+
+    __slots__ = ('learns', 'rejections', 'rejected', 'stats')
+
+    def __init__(self, learns=True):
+        # Sessões de cassete não aprendem recusas (a sequência gravada não muda)
+        self.learns = learns
+        self.rejections = Counter()
+        # host -> expira_em
+        self.rejected = {}
+        self.stats = Counter()
+
+
+# Sessão -> _HeadMemo
+_MEMOS = weakref.WeakKeyDictionary()
+
+
+def _memo_for(session):
+    memo = _MEMOS.get(session)
+    if memo is None:
+        memo = _MEMOS[session] = _HeadMemo(learns=not isinstance(session, (RecordingSession, ReplaySession)))
+    return memo
+
+
+def rejects_head(memo, host):
+    if not memo.learns:
+        return False
+    expires_at = memo.rejected.get(host)
+    if expires_at is None:
+        return False
+    if time.time() >= expires_at:
+        del memo.rejected[host]
+        return False
+    return True
+
+
+def _count_head_rejection(memo, host):
+    if not memo.learns:
+        return
+    memo.rejections[host] += 1
+    if memo.rejections[host] >= HEAD_REJECT_THRESHOLD:
+        if host not in memo.rejected:
+            memo.stats['hosts_learned'] += 1
+        memo.rejected[host] = time.time() + HEAD_REJECT_TTL
+        del memo.rejections[host]
+
+
+async def _send(session, memo, method, url, timeout, kwargs):
+    headers = {**kwargs.pop('headers', {}), **(RANGE_HEADERS if method == 'GET' else {})}
+    # A saída do bloco sem ler o corpo encerra o download logo após os cabeçalhos
+    async with session.request(method, url, timeout=timeout, allow_redirects=False, headers=headers, **kwargs) as response:
+        status = response.status
+        # 206 (parte do corpo) e 416 (arquivo vazio) confirmam que o recurso existe
+        if method == 'GET' and status in (206, 416):
+            status = 200
+        memo.stats['head' if method == 'HEAD' else 'ranged_get'] += 1
+        return ProbeResponse(status, response.headers, method)
+
+
+async def probe(session, url, method='HEAD', timeout=15, **kwargs):
+    """
+    Sonda uma URL sem seguir redirecionamentos. method='HEAD' usa a estratégia completa
+    (HEAD, com GET parcial de reserva); method='GET' vai direto ao GET parcial.
+    Erros de conexão/timeout são propagados (aiohttp.ClientError/asyncio.TimeoutError).
+    """
+    host = (urlparse(url).hostname or '').lower()
+    memo = _memo_for(session)
+    if method != 'HEAD' or rejects_head(memo, host):
+        if method == 'HEAD':
+            memo.stats['head_skipped'] += 1
+        return await _send(session, memo, 'GET', url, timeout, dict(kwargs))
+
+    response = await _send(session, memo, 'HEAD', url, timeout, dict(kwargs))
+    if response.status < 400 or response.status in RETRY_STATUSES:
+        # Limite de requisições/erro temporário: quem decide a nova tentativa é o agendador
+        return response
+
+    # HEAD com erro: confirma com GET parcial antes de reportar o link como quebrado
+    fallback = await _send(session, memo, 'GET', url, timeout, dict(kwargs))
+    if response.status in HEAD_NOT_ALLOWED or fallback.status < 400:
+        memo.stats['head_rejected'] += 1
+        _count_head_rejection(memo, host)
+    return fallback
+
+
+def stats(session):
+    """Sondagens por tipo feitas pela sessão e hosts que ela aprendeu a sondar sem HEAD."""
+    memo = _MEMOS.get(session)
+    if memo is None:
+        return {"hosts_rejecting_head": 0}
+    return {**memo.stats, "hosts_rejecting_head": len(memo.rejected)}
@@ -0,0 +1,272 @@
+# Arquivo: core/probe_scheduler.py
+"""
+Escalonador de verificações de links por host.
+
+Os links são agrupados por host e distribuídos em rodízio entre os hosts, com um limite de
+requisições simultâneas por host além do limite global. Um host que responde 429/503 é
+adiado pelo tempo do Retry-After (ou do Crawl-delay do robots.txt) sem ocupar vagas
+globais: os trabalhadores seguem atendendo os outros hosts. Um host com várias falhas de
+conexão seguidas tem o circuito aberto e seus links restantes não são mais testados.
+Cada host tem um orçamento de tempo (HOST_TIME_BUDGET): quando o Crawl-delay ou o
+Retry-After empurram a próxima requisição para depois dele, os links restantes do host
+são encerrados como não verificados, sem esperar.
+"""
+import asyncio
+import time
+from array import array
+from collections import deque, namedtuple
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from core.compact import UrlTable, StatusTable
+
+# Limites de concorrência
+GLOBAL_LIMIT = 20
+PER_HOST_LIMIT = 4
+
+# Status que pedem uma nova tentativa mais tarde
+RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+MAX_RETRIES = 2
+
+# Espera sem Retry-After (dobra a cada tentativa) e maior espera aceita
+RETRY_BACKOFF = 1.0
+MAX_RETRY_AFTER = 30.0
+
+# Falhas de conexão seguidas que abrem o circuito do host
+BREAKER_THRESHOLD = 3
+
+# Crawl-delay só é consultado para hosts com ao menos esta quantidade de links
+CRAWL_DELAY_MIN_LINKS = 5
+MAX_CRAWL_DELAY = 10.0
+
+# Tempo máximo (segundos, desde o início da execução) dedicado aos links de cada host
+HOST_TIME_BUDGET = 60.0
+
+# Observações do resultado
+RATE_LIMITED = 'rate_limited'
+CIRCUIT_OPEN = 'circuit_open'
+BUDGET_EXHAUSTED = 'budget_exhausted'
+
+ProbeResult = namedtuple('ProbeResult', 'url status attempts note')
+
+
+def parse_retry_after(value, now=None):
+    """Converte o cabeçalho Retry-After (segundos ou data HTTP) em segundos de espera."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+def parse_crawl_delay(robots_txt):
+    """Crawl-delay do grupo 'User-agent: *' de um robots.txt (None se não houver)."""
+    applies = False
+    for line in robots_txt.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if ':' not in line:
+            continue
+        field, value = (part.strip() for part in line.split(':', 1))
+        field = field.lower()
+        if field == 'user-agent':
+            applies = value == '*'
+        elif field == 'crawl-delay' and applies:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+
+class _HostState:
+    __slots__ = ('pending', 'active', 'not_before', 'interval', 'failures', 'open')
+
+    def __init__(self):
+        self.pending = deque()
+        self.active = 0
+        self.not_before = 0.0
+        self.interval = 0.0
+        self.failures = 0
+        self.open = False
+
+
+class ProbeResults:
+    """
+    Resultados dos testes guardados em UrlTable + StatusTable (arrays por id de URL), sem
+    uma tupla por link. Os ProbeResult são montados só durante a iteração.
+    """
+
+    __slots__ = ('urls', 'table')
+
+    def __init__(self, urls, table):
+        self.urls = urls
+        self.table = table
+
+    def _result(self, url_id):
+        status, attempts, note = self.table.get(url_id)
+        return ProbeResult(self.urls.url(url_id), status, attempts, note)
+
+    def items(self):
+        for url_id in self.table.filled():
+            yield self.urls.url(url_id), self._result(url_id)
+
+    def __getitem__(self, url):
+        url_id = self.urls.id_of(url)
+        if url_id is None or self.table.get(url_id) is None:
+            raise KeyError(url)
+        return self._result(url_id)
+
+    def __len__(self):
+        return len(self.table)
+
+
+class ProbeScheduler:
+    """
+    Executa probe(url, attempt) -> (status, retry_after) para cada URL, respeitando os
+    limites por host. status 0 indica erro de conexão/timeout.
+    """
+
+    def __init__(self, probe, global_limit=GLOBAL_LIMIT, per_host_limit=PER_HOST_LIMIT,
+                 max_retries=MAX_RETRIES, crawl_delay=None, host_budget=HOST_TIME_BUDGET):
+        self.probe = probe
+        self.global_limit = global_limit
+        self.per_host_limit = per_host_limit
+        self.max_retries = max_retries
+        # crawl_delay(host_url) -> segundos ou None; consultado para hosts com muitos links
+        self.crawl_delay = crawl_delay
+        self.host_budget = host_budget
+        self._deadline = None
+        self._hosts = {}
+        self._ring = deque()
+        self._remaining = 0
+        self._urls = UrlTable()
+        self._table = StatusTable()
+        # Tentativa atual de cada URL (por id); as filas dos hosts guardam só os ids
+        self._attempts = array('B')
+        self._condition = None
+
+    def _finish(self, url_id, status, attempts, note=None):
+        self._table.set(url_id, status, attempts, note)
+        self._remaining -= 1
+
+    def _next_job(self, now):
+        """Próximo (host, url, tentativa) em rodízio, ou o tempo até um host ficar livre."""
+        wait = None
+        for _ in range(len(self._ring)):
+            host = self._ring[0]
+            self._ring.rotate(-1)
+            state = self._hosts[host]
+            if not state.pending or state.active >= self.per_host_limit:
+                continue
+            if state.not_before > self._deadline:
+                # A próxima vaga do host cai depois do orçamento: o resto fica sem verificar
+                while state.pending:
+                    pending_id = state.pending.popleft()
+                    self._finish(pending_id, 0, self._attempts[pending_id], BUDGET_EXHAUSTED)
+                continue
+            if state.not_before > now:
+                remaining = state.not_before - now
+                wait = remaining if wait is None else min(wait, remaining)
+                continue
+            url_id = state.pending.popleft()
+            state.active += 1
+            state.not_before = now + state.interval
+            return (host, url_id), None
+        return None, wait
+
+    async def _run_job(self, host, url_id):
+        state = self._hosts[host]
+        attempt = self._attempts[url_id]
+        try:
+            status, retry_after = await self.probe(self._urls.url(url_id), attempt)
+        except Exception:
+            status, retry_after = 0, None
+
+        state.active -= 1
+        if status == 0:
+            state.failures += 1
+            if state.failures >= BREAKER_THRESHOLD and not state.open:
+                # Host claramente fora do ar: encerra os links restantes sem testá-los
+                state.open = True
+                while state.pending:
+                    pending_id = state.pending.popleft()
+                    self._finish(pending_id, 0, self._attempts[pending_id], CIRCUIT_OPEN)
+            self._finish(url_id, 0, attempt + 1)
+            return
+        state.failures = 0
+
+        if status in RETRY_STATUSES and attempt < self.max_retries and not state.open:
+            delay = retry_after if retry_after is not None else RETRY_BACKOFF * (2 ** attempt)
+            if delay <= MAX_RETRY_AFTER:
+                # O host é adiado; os trabalhadores continuam atendendo os demais hosts
+                state.not_before = max(state.not_before, time.monotonic() + delay)
+                self._attempts[url_id] = attempt + 1
+                state.pending.appendleft(url_id)
+                return
+        # 429, ou 503 com Retry-After, é limitação de requisições e não um link quebrado
+        rate_limited = status == 429 or (status == 503 and retry_after is not None)
+        note = RATE_LIMITED if rate_limited else None
+        self._finish(url_id, status, attempt + 1, note)
+
+    async def _worker(self):
+        while True:
+            async with self._condition:
+                while True:
+                    if self._remaining <= 0:
+                        self._condition.notify_all()
+                        return
+                    job, wait = self._next_job(time.monotonic())
+                    if job is not None:
+                        break
+                    if self._remaining <= 0:
+                        # _next_job encerrou os últimos links (orçamento do host esgotado)
+                        continue
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), wait)
+                    except asyncio.TimeoutError:
+                        pass
+            await self._run_job(*job)
+            async with self._condition:
+                self._condition.notify_all()
+
+    async def _apply_crawl_delays(self):
+        busy_hosts = [host for host, state in self._hosts.items() if len(state.pending) >= CRAWL_DELAY_MIN_LINKS]
+        delays = await asyncio.gather(*(self.crawl_delay(host) for host in busy_hosts), return_exceptions=True)
+        for host, delay in zip(busy_hosts, delays):
+            if isinstance(delay, (int, float)) and delay > 0:
+                state = self._hosts[host]
+                # Espaça o início das requisições ao host pelo Crawl-delay
+                state.interval = min(float(delay), MAX_CRAWL_DELAY)
+
+    async def run(self, urls):
+        """Testa todas as URLs e retorna um ProbeResults (url -> ProbeResult)."""
+        for url in urls:
+            if url in self._urls:
+                continue
+            url_id = self._urls.add(url)
+            self._attempts.append(0)
+            parsed = urlparse(url)
+            host = f"{parsed.scheme}://{parsed.netloc.lower()}"
+            if host not in self._hosts:
+                self._hosts[host] = _HostState()
+                self._ring.append(host)
+            self._hosts[host].pending.append(url_id)
+            self._remaining += 1
+
+        if self.crawl_delay is not None:
+            await self._apply_crawl_delays()
+
+        self._deadline = time.monotonic() + self.host_budget
+        self._condition = asyncio.Condition()
+        workers = min(self.global_limit, self._remaining)
+        await asyncio.gather(*(self._worker() for _ in range(workers)))
+        return ProbeResults(self._urls, self._table)
@@ -0,0 +1,184 @@
+# Arquivo: core/profiling.py
+"""
+Perfilamento das validações: CPU (cProfile), alocações (tracemalloc) e atraso do event loop.
+
+Com o perfilamento ligado os módulos rodam um de cada vez, para que o tempo de CPU, as
+alocações e os travamentos do loop sejam atribuídos ao módulo certo.
+"""
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+
+# Intervalo do batimento do event loop e atraso a partir do qual um travamento é registrado
+LAG_INTERVAL = 0.05
+LAG_THRESHOLD = 0.1
+
+# Quantidade de itens nos resumos
+TOP_HOTSPOTS = 15
+TOP_STALLS = 10
+TOP_ALLOCATIONS = 5
+
+
+class LoopLagMonitor:
+    """
+    Mede o atraso do event loop com um batimento periódico. Uma thread de vigia captura a
+    pilha da thread do loop enquanto ele está travado, mostrando qual chamada síncrona
+    (ex: BeautifulSoup, pisa.CreatePDF) está bloqueando as corrotinas.
+    """
+
+    def __init__(self, interval=LAG_INTERVAL, threshold=LAG_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self.current = None
+        self.stalls = []
+        self._last_beat = time.perf_counter()
+        self._pending_stack = None
+        self._pending_module = None
+        self._loop_thread_id = None
+        self._task = None
+        self._stop_event = threading.Event()
+        self._watchdog = None
+
+    async def _heartbeat(self):
+        while True:
+            self._last_beat = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - self._last_beat - self.interval
+            if lag > self.threshold:
+                # O módulo é o que estava rodando quando a vigia viu o travamento
+                self.stalls.append({
+                    "module": self._pending_module or self.current,
+                    "lag_s": round(lag, 3),
+                    "stack": self._pending_stack or [],
+                })
+            self._pending_stack = None
+            self._pending_module = None
+
+    def _watch(self):
+        while not self._stop_event.wait(self.interval / 2):
+            if self._pending_stack is not None:
+                continue
+            if time.perf_counter() - self._last_beat > self.interval + self.threshold:
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    self._pending_module = self.current
+                    self._pending_stack = traceback.format_stack(frame)[-8:]
+
+    def start(self):
+        self._loop_thread_id = threading.get_ident()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stop_event.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._watchdog:
+            self._watchdog.join()
+
+    def longest(self, n=TOP_STALLS):
+        return sorted(self.stalls, key=lambda s: s['lag_s'], reverse=True)[:n]
+
+
+class ModuleProfiler:
+    """Perfila cada módulo de validação e grava um .prof por módulo mais um resumo."""
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        self.monitor = LoopLagMonitor()
+        self.modules = []
+        self._started_tracemalloc = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.monitor.start()
+
+    async def stop(self):
+        await self.monitor.stop()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+    async def run(self, name, coro):
+        """Executa a corrotina de um módulo sob cProfile e tracemalloc."""
+        profile = cProfile.Profile()
+        self.monitor.current = name
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+
+        profile.enable()
+        try:
+            return await coro
+        finally:
+            profile.disable()
+            wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+            _, peak = tracemalloc.get_traced_memory()
+            top_allocations = tracemalloc.take_snapshot().compare_to(before, 'lineno')[:TOP_ALLOCATIONS]
+            self.monitor.current = None
+
+            profile_path = os.path.join(self.output_dir, f"{name}.prof")
+            profile.dump_stats(profile_path)
+            self.modules.append({
+                "module": name,
+                "wall_s": round(wall, 3),
+                "cpu_s": round(cpu, 3),
+                "peak_memory_mb": round(peak / (1024 * 1024), 2),
+                "top_allocations": [str(stat) for stat in top_allocations],
+                "profile": profile_path,
+                "stats": pstats.Stats(profile),
+            })
+
+    def write_summary(self):
+        """Grava summary.txt com os hotspots de CPU por módulo e os maiores travamentos do loop."""
+        out = io.StringIO()
+        out.write("=== Resumo por módulo ===\n")
+        out.write(f"{'Módulo':<28}{'Parede (s)':>12}{'CPU (s)':>10}{'Pico (MB)':>12}\n")
+        for entry in sorted(self.modules, key=lambda m: m['cpu_s'], reverse=True):
+            out.write(f"{entry['module']:<28}{entry['wall_s']:>12}{entry['cpu_s']:>10}{entry['peak_memory_mb']:>12}\n")
+
+        out.write("\n=== Maiores travamentos do event loop ===\n")
+        stalls = self.monitor.longest()
+        if not stalls:
+            out.write(f"Nenhum travamento acima de {self.monitor.threshold * 1000:.0f} ms.\n")
+        for stall in stalls:
+            out.write(f"\n{stall['lag_s'] * 1000:.0f} ms em '{stall['module']}'\n")
+            out.write(''.join(stall['stack']) or "  (pilha não capturada)\n")
+
+        for entry in self.modules:
+            out.write(f"\n=== {entry['module']}: hotspots de CPU (tottime) ===\n")
+            entry['stats'].stream = out
+            entry['stats'].sort_stats('tottime').print_stats(TOP_HOTSPOTS)
+            out.write("Maiores alocações:\n")
+            for line in entry['top_allocations']:
+                out.write(f"  {line}\n")
+
+        summary_path = os.path.join(self.output_dir, 'summary.txt')
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(out.getvalue())
+        return summary_path
+
+
+def profile_call(output_dir, name, func, *args, **kwargs):
+    """Perfila uma chamada síncrona (ex: geração do PDF) e grava <name>.prof."""
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    profile = cProfile.Profile()
+    result = profile.runcall(func, *args, **kwargs)
+    profile.dump_stats(os.path.join(output_dir, f"{name}.prof"))
+    return result
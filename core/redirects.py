@@ -0,0 +1,138 @@
+# Arquivo: core/redirects.py
+"""
+Cadeias de redirecionamento dos links.
+
+Em vez de allow_redirects=True (que só devolve o status final), cada salto é sondado
+(core.probe: HEAD ou GET parcial, sem ler o corpo) sem seguir redirecionamentos,
+registrando status, destino e latência. Os
+saltos ficam em cache por sessão: links diferentes que passam pelos mesmos saltos
+intermediários (http -> https -> www -> barra final) resolvem cada um uma única vez.
+"""
+import aiohttp
+import asyncio
+import time
+import weakref
+from collections import OrderedDict, namedtuple
+from urllib.parse import urljoin
+
+from core import probe
+from core.probe_scheduler import parse_retry_after, RETRY_STATUSES
+
+# Saltos seguidos antes de desistir (a cadeia é tratada como loop)
+MAX_REDIRECTS = 10
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+# Saltos guardados por sessão (os mais antigos saem primeiro) e por quanto tempo
+REDIRECT_CACHE_MAX = 50_000
+REDIRECT_CACHE_TTL = 10 * 60
+
+Hop = namedtuple('Hop', 'url status location elapsed_ms retry_after')
+
+
+class Chain(namedtuple('Chain', 'url hops loop')):
+    """Cadeia de um link: saltos em ordem e se terminou em loop (ou excesso de saltos)."""
+
+    __slots__ = ()
+
+    @property
+    def status(self):
+        return self.hops[-1].status if self.hops else 0
+
+    @property
+    def final_url(self):
+        return self.hops[-1].url if self.hops else self.url
+
+    @property
+    def redirects(self):
+        """Número de redirecionamentos (saltos além do primeiro pedido)."""
+        return len(self.hops) - 1
+
+    @property
+    def elapsed_ms(self):
+        return sum(hop.elapsed_ms for hop in self.hops)
+
+    def describe(self):
+        """'a [301, 12 ms] -> b [200, 30 ms]' para o relatório."""
+        return " -> ".join(f"{hop.url} [{hop.status or 'erro'}, {hop.elapsed_ms:.0f} ms]" for hop in self.hops)
+
+
+# Sessão -> cache de saltos ((método, url, opções) -> (expira_em, Hop ou future))
+_CACHES = weakref.WeakKeyDictionary()
+
+
+def _cache_for(session):
+    cache = _CACHES.get(session)
+    if cache is None:
+        cache = _CACHES[session] = OrderedDict()
+    return cache
+
+
+def _options_key(kwargs):
+    """
+    Parte da chave do cache com as opções da requisição (ssl, headers...): um salto sondado
+    com ssl=False não serve para quem pediu verificação do certificado.
+    """
+    return tuple(sorted((name, repr(value)) for name, value in kwargs.items()))
+
+
+async def _request_hop(session, method, url, timeout, kwargs):
+    started = time.perf_counter()
+    try:
+        response = await probe.probe(session, url, method=method, timeout=timeout, **kwargs)
+        location = response.headers.get('Location') if response.status in REDIRECT_STATUSES else None
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        status = response.status
+    except (asyncio.TimeoutError, aiohttp.ClientError):
+        status, location, retry_after = 0, None, None
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return Hop(url, status, urljoin(url, location) if location else None, elapsed_ms, retry_after)
+
+
+async def _hop(session, method, url, timeout, kwargs):
+    cache = _cache_for(session)
+    key = (method, url, _options_key(kwargs))
+    entry = cache.get(key)
+    if entry is not None:
+        expires_at, value = entry
+        if time.time() < expires_at:
+            return await asyncio.shield(value) if isinstance(value, asyncio.Future) else value
+        del cache[key]
+
+    future = asyncio.ensure_future(_request_hop(session, method, url, timeout, kwargs))
+    cache[key] = (time.time() + REDIRECT_CACHE_TTL, future)
+    try:
+        hop = await asyncio.shield(future)
+    except BaseException:
+        cache.pop(key, None)
+        raise
+    # Falhas e status de nova tentativa não ficam em cache: a próxima tentativa vai à rede
+    if hop.status == 0 or hop.status in RETRY_STATUSES:
+        cache.pop(key, None)
+    else:
+        cache[key] = (time.time() + REDIRECT_CACHE_TTL, hop)
+        while len(cache) > REDIRECT_CACHE_MAX:
+            cache.popitem(last=False)
+    return hop
+
+
+async def follow(session, url, method='HEAD', timeout=15, max_redirects=MAX_REDIRECTS, **kwargs):
+    """
+    Segue os redirecionamentos de url salto a salto. method='HEAD' sonda com HEAD (e GET
+    parcial de reserva); method='GET' só com GET parcial. Retorna a Chain.
+    """
+    hops = []
+    seen = set()
+    current = url
+    while True:
+        if current in seen or len(hops) > max_redirects:
+            return Chain(url, tuple(hops), True)
+        seen.add(current)
+        hop = await _hop(session, method, current, timeout, kwargs)
+        hops.append(hop)
+        if hop.location is None:
+            return Chain(url, tuple(hops), False)
+        # 303 troca o método por GET, como fazem os navegadores
+        if hop.status == 303:
+            method = 'GET'
+        current = hop.location
@@ -0,0 +1,250 @@
+# Arquivo: core/render.py
+"""
+Renderização das páginas no Chromium (Playwright) com registro de toda a rede.
+
+Cada resposta que o navegador recebe ao carregar a página (imagens, scripts, folhas de
+estilo, fontes, inclusive as injetadas por JS ou carregadas sob demanda) entra no log de
+rede com URL, status, tipo, tamanho, tempo e cabeçalhos. Os módulos leem esse log em vez
+de refazer as requisições.
+
+O PageRenderer de uma execução guarda a renderização de cada URL, para que vários
+módulos usem o mesmo carregamento. O Playwright é importado só quando necessário.
+
+No modo DOM renderizado (dom_mode), os módulos estáticos recebem o HTML serializado
+depois da execução do JS (via fetch_html) em vez do HTML do servidor, o que corrige os
+falsos negativos em sites feitos com frameworks JS (SPA).
+"""
+import asyncio
+from collections import namedtuple
+
+# Tempo máximo para a página carregar e para a rede ficar ociosa depois da rolagem
+RENDER_TIMEOUT_MS = 30_000
+NETWORK_IDLE_TIMEOUT_MS = 5_000
+
+# Páginas renderizadas ao mesmo tempo no contexto compartilhado
+RENDER_CONCURRENCY = 4
+
+# Resoluções de tela para testes (scroll lateral, métricas de velocidade...)
+SCREEN_RESOLUTIONS = {
+    "desktop": {"width": 1920, "height": 1080},
+    "tablet": {"width": 768, "height": 1024},
+    "mobile": {"width": 375, "height": 667}
+}
+
+# Cabeçalhos de resposta guardados no log (compressão, cache e tipo)
+LOGGED_HEADERS = (
+    'content-type', 'content-length', 'content-encoding', 'cache-control',
+    'expires', 'etag', 'last-modified', 'age', 'vary', 'connection',
+)
+
+# Falhas de rede que não indicam recurso quebrado (cancelamentos do próprio navegador)
+IGNORED_FAILURES = ('net::ERR_ABORTED', 'NS_BINDING_ABORTED')
+
+Render = namedtuple('Render', 'url final_url status html network_log')
+
+# Tamanho descomprimido de cada recurso segundo a Resource Timing API (0 em recursos de
+# outras origens sem Timing-Allow-Origin)
+DECODED_SIZES_JS = """
+performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+    .map(e => [e.name, e.decodedBodySize])
+"""
+
+
+def _network_entry(request, response=None, sizes=None, failure=None):
+    timing = request.timing or {}
+    start, end = timing.get('startTime', -1), timing.get('responseEnd', -1)
+    headers = response.headers if response is not None else {}
+    return {
+        "url": request.url,
+        "status": response.status if response is not None else 0,
+        "type": request.resource_type,
+        "size": (sizes or {}).get('responseBodySize', 0),
+        "transfer_size": (sizes or {}).get('responseBodySize', 0) + (sizes or {}).get('responseHeadersSize', 0),
+        # Tamanho descomprimido, preenchido pela Resource Timing API quando disponível
+        "decoded_size": None,
+        "time_ms": round(end, 1) if start >= 0 and end >= 0 else None,
+        "headers": {name: headers[name] for name in LOGGED_HEADERS if name in headers},
+        "failure": failure,
+    }
+
+
+def _render_key(url):
+    # 'https://site.com' e 'https://site.com/' são a mesma renderização
+    return url.rstrip('/')
+
+
+class NetworkRecorder:
+    """Registra as respostas e falhas de rede de uma página do Playwright."""
+
+    def __init__(self, page):
+        self.entries = []
+        self._pending = set()
+        page.on('requestfinished', self._on_finished)
+        page.on('requestfailed', self._on_failed)
+
+    def _on_finished(self, request):
+        task = asyncio.ensure_future(self._record_finished(request))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _record_finished(self, request):
+        try:
+            response = await request.response()
+            sizes = await request.sizes()
+        except Exception:
+            response, sizes = None, None
+        self.entries.append(_network_entry(request, response, sizes))
+
+    def _on_failed(self, request):
+        failure = request.failure or 'falha de rede'
+        if not failure.startswith(IGNORED_FAILURES):
+            self.entries.append(_network_entry(request, failure=failure))
+
+    async def finish(self):
+        """Aguarda os registros ainda em andamento e retorna o log."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        return self.entries
+
+
+async def _fill_decoded_sizes(page, network_log):
+    try:
+        decoded = {name: size for name, size in await page.evaluate(DECODED_SIZES_JS) if size}
+    except Exception:
+        return
+    for entry in network_log:
+        entry['decoded_size'] = decoded.get(entry['url'])
+
+
+async def load_page(page, url):
+    """
+    Carrega a página registrando a rede, rola até o fim para disparar o carregamento sob
+    demanda e espera a rede ficar ociosa. Retorna um Render.
+    """
+    recorder = NetworkRecorder(page)
+    response = await page.goto(url, timeout=RENDER_TIMEOUT_MS)
+    try:
+        await page.evaluate("window.scrollTo(0, document.body ? document.body.scrollHeight : 0)")
+        await page.wait_for_load_state('networkidle', timeout=NETWORK_IDLE_TIMEOUT_MS)
+    except Exception:
+        # Páginas com polling ou websockets nunca ficam ociosas; segue com o que já carregou
+        pass
+    html = await page.content()
+    network_log = await recorder.finish()
+    await _fill_decoded_sizes(page, network_log)
+    return Render(url, page.url, response.status if response else 0, html, network_log)
+
+
+class PageRenderer:
+    """
+    Renderizações de uma execução, uma por URL, em um único contexto do navegador.
+    Usa o navegador recebido (ex: o do serviço) ou abre um Chromium próprio na primeira
+    renderização e o fecha em close(). dom_mode: os módulos estáticos leem o DOM renderizado.
+    enabled=False (replay de cassete): nenhum navegador é aberto e render() retorna None.
+    """
+
+    def __init__(self, browser=None, dom_mode=False, enabled=True):
+        self.browser = browser
+        self.dom_mode = dom_mode
+        self._playwright = None
+        self._own_browser = False
+        self._context = None
+        self._renders = {}
+        self._browser_lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(RENDER_CONCURRENCY)
+        self.available = enabled
+        # Motivo exibido pelos módulos quando não há navegador
+        self.unavailable_reason = None if enabled else "Replay de cassete, sem navegador ao vivo"
+
+    async def get_browser(self):
+        """Navegador da execução, ou None se o Playwright não estiver instalado."""
+        async with self._browser_lock:
+            if self.browser is None and self.available:
+                try:
+                    from playwright.async_api import async_playwright
+                except ImportError:
+                    self.available = False
+                    self.unavailable_reason = "Playwright não está instalado"
+                    return None
+                self._playwright = await async_playwright().start()
+                self.browser = await self._playwright.chromium.launch()
+                self._own_browser = True
+        return self.browser
+
+    def get_cached(self, url):
+        """Renderização já concluída da URL, sem disparar uma nova."""
+        future = self._renders.get(_render_key(url))
+        if future is None or not future.done() or future.cancelled() or future.exception():
+            return None
+        return future.result()
+
+    async def _get_context(self):
+        browser = await self.get_browser()
+        async with self._browser_lock:
+            if self._context is None and browser is not None:
+                self._context = await browser.new_context()
+        return self._context
+
+    async def _render(self, url):
+        context = await self._get_context()
+        if context is None:
+            return None
+        async with self._slots:
+            page = await context.new_page()
+            try:
+                return await load_page(page, url)
+            finally:
+                await page.close()
+
+    async def render(self, url):
+        """Renderização da URL (feita uma única vez por execução), ou None sem Playwright."""
+        key = _render_key(url)
+        future = self._renders.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._render(url))
+            self._renders[key] = future
+        return await asyncio.shield(future)
+
+    async def close(self):
+        for future in self._renders.values():
+            if not future.done():
+                future.cancel()
+        self._renders.clear()
+        if self._context is not None:
+            await self._context.close()
+            self._context = None
+        if self._own_browser and self.browser is not None:
+            await self.browser.close()
+            self.browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+async def fetch_html(session, url, renderer=None, timeout=20):
+    """
+    HTML de entrada dos módulos estáticos: (status, html). No modo DOM renderizado vem da
+    renderização compartilhada; sem ele (ou se a renderização falhar), do servidor.
+    """
+    if renderer is not None and renderer.dom_mode:
+        try:
+            render = await renderer.render(url)
+        except Exception:
+            render = None
+        if render is not None:
+            return render.status, render.html
+    async with session.get(url, timeout=timeout) as response:
+        if response.status != 200:
+            return response.status, None
+        return response.status, await response.text()
+
+
+def is_broken(entry):
+    """Entrada do log com status HTTP de erro ou falha de rede."""
+    return bool(entry['failure']) or entry['status'] >= 400
+
+
+def describe(entry):
+    """Texto de um recurso quebrado para o relatório: '[404] image https://...'."""
+    problem = entry['failure'] or entry['status']
+    return f"[{problem}] {entry['type']} {entry['url']}"
@@ -1,97 +1,241 @@
 # Arquivo: core/report_generator.py
+import csv
+import gzip
+import io
+import json
 import os
-from xhtml2pdf import pisa  # Você precisará instalar: pip install xhtml2pdf
+from collections import Counter
 from datetime import datetime
+from html import escape
+from xhtml2pdf import pisa  # Você precisará instalar: pip install xhtml2pdf
 
-def generate_html_report(results: dict) -> str:
+from core.findings import iter_findings
+
+# Itens de cada lista mostrados no PDF; a lista completa fica no apêndice
+TOP_N_SAMPLES = 10
+
+# Textos de detalhe maiores que isso são cortados no PDF
+MAX_DETAIL_CHARS = 600
+
+# Formato do apêndice com todos os achados ('jsonl' ou 'csv', sempre comprimido)
+APPENDIX_FORMAT = 'jsonl'
+
+APPENDIX_FIELDS = ('module', 'status', 'kind', 'target', 'message')
+
+STATUS_ORDER = ('reprovado', 'erro', 'atencao', 'aprovado', 'nao_se_aplica', 'ignorado')
+
+STYLE = """
+    body { font-family: Arial, sans-serif; margin: 20mm; }
+    h1 { color: #2C3E50; border-bottom: 2px solid #3498DB; padding-bottom: 5px; }
+    h2 { color: #3498DB; margin-top: 20px; }
+    .header { text-align: center; margin-bottom: 30px; }
+    .status-aprovado { color: green; font-weight: bold; }
+    .status-reprovado { color: red; font-weight: bold; }
+    .status-atencao { color: orange; font-weight: bold; }
+    .status-ignorado { color: #7F8C8D; font-weight: bold; }
+    .validation-box { border: 1px solid #ECF0F1; padding: 10px; margin-bottom: 15px; border-radius: 5px; }
+    table { width: 100%; margin-bottom: 15px; }
+    th, td { border: 1px solid #BDC3C7; padding: 4px; text-align: left; }
+    th { background-color: #ECF0F1; }
+    .more { color: #7F8C8D; font-style: italic; }
+"""
+
+
+def _truncate(text, limit=MAX_DETAIL_CHARS):
+    text = str(text)
+    if len(text) <= limit:
+        return escape(text)
+    return f"{escape(text[:limit])}… <span class='more'>({len(text) - limit} caracteres omitidos)</span>"
+
+
+def _title(name):
+    return escape(str(name).replace('_', ' ').title())
+
+
+def write_findings_appendix(results, path, fmt=APPENDIX_FORMAT):
     """
-    Cria o conteúdo HTML do relatório a partir dos resultados da auditoria.
+    Grava todos os achados da auditoria em um arquivo comprimido (JSONL ou CSV), um por
+    linha, à medida que são gerados. Retorna a contagem de achados por módulo.
+    """
+    counts = Counter()
+    with gzip.open(path, 'wt', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f) if fmt == 'csv' else None
+        if writer:
+            writer.writerow(APPENDIX_FIELDS)
+        for validation in results.get('validations', []):
+            module = validation.get('module', 'unknown')
+            status = validation.get('result', 'erro')
+            for finding in iter_findings(validation):
+                row = (module, status, finding.kind, finding.target, finding.message)
+                if writer:
+                    writer.writerow(row)
+                else:
+                    f.write(json.dumps(dict(zip(APPENDIX_FIELDS, row)), ensure_ascii=False) + "\n")
+                counts[module] += 1
+    return counts
+
+
+def count_findings(results):
+    """Contagem de achados por módulo, sem gravar o apêndice."""
+    counts = Counter()
+    for validation in results.get('validations', []):
+        counts[validation.get('module', 'unknown')] += sum(1 for _ in iter_findings(validation))
+    return counts
+
+
+def _write_more(out, total):
+    """Aviso dos itens que passaram de TOP_N_SAMPLES e só aparecem no apêndice."""
+    if total > TOP_N_SAMPLES:
+        out.write(f"<p class='more'>… e mais {total - TOP_N_SAMPLES} item(ns) (lista completa no apêndice).</p>")
+
+
+def _write_table(out, rows):
+    """Lista de dicionários (mesmas chaves) vira uma tabela com as TOP_N_SAMPLES primeiras linhas."""
+    columns = list(rows[0])
+    out.write("<table><tr>" + "".join(f"<th>{escape(str(c))}</th>" for c in columns) + "</tr>")
+    for row in rows[:TOP_N_SAMPLES]:
+        out.write("<tr>" + "".join(f"<td>{_truncate(row.get(c, ''))}</td>" for c in columns) + "</tr>")
+    out.write("</table>")
+    _write_more(out, len(rows))
+
+
+def _write_value(out, value):
+    """
+    Escreve um valor de detalhe: listas de dicionários viram tabela; as demais listas viram
+    amostra de TOP_N_SAMPLES itens (tabelas também param em TOP_N_SAMPLES linhas).
+    """
+    if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+        _write_table(out, value)
+    elif isinstance(value, (list, tuple, set)):
+        items = list(value) if not isinstance(value, list) else value
+        out.write("<ul>")
+        for item in items[:TOP_N_SAMPLES]:
+            out.write(f"<li>{_truncate(item)}</li>")
+        out.write("</ul>")
+        _write_more(out, len(items))
+    else:
+        out.write(_truncate(value))
+
+
+def _write_summary(out, validations, counts):
+    out.write("<h2>Resumo por Módulo</h2><table><tr><th>Módulo</th><th>Status</th><th>Achados</th></tr>")
+    for validation in validations:
+        module = validation.get('module', 'Módulo Desconhecido')
+        status = validation.get('result', 'erro').lower()
+        out.write(
+            f"<tr><td>{_title(module)}</td><td class='status-{escape(status)}'>{escape(status.upper())}</td>"
+            f"<td>{counts.get(module, 0)}</td></tr>"
+        )
+    out.write("</table>")
+
+    modules_by_status = Counter(validation.get('result', 'erro').lower() for validation in validations)
+    findings_by_status = Counter()
+    for validation in validations:
+        findings_by_status[validation.get('result', 'erro').lower()] += counts.get(validation.get('module', 'unknown'), 0)
+    statuses = [s for s in STATUS_ORDER if s in modules_by_status] + sorted(set(modules_by_status) - set(STATUS_ORDER))
+    out.write("<h2>Resumo por Status</h2><table><tr><th>Status</th><th>Módulos</th><th>Achados</th></tr>")
+    for status in statuses:
+        out.write(
+            f"<tr><td class='status-{escape(status)}'>{escape(status.upper())}</td>"
+            f"<td>{modules_by_status[status]}</td><td>{findings_by_status[status]}</td></tr>"
+        )
+    out.write("</table>")
+
+
+def write_html_report(results: dict, out, counts=None, appendix_name=None):
+    """
+    Escreve o HTML do relatório em `out` (qualquer objeto com write), parte por parte.
+    O tamanho é limitado: tabelas de resumo, amostras de TOP_N_SAMPLES itens por lista,
+    linhas de tabela e chaves de detalhe, e textos cortados em MAX_DETAIL_CHARS; a íntegra
+    vai para o apêndice.
     """
     url = results.get('url', 'URL Desconhecida')
     timestamp = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-    
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Relatório de Auditoria QA</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 20mm; }}
-            h1 {{ color: #2C3E50; border-bottom: 2px solid #3498DB; padding-bottom: 5px; }}
-            h2 {{ color: #3498DB; margin-top: 20px; }}
-            .header {{ text-align: center; margin-bottom: 30px; }}
-            .status-aprovado {{ color: green; font-weight: bold; }}
-            .status-reprovado {{ color: red; font-weight: bold; }}
-            .status-atencao {{ color: orange; font-weight: bold; }}
-            .validation-box {{ border: 1px solid #ECF0F1; padding: 10px; margin-bottom: 15px; border-radius: 5px; }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>Relatório de Auditoria de Qualidade e SEO</h1>
-            <p><strong>Site Auditado:</strong> {url}</p>
-            <p><strong>Data da Análise:</strong> {timestamp}</p>
-        </div>
-    """
-    
-    for validation in results.get('validations', []):
+    validations = results.get('validations', [])
+    counts = counts if counts is not None else count_findings(results)
+
+    out.write(
+        "<!DOCTYPE html><html><head><title>Relatório de Auditoria QA</title>"
+        f"<style>{STYLE}</style></head><body>"
+        "<div class='header'><h1>Relatório de Auditoria de Qualidade e SEO</h1>"
+        f"<p><strong>Site Auditado:</strong> {escape(url)}</p>"
+        f"<p><strong>Data da Análise:</strong> {timestamp}</p>"
+    )
+    if appendix_name:
+        out.write(f"<p><strong>Lista completa de achados:</strong> {escape(appendix_name)} ({sum(counts.values())} achados)</p>")
+    out.write("</div>")
+
+    _write_summary(out, validations, counts)
+
+    for validation in validations:
         module = validation.get('module', 'Módulo Desconhecido')
         result_status = validation.get('result', 'erro').lower()
         details = validation.get('details', 'Sem detalhes')
 
-        # Determina a classe CSS para a cor
-        status_class = f"status-{result_status}"
-        
-        # Converte detalhes complexos (como listas e dicionários) para string formatada
+        out.write(
+            f"<div class='validation-box'><h2>{_title(module)}</h2>"
+            f"<p>Status: <span class='status-{escape(result_status)}'>{escape(result_status.upper())}</span></p>"
+            "<p>Detalhes:</p><div>"
+        )
+        # Converte detalhes complexos (como listas e dicionários) em blocos com amostras
         if isinstance(details, dict):
-             details_str = ""
-             for key, value in details.items():
-                 details_str += f"<strong>{key.replace('_', ' ').title()}:</strong> {value}<br>"
+            # Detalhes indexados por URL podem ter milhares de chaves: só as primeiras vão ao PDF
+            for key, value in list(details.items())[:TOP_N_SAMPLES]:
+                out.write(f"<p><strong>{_title(key)}:</strong> ")
+                _write_value(out, value)
+                out.write("</p>")
+            _write_more(out, len(details))
         else:
-            details_str = str(details)
-
-        html_content += f"""
-        <div class="validation-box">
-            <h2>{module.replace('_', ' ').title()}</h2>
-            <p>Status: <span class="{status_class}">{result_status.upper()}</span></p>
-            <p>Detalhes:</p>
-            <p>{details_str}</p>
-        </div>
-        """
-        
-    html_content += "</body></html>"
-    return html_content
-
-def convert_html_to_pdf(source_html: str, output_filename: str):
+            _write_value(out, details)
+        out.write("</div></div>")
+
+    out.write("</body></html>")
+
+
+def generate_html_report(results: dict) -> str:
     """
-    Converte o HTML fornecido em um arquivo PDF.
+    Cria o conteúdo HTML do relatório a partir dos resultados da auditoria.
     """
-    result_file = open(output_filename, "w+b")
-    pisa_status = pisa.CreatePDF(
-        source_html,
-        dest=result_file
-    )
-    result_file.close()
+    out = io.StringIO()
+    write_html_report(results, out)
+    return out.getvalue()
+
+
+def convert_html_to_pdf(source_html, output_filename: str):
+    """
+    Converte o HTML fornecido (texto ou arquivo aberto) em um arquivo PDF.
+    """
+    with open(output_filename, "w+b") as result_file:
+        pisa_status = pisa.CreatePDF(
+            source_html,
+            dest=result_file
+        )
     return pisa_status.err
 
-def generate_pdf_report(results: dict, output_dir: str = 'reports'):
-    """Função principal para gerar o relatório PDF."""
-    
+
+def generate_pdf_report(results: dict, output_dir: str = 'reports', appendix_format: str = APPENDIX_FORMAT):
+    """Função principal para gerar o relatório PDF e o apêndice com todos os achados."""
+
     # 1. Certifica-se de que a pasta de relatórios exista
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
-        
-    # 2. Gera o conteúdo HTML
-    html_content = generate_html_report(results)
-    
-    # 3. Define o nome do arquivo (limpando a URL para o nome do arquivo)
+
+    # 2. Define o nome dos arquivos (limpando a URL para o nome do arquivo)
     safe_url_name = results.get('url', 'report').replace('https://', '').replace('http://', '').replace('/', '_').replace('.', '-')
-    output_filename = os.path.join(output_dir, f"relatorio_{safe_url_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
-    
-    # 4. Converte e salva o PDF
-    error = convert_html_to_pdf(html_content, output_filename)
-    
+    base_name = os.path.join(output_dir, f"relatorio_{safe_url_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    output_filename = f"{base_name}.pdf"
+    appendix_filename = f"{base_name}_achados.{appendix_format}.gz"
+
+    # 3. Grava o apêndice completo em streaming e conta os achados de cada módulo
+    counts = write_findings_appendix(results, appendix_filename, appendix_format)
+
+    # 4. Gera o HTML (tamanho limitado) e converte em PDF
+    html_buffer = io.StringIO()
+    write_html_report(results, html_buffer, counts, os.path.basename(appendix_filename))
+    html_buffer.seek(0)
+    error = convert_html_to_pdf(html_buffer, output_filename)
+
     if not error:
-        return f"Sucesso! Relatório PDF gerado em: {output_filename}"
+        return f"Sucesso! Relatório PDF gerado em: {output_filename} (achados completos em: {appendix_filename})"
     else:
-        return f"Erro ao gerar o PDF: {error}"
\ No newline at end of file
+        return f"Erro ao gerar o PDF: {error}"
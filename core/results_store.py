@@ -0,0 +1,169 @@
+# Arquivo: core/results_store.py
+import json
+import os
+import sqlite3
+import time
+
+from core.findings import iter_findings, site_key, PASSING_RESULTS
+
+DEFAULT_RESULTS_DB = os.path.join('reports', 'results.db')
+
+
+class ResultsStore:
+    """Histórico consultável das execuções: runs, resultados por módulo e achados individuais."""
+
+    def __init__(self, db_path=DEFAULT_RESULTS_DB):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self._create_tables()
+
+    def _create_tables(self):
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                site TEXT NOT NULL,
+                url TEXT NOT NULL,
+                status TEXT,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS module_results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+                site TEXT NOT NULL,
+                module TEXT NOT NULL,
+                status TEXT NOT NULL,
+                details TEXT,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS findings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+                site TEXT NOT NULL,
+                module TEXT NOT NULL,
+                status TEXT NOT NULL,
+                kind TEXT,
+                target TEXT,
+                message TEXT,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_runs_site_time ON runs (site, created_at);
+            CREATE INDEX IF NOT EXISTS idx_runs_time ON runs (created_at);
+            CREATE INDEX IF NOT EXISTS idx_module_results_site ON module_results (site, module, created_at);
+            CREATE INDEX IF NOT EXISTS idx_module_results_status ON module_results (module, status, created_at);
+            CREATE INDEX IF NOT EXISTS idx_module_results_run ON module_results (run_id);
+            CREATE INDEX IF NOT EXISTS idx_findings_site ON findings (site, module, created_at);
+            CREATE INDEX IF NOT EXISTS idx_findings_module ON findings (module, status, created_at);
+            CREATE INDEX IF NOT EXISTS idx_findings_run ON findings (run_id);
+        """)
+
+    def _insert_run(self, result):
+        url = result.get('url', '')
+        site = site_key(url)
+        created_at = result.get('timestamp') or time.time()
+
+        cursor = self.conn.execute(
+            "INSERT INTO runs (site, url, status, created_at) VALUES (?, ?, ?, ?)",
+            (site, url, result.get('status'), created_at)
+        )
+        run_id = cursor.lastrowid
+
+        module_rows = []
+        finding_rows = []
+        for validation in result.get('validations', []):
+            module = validation.get('module', 'unknown')
+            status = str(validation.get('result', 'erro')).lower()
+            module_rows.append((
+                run_id, site, module, status,
+                json.dumps(validation.get('details'), ensure_ascii=False, default=str), created_at
+            ))
+            for finding in iter_findings(validation):
+                finding_rows.append((
+                    run_id, site, module, status,
+                    finding['kind'], finding['target'], finding['message'], created_at
+                ))
+
+        self.conn.executemany(
+            "INSERT INTO module_results (run_id, site, module, status, details, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            module_rows
+        )
+        self.conn.executemany(
+            "INSERT INTO findings (run_id, site, module, status, kind, target, message, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            finding_rows
+        )
+        return run_id
+
+    def save_run(self, result):
+        """Grava uma execução do validador. Retorna o id do run."""
+        with self.conn:
+            return self._insert_run(result)
+
+    def save_runs(self, results):
+        """Grava várias execuções (modo lote) em uma única transação. Retorna os ids."""
+        with self.conn:
+            return [self._insert_run(result) for result in results]
+
+    # --- Consultas ---
+
+    def sites_with_persistent_failures(self, module, days=7):
+        """
+        Sites em que o módulo está falhando há pelo menos `days` dias (ex: breadcrumbs quebrados
+        há uma semana): nenhuma aprovação na janela e a falha já existia no início dela.
+        Retorna [(site, execuções na janela, última execução)].
+        """
+        since = time.time() - days * 86400
+        passing = ','.join('?' for _ in PASSING_RESULTS)
+        return self.conn.execute(
+            f"""
+            SELECT m.site, COUNT(*) AS runs, MAX(m.created_at) AS last_seen
+            FROM module_results m
+            WHERE m.module = ? AND m.created_at >= ?
+            GROUP BY m.site
+            HAVING SUM(CASE WHEN m.status IN ({passing}) THEN 1 ELSE 0 END) = 0
+               AND (
+                   MIN(m.created_at) <= ?
+                   OR (SELECT p.status FROM module_results p
+                       WHERE p.site = m.site AND p.module = m.module AND p.created_at < ?
+                       ORDER BY p.created_at DESC LIMIT 1) NOT IN ({passing})
+               )
+            ORDER BY m.site
+            """,
+            (module, since, *PASSING_RESULTS, since + 86400, since, *PASSING_RESULTS)
+        ).fetchall()
+
+    def module_history(self, site, module, limit=30):
+        """Status do módulo nas últimas execuções de um site, da mais recente para a mais antiga."""
+        return self.conn.execute(
+            "SELECT created_at, status FROM module_results WHERE site = ? AND module = ? "
+            "ORDER BY created_at DESC LIMIT ?",
+            (site_key(site), module, limit)
+        ).fetchall()
+
+    def findings(self, site=None, module=None, days=None, limit=1000):
+        """Achados filtrados por site, módulo e janela de tempo."""
+        clauses, params = [], []
+        if site:
+            clauses.append("site = ?")
+            params.append(site_key(site))
+        if module:
+            clauses.append("module = ?")
+            params.append(module)
+        if days:
+            clauses.append("created_at >= ?")
+            params.append(time.time() - days * 86400)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self.conn.execute(
+            f"SELECT created_at, site, module, status, kind, target, message FROM findings {where} "
+            f"ORDER BY created_at DESC LIMIT ?",
+            (*params, limit)
+        ).fetchall()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,199 @@
+# Arquivo: core/sampling.py
+"""
+Amostragem estratificada para conjuntos grandes de links e páginas.
+
+As URLs são agrupadas em estratos por host, primeiro segmento do caminho e "template"
+(forma do caminho, com segmentos numéricos trocados por {n}: /blog/{n}/{n}/{s}). A
+amostra é distribuída entre os estratos proporcionalmente ao tamanho de cada um (com
+pelo menos uma URL por estrato, enquanto houver vagas), e a taxa de falha é estimada
+com pesos por estrato e intervalo de confiança de Wilson.
+
+Para fluxos sem tamanho conhecido (sitemaps de milhões de URLs) há um reservatório por
+estrato, com memória limitada a `capacity` URLs por estrato. A leitura do sitemap para em
+SAMPLING_MAX_ENUMERATED URLs: nesse caso a população e a amostra cobrem só as URLs lidas,
+e a estimativa diz isso (truncated=True).
+
+O sorteio usa uma semente derivada do site (site_seed): duas auditorias do mesmo site, ou
+a gravação e o replay de um cassete, verificam as mesmas URLs.
+"""
+import hashlib
+import math
+import random
+import re
+from collections import Counter, namedtuple
+from urllib.parse import urlparse
+
+from core.findings import site_key
+
+# Tamanhos de amostra padrão (as auditorias de rotina terminam em tempo limitado)
+DEFAULT_LINK_SAMPLE_SIZE = 300
+DEFAULT_PAGE_SAMPLE_SIZE = 50
+
+# Nível de confiança dos intervalos (z = 1,96 -> 95%)
+CONFIDENCE_Z = 1.96
+
+# URLs do sitemap lidas para montar a amostra de páginas. O limite é só por contagem (um
+# limite de tempo tornaria a amostra diferente entre a gravação e o replay de um cassete)
+SAMPLING_MAX_ENUMERATED = 20_000
+
+_DIGIT_RE = re.compile(r'\d')
+
+# truncated: a população é só o início do sitemap (a leitura parou em SAMPLING_MAX_ENUMERATED)
+Estimate = namedtuple('Estimate', 'rate low high failures sample_size population truncated', defaults=(False,))
+
+
+def site_seed(url):
+    """Semente estável do sorteio para o site da URL."""
+    return int(hashlib.sha1(site_key(url).encode('utf-8')).hexdigest()[:16], 16)
+
+
+def stratum_of(url):
+    """Estrato da URL: (host, primeiro segmento do caminho, template do caminho)."""
+    parsed = urlparse(url)
+    segments = [s for s in parsed.path.split('/') if s]
+    prefix = segments[0] if segments else ''
+    template = '/' + '/'.join('{n}' if _DIGIT_RE.search(s) else '{s}' for s in segments[1:])
+    if parsed.query:
+        template += '?'
+    return (parsed.hostname or '').lower(), prefix, template
+
+
+def allocate(stratum_sizes, sample_size):
+    """Vagas da amostra por estrato: proporcional ao tamanho, pelo menos 1 enquanto couber."""
+    population = sum(stratum_sizes.values())
+    if population <= sample_size:
+        return dict(stratum_sizes)
+
+    # Empates desfeitos pela chave do estrato: a mesma entrada gera sempre a mesma alocação
+    ordered = sorted(stratum_sizes, key=lambda key: (-stratum_sizes[key], key))
+    allocation = {key: 0 for key in ordered}
+    remaining = sample_size
+    for key in ordered[:sample_size]:
+        allocation[key] = 1
+        remaining -= 1
+
+    # As vagas restantes seguem a proporção (maiores restos primeiro)
+    shares = {key: remaining * stratum_sizes[key] / population for key in ordered}
+    for key in ordered:
+        extra = min(int(shares[key]), stratum_sizes[key] - allocation[key])
+        allocation[key] += extra
+        remaining -= extra
+    for key in sorted(ordered, key=lambda key: (-(shares[key] - int(shares[key])), key)):
+        if remaining <= 0:
+            break
+        if allocation[key] < stratum_sizes[key]:
+            allocation[key] += 1
+            remaining -= 1
+    return allocation
+
+
+def stratified_sample(urls, sample_size, seed=None):
+    """
+    Amostra estratificada de uma lista de URLs. Retorna (amostra, tamanhos dos estratos),
+    com os tamanhos indexados por estrato para o cálculo da estimativa.
+    """
+    strata = {}
+    # Ordem fixa (as URLs costumam vir de um set): com a mesma semente, a mesma amostra
+    for url in sorted(urls):
+        strata.setdefault(stratum_of(url), []).append(url)
+    sizes = {key: len(members) for key, members in strata.items()}
+    rng = random.Random(seed)
+    sample = []
+    for key, count in sorted(allocate(sizes, sample_size).items()):
+        sample.extend(rng.sample(strata[key], count))
+    return sample, sizes
+
+
+class StratifiedReservoir:
+    """Amostra uniforme por estrato de um fluxo de URLs de tamanho desconhecido."""
+
+    def __init__(self, capacity, seed=None):
+        self.capacity = capacity
+        self.sizes = Counter()
+        self._reservoirs = {}
+        self._rng = random.Random(seed)
+
+    def add(self, url):
+        key = stratum_of(url)
+        self.sizes[key] += 1
+        reservoir = self._reservoirs.setdefault(key, [])
+        if len(reservoir) < self.capacity:
+            reservoir.append(url)
+        else:
+            # Algoritmo R: a URL substitui uma posição com probabilidade capacity/visto
+            position = self._rng.randrange(self.sizes[key])
+            if position < self.capacity:
+                reservoir[position] = url
+
+    def __len__(self):
+        return sum(self.sizes.values())
+
+    def sample(self, sample_size):
+        """Amostra final e tamanhos dos estratos (como stratified_sample)."""
+        sample = []
+        for key, count in sorted(allocate(self.sizes, sample_size).items()):
+            reservoir = self._reservoirs[key]
+            sample.extend(self._rng.sample(reservoir, min(count, len(reservoir))))
+        return sample, dict(self.sizes)
+
+
+def wilson_interval(rate, n, z=CONFIDENCE_Z):
+    """Intervalo de confiança de Wilson para uma proporção observada em n itens."""
+    if n == 0:
+        return 0.0, 1.0
+    denominator = 1 + z * z / n
+    center = (rate + z * z / (2 * n)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / n + z * z / (4 * n * n)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def estimate(failed_urls, sample, stratum_sizes, fixed=(), truncated=False):
+    """
+    Taxa de falha estimada para a população: média das taxas de cada estrato ponderada
+    pelo tamanho do estrato, com intervalo de Wilson sobre o tamanho da amostra.
+    fixed: URLs verificadas sempre, fora do sorteio (ex: páginas do menu), que entram
+    como um estrato à parte, verificado por inteiro (e não devem constar de stratum_sizes).
+    truncated: stratum_sizes cobre só as primeiras URLs de uma lista maior.
+    """
+    fixed = set(fixed)
+    sample = [url for url in sample if url not in fixed]
+    sampled_population = sum(stratum_sizes.values())
+    population = sampled_population + len(fixed)
+    sample_size = len(sample) + len(fixed)
+    if not sample_size or not population:
+        return Estimate(0.0, 0.0, 0.0, 0, 0, population, truncated)
+
+    sampled = Counter(stratum_of(url) for url in sample)
+    failed = Counter(stratum_of(url) for url in failed_urls if url not in fixed)
+    rate = sum(stratum_sizes[key] / sampled_population * failed[key] / count for key, count in sampled.items())
+    # Estratos fora da amostra (mais estratos que vagas) não entram no peso
+    covered = sum(stratum_sizes[key] for key in sampled) / sampled_population if sampled_population else 0
+    rate = rate / covered if covered else 0.0
+
+    failed_fixed = sum(1 for url in failed_urls if url in fixed)
+    rate = (rate * sampled_population + failed_fixed) / population
+    if sample_size >= population and not truncated:
+        low = high = rate
+    else:
+        low, high = wilson_interval(rate, sample_size)
+    return Estimate(rate, low, high, len(failed_urls), sample_size, population, truncated)
+
+
+def describe(estimate, noun):
+    """Texto da estimativa para o relatório."""
+    if estimate.truncated:
+        return (
+            f"{estimate.rate:.1%} (IC 95%: {estimate.low:.1%} a {estimate.high:.1%}), "
+            f"estimada por amostra estratificada de {estimate.sample_size} de {estimate.population} {noun}; "
+            f"a leitura do sitemap parou no limite de URLs, e o IC cobre só essas {estimate.population} {noun}, "
+            f"não o site inteiro"
+        )
+    if estimate.sample_size >= estimate.population:
+        return (
+            f"{estimate.rate:.1%} ({estimate.failures} de {estimate.population} {noun}; "
+            f"verificação completa, sem amostragem)"
+        )
+    return (
+        f"{estimate.rate:.1%} (IC 95%: {estimate.low:.1%} a {estimate.high:.1%}), "
+        f"estimada por amostra estratificada de {estimate.sample_size} de {estimate.population} {noun}"
+    )
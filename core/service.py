@@ -0,0 +1,185 @@
+# Arquivo: core/service.py
+import asyncio
+import json
+import time
+import uuid
+from urllib.parse import urlsplit, urlunsplit
+
+from aiohttp import web
+
+from core.http import create_session
+from core.results_store import ResultsStore, DEFAULT_RESULTS_DB
+from core.validator import WebsiteValidator
+
+# Resultados de URLs auditadas recentemente são reaproveitados por este tempo (segundos)
+RESULT_CACHE_TTL = 15 * 60
+
+# Jobs concluídos ficam disponíveis para consulta por este tempo (segundos)
+JOB_RETENTION = 60 * 60
+
+# Número máximo de validações rodando ao mesmo tempo
+MAX_CONCURRENT_VALIDATIONS = 4
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+
+
+def _cache_key(url):
+    # Esquema e host não diferenciam maiúsculas; o caminho e a query, sim (/Produto != /produto)
+    parsed = urlsplit(url.strip().rstrip('/'))
+    return urlunsplit((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path, parsed.query, parsed.fragment))
+
+
+class ValidationService:
+    """
+    Mantém aquecidos o registro de módulos, o pool HTTP e o navegador do Playwright
+    entre as requisições, e guarda os resultados recentes em cache.
+    """
+
+    def __init__(self, cache_ttl=RESULT_CACHE_TTL, results_db=DEFAULT_RESULTS_DB):
+        self.cache_ttl = cache_ttl
+        self.store = ResultsStore(results_db)
+        self.validator = WebsiteValidator()
+        self.session = None
+        self.browser = None
+        self._playwright = None
+        self._slots = asyncio.Semaphore(MAX_CONCURRENT_VALIDATIONS)
+        self.jobs = {}
+        self.cache = {}
+        self.running = {}
+
+    async def start(self, app):
+        self.session = create_session()
+        try:
+            from playwright.async_api import async_playwright
+            self._playwright = await async_playwright().start()
+            self.browser = await self._playwright.chromium.launch()
+        except Exception as e:
+            print(f"Playwright indisponível, módulos de navegador abrirão o próprio: {e}")
+
+    async def stop(self, app):
+        for job in self.jobs.values():
+            task = job.get('task')
+            if task and not task.done():
+                task.cancel()
+        if self.session is not None:
+            await self.session.close()
+        if self.browser is not None:
+            await self.browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+        self.store.close()
+
+    def _prune(self):
+        """Remove jobs antigos e entradas vencidas do cache."""
+        now = time.time()
+        for job_id in [j for j, job in self.jobs.items() if job['finished_at'] and now - job['finished_at'] > JOB_RETENTION]:
+            del self.jobs[job_id]
+        for key in [k for k, (ts, _) in self.cache.items() if now - ts > self.cache_ttl]:
+            del self.cache[key]
+
+    def _new_job(self, url, status):
+        job_id = uuid.uuid4().hex
+        self.jobs[job_id] = {
+            "id": job_id,
+            "url": url,
+            "status": status,
+            "cached": False,
+            "created_at": time.time(),
+            "finished_at": None,
+            "result": None,
+            "error": None,
+        }
+        return self.jobs[job_id]
+
+    async def _run_job(self, job):
+        key = _cache_key(job['url'])
+        try:
+            async with self._slots:
+                job['status'] = 'running'
+                result = await self.validator.validate_website(job['url'], session=self.session, browser=self.browser)
+            self.cache[key] = (time.time(), result)
+            self.store.save_run(result)
+            job['result'] = result
+            job['status'] = 'done'
+        except Exception as e:
+            job['error'] = f"{type(e).__name__}: {e}"
+            job['status'] = 'failed'
+        finally:
+            job['finished_at'] = time.time()
+            self.running.pop(key, None)
+
+    def submit(self, url, force=False):
+        """Cria um job para a URL, reaproveitando o cache ou um job já em andamento."""
+        self._prune()
+        key = _cache_key(url)
+
+        if not force and key in self.cache:
+            job = self._new_job(url, 'done')
+            job['result'] = self.cache[key][1]
+            job['cached'] = True
+            job['finished_at'] = time.time()
+            return job
+
+        if key in self.running:
+            return self.jobs[self.running[key]]
+
+        job = self._new_job(url, 'queued')
+        self.running[key] = job['id']
+        job['task'] = asyncio.create_task(self._run_job(job))
+        return job
+
+    # --- Endpoints HTTP ---
+
+    async def handle_submit(self, request):
+        try:
+            payload = await request.json()
+        except Exception:
+            payload = {}
+        url = (payload.get('url') or '').strip()
+        if not url.startswith(('http://', 'https://')):
+            return web.json_response({"error": "Informe uma URL http(s) no campo 'url'."}, status=400)
+
+        job = self.submit(url, force=bool(payload.get('force')))
+        return web.json_response(_job_status(job), status=200 if job['status'] == 'done' else 202)
+
+    async def handle_status(self, request):
+        job = self.jobs.get(request.match_info['job_id'])
+        if not job:
+            return web.json_response({"error": "Job não encontrado."}, status=404)
+        return web.json_response(_job_status(job))
+
+    async def handle_result(self, request):
+        job = self.jobs.get(request.match_info['job_id'])
+        if not job:
+            return web.json_response({"error": "Job não encontrado."}, status=404)
+        if job['status'] == 'failed':
+            return web.json_response(_job_status(job), status=500)
+        if job['status'] != 'done':
+            return web.json_response(_job_status(job), status=202)
+        return web.json_response(job['result'], dumps=_dumps)
+
+
+def _job_status(job):
+    return {key: job[key] for key in ('id', 'url', 'status', 'cached', 'created_at', 'finished_at', 'error')}
+
+
+def _dumps(data):
+    return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def create_app(service=None):
+    """Monta a aplicação aiohttp com os endpoints de envio, status e resultado."""
+    service = service or ValidationService()
+    app = web.Application()
+    app['service'] = service
+    app.on_startup.append(service.start)
+    app.on_cleanup.append(service.stop)
+    app.router.add_post('/validations', service.handle_submit)
+    app.router.add_get('/validations/{job_id}', service.handle_status)
+    app.router.add_get('/validations/{job_id}/result', service.handle_result)
+    return app
+
+
+def run_service(host=DEFAULT_HOST, port=DEFAULT_PORT, results_db=DEFAULT_RESULTS_DB):
+    web.run_app(create_app(ValidationService(results_db=results_db)), host=host, port=port)
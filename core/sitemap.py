@@ -0,0 +1,293 @@
+# Arquivo: core/sitemap.py
+import asyncio
+import time
+import weakref
+import zlib
+from collections import namedtuple
+from contextlib import aclosing
+import xml.etree.ElementTree as ET
+from urllib.parse import urljoin, urlparse
+
+import aiohttp
+
+from core.compact import BloomFilter
+from core.sampling import StratifiedReservoir, stratum_of, DEFAULT_PAGE_SAMPLE_SIZE, SAMPLING_MAX_ENUMERATED
+
+# Número máximo de páginas entregues aos módulos por execução (None = sem limite)
+SITEMAP_MAX_PAGES = 50
+
+# Tamanho da fila entre a descoberta e os módulos (mantém a memória constante)
+QUEUE_MAXSIZE = 100
+
+# Leitura incremental dos sitemaps
+CHUNK_SIZE = 64 * 1024
+SITEMAP_TIMEOUT = 30
+MAX_SITEMAP_DEPTH = 3
+
+# Número de consumidores da fila de páginas
+PAGE_WORKERS = 5
+
+# A partir deste limite de páginas (ou sem limite) a deduplicação usa um filtro de Bloom
+BLOOM_DEDUPE_MIN_PAGES = 100_000
+BLOOM_DEFAULT_CAPACITY = 1_000_000
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Por quanto tempo (segundos) a amostra do sitemap de um site fica guardada na sessão
+SAMPLE_CACHE_TTL = 10 * 60
+
+
+def _local_name(tag):
+    """Remove o namespace XML da tag ('{ns}loc' -> 'loc')."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _site_host(url):
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+async def find_sitemap_urls(session, base_url):
+    """Lê o robots.txt em busca de diretivas 'Sitemap:'; usa /sitemap.xml como padrão."""
+    sitemaps = []
+    try:
+        async with session.get(urljoin(base_url, '/robots.txt'), timeout=10) as response:
+            if response.status == 200:
+                robots_txt = await response.text()
+                for line in robots_txt.splitlines():
+                    key, _, value = line.partition(':')
+                    if key.strip().lower() == 'sitemap' and value.strip():
+                        sitemaps.append(urljoin(base_url, value.strip()))
+    except (asyncio.TimeoutError, aiohttp.ClientError, UnicodeDecodeError):
+        pass
+
+    if not sitemaps:
+        sitemaps.append(urljoin(base_url, '/sitemap.xml'))
+    return list(dict.fromkeys(sitemaps))
+
+
+async def _iter_xml_chunks(session, sitemap_url):
+    """Lê o sitemap em blocos, descompactando gzip de forma incremental quando necessário."""
+    async with session.get(sitemap_url, timeout=SITEMAP_TIMEOUT) as response:
+        if response.status != 200:
+            return
+
+        decompressor = None
+        first_chunk = True
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            if first_chunk:
+                first_chunk = False
+                if chunk.startswith(GZIP_MAGIC):
+                    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            if decompressor:
+                chunk = decompressor.decompress(chunk)
+            if chunk:
+                yield chunk
+
+        if decompressor:
+            tail = decompressor.flush()
+            if tail:
+                yield tail
+
+
+async def iter_sitemap_locs(session, sitemap_url, depth=0):
+    """
+    Gera as URLs de página de um sitemap (ou índice de sitemaps) sem carregar o arquivo inteiro.
+    Cada entrada é removida da árvore assim que lida, então a memória não cresce com o arquivo.
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    root = None
+    is_index = False
+    child_sitemaps = []
+
+    try:
+        async with aclosing(_iter_xml_chunks(session, sitemap_url)) as chunks:
+            async for chunk in chunks:
+                parser.feed(chunk)
+                for event, elem in parser.read_events():
+                    name = _local_name(elem.tag)
+                    if event == 'start':
+                        if root is None:
+                            root = elem
+                            is_index = name == 'sitemapindex'
+                        continue
+
+                    if name == 'loc' and elem.text:
+                        loc = elem.text.strip()
+                        if is_index:
+                            child_sitemaps.append(loc)
+                        else:
+                            yield loc
+                    elif name in ('url', 'sitemap') and root is not None:
+                        root.remove(elem)
+    except (ET.ParseError, zlib.error, asyncio.TimeoutError, aiohttp.ClientError):
+        pass
+
+    if depth < MAX_SITEMAP_DEPTH:
+        for child_url in child_sitemaps:
+            async with aclosing(iter_sitemap_locs(session, child_url, depth + 1)) as child_locs:
+                async for loc in child_locs:
+                    yield loc
+
+
+def _visited_set(max_pages):
+    """
+    Conjunto de páginas já enfileiradas. Rastreamentos grandes (ou sem limite) usam um filtro
+    de Bloom: memória fixa, ao custo de pular raras páginas por falso positivo.
+    """
+    if max_pages is not None and max_pages < BLOOM_DEDUPE_MIN_PAGES:
+        return set()
+    return BloomFilter(max_pages or BLOOM_DEFAULT_CAPACITY)
+
+
+async def feed_pages(session, base_url, queue, seed_urls=(), max_pages=SITEMAP_MAX_PAGES):
+    """
+    Coloca na fila as páginas sementes (ex: links do menu) seguidas das páginas do sitemap,
+    sem duplicatas e apenas do mesmo site. Bloqueia enquanto a fila estiver cheia.
+    """
+    seen = _visited_set(max_pages)
+    site_host = _site_host(base_url)
+
+    async def _offer(page_url):
+        page_url = urlparse(page_url)._replace(fragment='').geturl()
+        if page_url in seen or _site_host(page_url) != site_host:
+            return True
+        seen.add(page_url)
+        await queue.put(page_url)
+        return max_pages is None or len(seen) < max_pages
+
+    for page_url in seed_urls:
+        if not await _offer(page_url):
+            return len(seen)
+
+    for sitemap_url in await find_sitemap_urls(session, base_url):
+        async with aclosing(iter_sitemap_locs(session, sitemap_url)) as sitemap_locs:
+            async for page_url in sitemap_locs:
+                if not await _offer(page_url):
+                    return len(seen)
+
+    return len(seen)
+
+
+async def run_page_checks(session, base_url, check_page, seed_urls=(), max_pages=SITEMAP_MAX_PAGES, workers=PAGE_WORKERS):
+    """
+    Descobre as páginas do site (menu + sitemap) e executa check_page em cada uma,
+    consumindo uma fila limitada. Retorna a lista de resultados de check_page.
+    """
+    queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+    results = []
+
+    async def _consumer():
+        while True:
+            page_url = await queue.get()
+            if page_url is None:
+                break
+            results.append(await check_page(page_url))
+
+    consumers = [asyncio.create_task(_consumer()) for _ in range(workers)]
+    try:
+        await feed_pages(session, base_url, queue, seed_urls, max_pages)
+    finally:
+        for _ in consumers:
+            await queue.put(None)
+        await asyncio.gather(*consumers)
+
+    return results
+
+
+# Amostra do sitemap: URLs sorteadas, tamanhos dos estratos, URLs lidas (filtro de Bloom,
+# para saber se uma página do menu também está no sitemap) e se a leitura parou no limite
+SitemapSample = namedtuple('SitemapSample', 'urls stratum_sizes enumerated truncated')
+
+
+class _ReservoirSink:
+    """
+    Recebe as páginas de feed_pages (no lugar da fila) e as guarda no reservatório, até
+    `limit` URLs; uma URL além do limite só marca a leitura como truncada.
+    """
+
+    def __init__(self, reservoir, limit):
+        self.reservoir = reservoir
+        self.limit = limit
+        self.enumerated = BloomFilter(limit)
+        self.truncated = False
+
+    async def put(self, page_url):
+        if len(self.reservoir) >= self.limit:
+            self.truncated = True
+            return
+        self.reservoir.add(page_url)
+        self.enumerated.add(page_url)
+
+
+# Sessão -> {(site, tamanho da amostra, semente, limite de URLs): (expira_em, future da amostra)}
+_SAMPLES = weakref.WeakKeyDictionary()
+
+
+async def _draw_sitemap_sample(session, base_url, sample_size, seed, max_enumerated):
+    reservoir = StratifiedReservoir(sample_size, seed)
+    sink = _ReservoirSink(reservoir, max_enumerated)
+    # Uma URL a mais que o limite: é ela que revela se o sitemap continuava
+    await feed_pages(session, base_url, sink, (), max_enumerated + 1)
+    urls, stratum_sizes = reservoir.sample(sample_size)
+    return SitemapSample(urls, stratum_sizes, sink.enumerated, sink.truncated)
+
+
+async def sample_sitemap_pages(session, base_url, sample_size=DEFAULT_PAGE_SAMPLE_SIZE, seed=None,
+                               max_enumerated=SAMPLING_MAX_ENUMERATED):
+    """
+    Amostra estratificada das páginas do sitemap (SitemapSample). A leitura para em
+    max_enumerated URLs (só por contagem, nunca por tempo: a mesma semente sorteia as mesmas
+    URLs na gravação e no replay), e o resultado fica guardado na sessão: os módulos de uma
+    execução que pedem a mesma amostra compartilham uma única leitura.
+    """
+    cache = _SAMPLES.get(session)
+    if cache is None:
+        cache = _SAMPLES[session] = {}
+    key = (_site_host(base_url), sample_size, seed, max_enumerated)
+    entry = cache.get(key)
+    if entry is None or time.time() >= entry[0]:
+        future = asyncio.ensure_future(_draw_sitemap_sample(session, base_url, sample_size, seed, max_enumerated))
+        entry = cache[key] = (time.time() + SAMPLE_CACHE_TTL, future)
+    try:
+        return await asyncio.shield(entry[1])
+    except BaseException:
+        if cache.get(key) is entry:
+            del cache[key]
+        raise
+
+
+async def run_sampled_page_checks(session, base_url, check_page, seed_urls=(), sample_size=DEFAULT_PAGE_SAMPLE_SIZE,
+                                  workers=PAGE_WORKERS, seed=None):
+    """
+    Modo amostragem de run_page_checks: executa check_page nas páginas sementes (menu), que
+    são sempre verificadas, e em uma amostra estratificada de sample_size páginas do sitemap
+    (sample_sitemap_pages, compartilhada entre os módulos da execução).
+    Retorna (resultados, amostra do sitemap, tamanhos dos estratos, páginas sementes, leitura
+    truncada) para core.sampling.estimate(..., fixed=páginas sementes, truncated=...). As
+    páginas sementes que também estão no sitemap saem dos tamanhos dos estratos, para não
+    serem contadas duas vezes na população.
+    """
+    site_host = _site_host(base_url)
+    menu_pages = list(dict.fromkeys(
+        urlparse(page_url)._replace(fragment='').geturl()
+        for page_url in seed_urls if _site_host(page_url) == site_host
+    ))
+    sitemap_sample = await sample_sitemap_pages(session, base_url, sample_size, seed)
+    sample = sitemap_sample.urls
+    stratum_sizes = dict(sitemap_sample.stratum_sizes)
+    for page_url in menu_pages:
+        key = stratum_of(page_url)
+        if page_url in sitemap_sample.enumerated and stratum_sizes.get(key):
+            stratum_sizes[key] -= 1
+    in_menu = set(menu_pages)
+    pages = menu_pages + [page_url for page_url in sample if page_url not in in_menu]
+
+    slots = asyncio.Semaphore(workers)
+
+    async def _checked(page_url):
+        async with slots:
+            return await check_page(page_url)
+
+    results = await asyncio.gather(*(_checked(page_url) for page_url in pages))
+    return list(results), sample, stratum_sizes, menu_pages, sitemap_sample.truncated
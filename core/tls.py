@@ -0,0 +1,177 @@
+# Arquivo: core/tls.py
+"""
+Dados de certificado TLS por host e porta.
+
+Os dados são capturados das conexões que a sessão HTTP compartilhada já abriu (via
+response_class da sessão) e guardados em cache até o fim da validade do certificado, limitado a
+TLS_CACHE_MAX_AGE. Um handshake próprio só é feito quando nenhuma conexão serviu o host
+(e nunca no replay de um cassete, que serve só os certificados gravados).
+"""
+import asyncio
+import ssl
+import time
+from datetime import datetime, timezone
+
+import aiohttp
+
+# Tempo máximo que um certificado fica em cache (renovações antecipadas são comuns)
+TLS_CACHE_MAX_AGE = 6 * 60 * 60
+
+HANDSHAKE_TIMEOUT = 10
+
+# Tempo que uma falha de handshake fica em cache (evita repetir hosts quebrados num lote)
+TLS_FAILURE_CACHE_AGE = 15 * 60
+
+# (host, porta) -> (expira_em, info)
+_CACHE = {}
+
+# (host, porta) -> (expira_em, exceção) e handshakes em andamento
+_FAILURES = {}
+_IN_FLIGHT = {}
+
+
+def _name_field(name, field):
+    """Extrai um campo (ex: commonName) da estrutura de nome do getpeercert()."""
+    for rdn in name or ():
+        for key, value in rdn:
+            if key == field:
+                return value
+    return None
+
+
+def certificate_info(ssl_object):
+    """Resume o certificado e a sessão TLS de um ssl.SSLObject/SSLSocket já conectado."""
+    cert = ssl_object.getpeercert()
+    if not cert:
+        # Conexões sem verificação (ssl=False) não expõem o certificado decodificado
+        return None
+
+    not_after = datetime.fromtimestamp(ssl.cert_time_to_seconds(cert['notAfter']), tz=timezone.utc)
+    not_before = datetime.fromtimestamp(ssl.cert_time_to_seconds(cert['notBefore']), tz=timezone.utc)
+    issuer = _name_field(cert.get('issuer'), 'organizationName') or _name_field(cert.get('issuer'), 'commonName')
+    cipher = ssl_object.cipher() or (None, None, None)
+
+    return {
+        "subject": _name_field(cert.get('subject'), 'commonName'),
+        "issuer": issuer,
+        "not_before": not_before.isoformat(),
+        "not_after": not_after.isoformat(),
+        "sans": [value for kind, value in cert.get('subjectAltName', ()) if kind == 'DNS'],
+        "protocol": ssl_object.version(),
+        "cipher": cipher[0],
+        "cipher_bits": cipher[2],
+    }
+
+
+def days_remaining(info, now=None):
+    not_after = datetime.fromisoformat(info['not_after'])
+    now = now or datetime.now(timezone.utc)
+    return (not_after - now).total_seconds() / 86400
+
+
+def remember(host, port, info):
+    """Guarda os dados do certificado até o fim da validade (limitado a TLS_CACHE_MAX_AGE)."""
+    if not info or not host:
+        return
+    valid_until = datetime.fromisoformat(info['not_after']).timestamp()
+    _CACHE[(host.lower(), port)] = (min(valid_until, time.time() + TLS_CACHE_MAX_AGE), info)
+
+
+def get_cached(host, port):
+    entry = _CACHE.get((host.lower(), port))
+    if entry is None:
+        return None
+    expires_at, info = entry
+    if time.time() >= expires_at:
+        del _CACHE[(host.lower(), port)]
+        return None
+    return info
+
+
+def info_from_response(response):
+    """Dados do certificado capturados pela resposta (None fora de HTTPS ou sem verificação)."""
+    return getattr(response, 'tls_info', None)
+
+
+class CertificateCapturingResponse(aiohttp.ClientResponse):
+    """
+    Resposta que lê o certificado da conexão assim que ela é associada à resposta. Respostas
+    pequenas liberam a conexão junto com os cabeçalhos, então os traces chegam tarde demais.
+    """
+
+    tls_info = None
+
+    async def start(self, connection):
+        transport = connection.transport
+        if self.url.scheme == 'https' and transport is not None:
+            ssl_object = transport.get_extra_info('ssl_object')
+            if ssl_object is not None:
+                self.tls_info = get_cached(self.url.host, self.url.port) or certificate_info(ssl_object)
+                remember(self.url.host, self.url.port, self.tls_info)
+        return await super().start(connection)
+
+
+async def handshake(host, port, timeout=HANDSHAKE_TIMEOUT):
+    """Handshake TLS próprio (sem requisição HTTP), usado quando não há conexão reaproveitável."""
+    context = ssl.create_default_context()
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(host, port, ssl=context, server_hostname=host), timeout
+    )
+    try:
+        info = certificate_info(writer.get_extra_info('ssl_object'))
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (ssl.SSLError, ConnectionError):
+            pass
+    remember(host, port, info)
+    return info
+
+
+async def _handshake_or_failure(host, port, timeout):
+    try:
+        return await handshake(host, port, timeout), None
+    except (ssl.SSLError, OSError, asyncio.TimeoutError) as e:
+        _FAILURES[(host.lower(), port)] = (time.time() + TLS_FAILURE_CACHE_AGE, e)
+        return None, e
+
+
+async def check_host(host, port=443, timeout=HANDSHAKE_TIMEOUT, session=None):
+    """
+    Dados do certificado de um host, com cache de sucessos e de falhas. Chamadas simultâneas
+    para o mesmo host (várias páginas, ou vários sites de um lote) compartilham um único
+    handshake. Retorna (info, erro): erro é um ssl.SSLError, OSError ou TimeoutError.
+    session: com uma sessão de gravação o resultado vai para o cassete; com uma de replay,
+    só os certificados gravados são usados (nenhum handshake ao vivo).
+    """
+    recorded = getattr(session, 'recorded_certificate', None)
+    if recorded is not None:
+        return recorded(host, port)
+
+    result = await _check_host(host, port, timeout)
+    record = getattr(session, 'record_certificate', None)
+    if record is not None:
+        record(host, port, *result)
+    return result
+
+
+async def _check_host(host, port, timeout):
+    key = (host.lower(), port)
+    info = get_cached(host, port)
+    if info is not None:
+        return info, None
+
+    failure = _FAILURES.get(key)
+    if failure is not None:
+        if time.time() < failure[0]:
+            return None, failure[1]
+        del _FAILURES[key]
+
+    pending = _IN_FLIGHT.get(key)
+    if pending is None or pending.get_loop() is not asyncio.get_running_loop():
+        pending = asyncio.ensure_future(_handshake_or_failure(host, port, timeout))
+        _IN_FLIGHT[key] = pending
+        pending.add_done_callback(lambda _: _IN_FLIGHT.pop(key, None))
+    # O shield evita que o cancelamento de um chamador cancele o handshake dos outros
+    return await asyncio.shield(pending)
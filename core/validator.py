@@ -1,6 +1,42 @@
 import asyncio
 import importlib
 import os
+import sys
+import time
+from core import dns, probe
+from core.http import create_session
+from core.http2 import Http2Session
+from core.profiling import ModuleProfiler
+from core.render import PageRenderer
+
+# Camadas de execução. Cada arquivo de módulo pode declarar TIER (padrão: TIER_STATIC);
+# as camadas rodam em ordem e, dentro de cada uma, os módulos rodam em paralelo.
+TIER_REACHABILITY = 0   # acesso à home (barato, decide se vale continuar)
+TIER_STATIC = 1         # análise do HTML e sondagens de links
+TIER_EXPENSIVE = 2      # APIs externas e renderização no navegador
+
+# Resultado dos módulos não executados porque um módulo de bloqueio (GATING = True) falhou
+SKIPPED_RESULT = "ignorado"
+
+
+def _module_attr(func, name, default):
+    return getattr(sys.modules.get(func.__module__), name, default)
+
+
+def _module_name(func):
+    return func.__module__.rsplit('.', 1)[-1]
+
+
+def _gate_failure(func, result):
+    """Motivo para pular as camadas seguintes, ou None se o módulo não bloqueia ou passou."""
+    if not _module_attr(func, 'GATING', False):
+        return None
+    if isinstance(result, Exception):
+        return f"{_module_name(func)} falhou ({type(result).__name__})"
+    if result.get('result') not in ('aprovado', 'atencao'):
+        return f"{result.get('module', _module_name(func))} {result.get('result')}: {result.get('details')}"
+    return None
+
 
 class WebsiteValidator:
     def __init__(self):
@@ -38,31 +74,50 @@ class WebsiteValidator:
     async def validate_website(self, url, **kwargs):
         """
         Executa todas as validações carregadas para uma URL, passando argumentos extras.
+        record/replay: caminho de um cassete para gravar ou reproduzir todo o tráfego HTTP.
+        http2: usa o transporte HTTP/2 opcional na sessão criada para esta execução.
+        profile_dir: se informado, perfila cada módulo (CPU, memória e atraso do loop) nessa pasta.
+        rendered_dom: os módulos estáticos leem o DOM renderizado no navegador (sites em JS).
+        browser: navegador já aberto (ex: o do serviço) usado na renderização compartilhada.
         """
         if not self.modules:
             return {"url": url, "validations": [], "status": "no_modules_loaded"}
 
-        tasks = []
-        for module in self.modules:
-            # Obtém os nomes dos parâmetros que a função de validação espera
-            params = module.__code__.co_varnames[:module.__code__.co_argcount]
-
-            # Constrói o dicionário de argumentos para cada módulo
-            module_args = {}
-            if 'url' in params:
-                module_args['url'] = url
-            if 'workspace_name' in params and 'workspace_name' in kwargs:
-                module_args['workspace_name'] = kwargs['workspace_name']
-            if 'repo_slug' in params and 'repo_slug' in kwargs:
-                module_args['repo_slug'] = kwargs['repo_slug']
+        # Todos os módulos compartilham o mesmo pool de conexões; o serviço pode fornecer o seu
+        started_at = time.time()
+        own_session = None
+        record, replay = kwargs.pop('record', None), kwargs.pop('replay', None)
+        http2 = kwargs.pop('http2', False)
+        profile_dir = kwargs.pop('profile_dir', None)
+        rendered_dom = kwargs.pop('rendered_dom', False)
+        profile_summary = None
+        if kwargs.get('session') is None:
+            own_session = create_session(record=record, replay=replay, http2=http2)
+            kwargs['session'] = own_session
 
-            # Se o módulo espera uma URL mas nenhuma foi fornecida, pula-o
-            if 'url' in params and not url:
-                continue
-                
-            tasks.append(module(**module_args))
+        # Uma renderização por execução, compartilhada pelos módulos que usam o navegador.
+        # No replay não há rede ao vivo: o renderer desativado impede que os módulos abram
+        # um navegador próprio, e eles voltam às requisições da sessão.
+        own_renderer = None
+        if kwargs.get('renderer') is None:
+            own_renderer = PageRenderer(kwargs.get('browser'), dom_mode=rendered_dom, enabled=not replay)
+            kwargs['renderer'] = own_renderer
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        session = kwargs['session']
+        resolver = dns.resolver_for(session)
+        try:
+            calls = self._module_calls(url, kwargs)
+            if profile_dir:
+                results, profile_summary = await self._run_profiled(calls, profile_dir)
+            else:
+                results = await self._run_tiers(
+                    calls, lambda tier_calls: asyncio.gather(*(module(**args) for module, args in tier_calls), return_exceptions=True)
+                )
+        finally:
+            if own_renderer is not None:
+                await own_renderer.close()
+            if own_session is not None:
+                await own_session.close()
 
         validation_results = []
         for result in results:
@@ -75,8 +130,91 @@ class WebsiteValidator:
             else:
                 validation_results.append(result)
 
-        return {
+        report = {
             "url": url,
             "validations": validation_results,
-            "status": "completed"
-        }
\ No newline at end of file
+            "status": "completed",
+            "timestamp": started_at
+        }
+        metrics = {}
+        if resolver is not None:
+            # Em uma sessão do serviço os números são acumulados desde o início do processo
+            metrics["dns"] = resolver.stats()
+        # Sondagens de links/imagens (HEAD x GET parcial) feitas pela sessão; no serviço, desde o início dela
+        metrics["probes"] = probe.stats(session)
+        if isinstance(session, Http2Session):
+            metrics["http_versions"] = session.stats()
+        if metrics:
+            report["metrics"] = metrics
+        if profile_summary:
+            report["profile"] = profile_summary
+        return report
+
+    def _module_calls(self, url, kwargs):
+        """Monta a lista de (função, argumentos) de cada módulo, com os argumentos que ele declara."""
+        calls = []
+        for module in self.modules:
+            # Obtém os nomes dos parâmetros que a função de validação espera
+            params = module.__code__.co_varnames[:module.__code__.co_argcount]
+
+            # Constrói o dicionário de argumentos para cada módulo
+            module_args = {}
+            if 'url' in params:
+                module_args['url'] = url
+            # Repassa os argumentos extras (ex: max_pages) apenas aos módulos que os aceitam
+            for param in params:
+                if param != 'url' and param in kwargs:
+                    module_args[param] = kwargs[param]
+
+            # Se o módulo espera uma URL mas nenhuma foi fornecida, pula-o
+            if 'url' in params and not url:
+                continue
+                
+            calls.append((module, module_args))
+
+        return calls
+
+    async def _run_tiers(self, calls, run_tier):
+        """
+        Executa os módulos camada a camada (TIER). Se um módulo de bloqueio (GATING) da
+        camada falhar, ex: home fora do ar ou domínio estacionado, as camadas seguintes não
+        rodam e seus módulos são reportados como ignorados, com o motivo.
+        """
+        results = []
+        skip_reason = None
+        tiers = sorted({_module_attr(module, 'TIER', TIER_STATIC) for module, _ in calls})
+        for tier in tiers:
+            tier_calls = [(module, args) for module, args in calls if _module_attr(module, 'TIER', TIER_STATIC) == tier]
+            if skip_reason:
+                results.extend({
+                    "module": _module_name(module),
+                    "result": SKIPPED_RESULT,
+                    "details": f"Não executado: {skip_reason}"
+                } for module, _ in tier_calls)
+                continue
+
+            tier_results = await run_tier(tier_calls)
+            results.extend(tier_results)
+            for (module, _), result in zip(tier_calls, tier_results):
+                skip_reason = skip_reason or _gate_failure(module, result)
+        return results
+
+    async def _run_profiled(self, calls, profile_dir):
+        """Executa os módulos um a um sob o perfilador. Retorna (resultados, caminho do resumo)."""
+        profiler = ModuleProfiler(profile_dir)
+        profiler.start()
+
+        async def run_tier(tier_calls):
+            tier_results = []
+            for module, module_args in tier_calls:
+                try:
+                    tier_results.append(await profiler.run(_module_name(module), module(**module_args)))
+                except Exception as e:
+                    tier_results.append(e)
+            return tier_results
+
+        try:
+            results = await self._run_tiers(calls, run_tier)
+        finally:
+            await profiler.stop()
+        return results, profiler.write_summary()
@@ -0,0 +1,107 @@
+# Arquivo: core/worker.py
+import asyncio
+import multiprocessing
+import os
+import time
+
+from core import parsing
+from core.job_queue import JobQueue, LEASE_SECONDS
+from core.results_store import ResultsStore, DEFAULT_RESULTS_DB
+
+# Intervalo de espera quando a fila está vazia mas outros workers ainda têm jobs em andamento
+POLL_INTERVAL = 5
+
+# Intervalo de checagem do supervisor
+SUPERVISOR_INTERVAL = 2
+
+
+async def _renew_lease(queue, job_id, worker_id):
+    """Renova a posse do job periodicamente enquanto a validação roda."""
+    while True:
+        await asyncio.sleep(LEASE_SECONDS / 3)
+        queue.renew(job_id, worker_id)
+
+
+async def _worker_loop(db_path, worker_id, generate_pdf, results_db, validate_kwargs):
+    # Import local: cada processo carrega seus próprios módulos de validação
+    from core.validator import WebsiteValidator
+    from core.report_generator import generate_pdf_report
+
+    queue = JobQueue(db_path)
+    store = ResultsStore(results_db)
+    validator = WebsiteValidator()
+
+    try:
+        while True:
+            job = queue.claim(worker_id)
+            if job is None:
+                if not queue.has_work():
+                    break
+                # Jobs ainda em execução em outros workers podem voltar se a posse expirar
+                await asyncio.sleep(POLL_INTERVAL)
+                continue
+
+            job_id, url = job
+            print(f"[{worker_id}] Validando {url} (job {job_id})")
+            heartbeat = asyncio.create_task(_renew_lease(queue, job_id, worker_id))
+            try:
+                result = await validator.validate_website(url, **validate_kwargs)
+                if generate_pdf:
+                    print(f"[{worker_id}] {generate_pdf_report(result)}")
+            except Exception as e:
+                queue.fail(job_id, worker_id, f"{type(e).__name__}: {e}")
+                continue
+            finally:
+                heartbeat.cancel()
+
+            # Grava no histórico antes de concluir o job: se o processo morrer entre os dois
+            # passos, a posse expira e o job volta à fila em vez de sumir do histórico
+            store.save_run(result)
+            queue.complete(job_id, worker_id, result)
+    finally:
+        store.close()
+        queue.close()
+
+
+def _worker_main(db_path, worker_id, generate_pdf, results_db, validate_kwargs):
+    """Ponto de entrada de cada processo: um event loop e um WebsiteValidator próprios."""
+    # Os processos da fila já ocupam os núcleos: um processo de parse por worker basta
+    # para tirar o BeautifulSoup do event loop
+    parsing.configure(max_workers=1)
+    asyncio.run(_worker_loop(db_path, worker_id, generate_pdf, results_db, validate_kwargs))
+
+
+def run_workers(db_path, num_workers=None, generate_pdf=False, results_db=DEFAULT_RESULTS_DB, **validate_kwargs):
+    """
+    Inicia N processos que consomem a fila SQLite até ela esvaziar.
+    Processos que morrem com erro são substituídos enquanto ainda houver trabalho.
+    Cada resultado é gravado no histórico (results_db) antes de o job ser concluído.
+    """
+    num_workers = num_workers or os.cpu_count() or 1
+    queue = JobQueue(db_path)
+
+    def _start(index):
+        worker_id = f"worker-{index}-{os.getpid()}-{int(time.time())}"
+        process = multiprocessing.Process(
+            target=_worker_main,
+            args=(db_path, worker_id, generate_pdf, results_db, validate_kwargs),
+            name=worker_id
+        )
+        process.start()
+        return process
+
+    processes = [_start(i) for i in range(num_workers)]
+    try:
+        while any(p.is_alive() for p in processes):
+            time.sleep(SUPERVISOR_INTERVAL)
+            for i, process in enumerate(processes):
+                if not process.is_alive() and process.exitcode not in (0, None) and queue.has_work():
+                    print(f"Worker {process.name} encerrou com código {process.exitcode}. Reiniciando...")
+                    processes[i] = _start(i)
+    finally:
+        for process in processes:
+            process.join()
+        counts = queue.counts()
+        queue.close()
+
+    return counts
@@ -1,9 +1,16 @@
 # SEU ARQUIVO main.py (VERSÃO SIMPLIFICADA PARA VALIDAÇÕES ONLINE)
 
+import argparse
 import asyncio
 from urllib.parse import urlparse
 from core.validator import WebsiteValidator
 from core.report_generator import generate_pdf_report 
+from core.job_queue import JobQueue, DEFAULT_QUEUE_DB
+from core.worker import run_workers
+from core.results_store import ResultsStore, DEFAULT_RESULTS_DB
+from core.profiling import profile_call
+from core.service import run_service, DEFAULT_HOST, DEFAULT_PORT
+from modules.web_vitals import THROTTLING_PROFILES
 # O import de core.clone_repository foi removido!
 
 # --- VARIÁVEIS FIXAS (Removidas: BITBUCKET_WORKSPACE, CLONE_DIR, BITBUCKET_API_TOKEN) ---
@@ -16,9 +23,11 @@ def get_repo_name_from_url(url: str) -> str:
         repo_name = repo_name[4:]
     return repo_name
 
-async def run_validation():
+async def run_validation(results_db=DEFAULT_RESULTS_DB, url=None, record=None, replay=None, profile_dir=None, http2=False, rendered_dom=False, throttling=None,
+                         full_run=False):
     print("--- Validador de Site Assíncrono ---")
-    url = input("Por favor, digite a URL do site (ex: https://www.google.com): ")
+    if not url:
+        url = input("Por favor, digite a URL do site (ex: https://www.google.com): ")
     
     if not url:
         print("Nenhuma URL fornecida. Saindo...")
@@ -29,8 +38,11 @@ async def run_validation():
 
     print(f"\nValidando site: {url}...")
     
-    # Chamada do validador simplificada, sem argumentos extras!
-    result = await validator.validate_website(url) 
+    # Chamada do validador (com gravação/reprodução opcional do tráfego HTTP)
+    result = await validator.validate_website(
+        url, record=record, replay=replay, profile_dir=profile_dir, http2=http2,
+        rendered_dom=rendered_dom, throttling=throttling, full_run=full_run
+    )
 
     # 2. Imprime os resultados no Console
     print(f"\n--- Resultados da Validação para: {result['url']} ---")
@@ -43,16 +55,79 @@ async def run_validation():
         print(f"  Status: {validation.get('result', 'N/A')}")
         print(f"  Detalhes: {validation.get('details', 'Sem detalhes')}")
     
-    # 3. GERA O RELATÓRIO PDF
+    # 3. Guarda a execução no histórico consultável
+    store = ResultsStore(results_db)
+    store.save_run(result)
+    store.close()
+
+    # 4. GERA O RELATÓRIO PDF
     print("\n" + "="*40)
     print("  INICIANDO GERAÇÃO DO RELATÓRIO PDF")
     print("="*40)
-    pdf_status = generate_pdf_report(result)
+    if profile_dir:
+        pdf_status = profile_call(profile_dir, "report_generator", generate_pdf_report, result)
+        print(f"Perfilamento gravado em: {result.get('profile')}")
+    else:
+        pdf_status = generate_pdf_report(result)
     print(pdf_status)
 
 
+def _read_urls(path):
+    """Lê um arquivo com uma URL por linha (linhas vazias e comentários '#' são ignorados)."""
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Validador de Site Assíncrono")
+    parser.add_argument("--url", help="URL a validar (sem a pergunta interativa).")
+    parser.add_argument("--record", metavar="CASSETE", help="Grava todo o tráfego HTTP da auditoria em um cassete (.jsonl.gz).")
+    parser.add_argument("--replay", metavar="CASSETE", help="Reproduz a auditoria a partir de um cassete, sem rede.")
+    parser.add_argument("--http2", action="store_true", help="Usa o transporte HTTP/2 (requer httpx[http2]); volta ao HTTP/1.1 se indisponível.")
+    parser.add_argument("--rendered-dom", action="store_true", help="Renderiza a página no navegador uma vez e usa o DOM final nos módulos estáticos (sites em JS).")
+    parser.add_argument("--throttling", choices=sorted(THROTTLING_PROFILES), help="Mede a velocidade (web_vitals) sob throttling de CPU e rede que emula um celular.")
+    parser.add_argument("--full-run", action="store_true", help="Verifica todos os links e páginas (sem amostragem) em broken_links, url_h1_coherence e breadcrumbs.")
+    parser.add_argument("--profile", metavar="PASTA", help="Perfila cada módulo (cProfile, tracemalloc, atraso do loop) e grava na pasta.")
+    parser.add_argument("--enqueue", metavar="ARQUIVO", help="Adiciona à fila as URLs do arquivo (uma por linha).")
+    parser.add_argument("--workers", type=int, metavar="N", help="Processa a fila com N processos (0 = um por núcleo).")
+    parser.add_argument("--queue-db", default=DEFAULT_QUEUE_DB, help="Arquivo SQLite da fila de jobs.")
+    parser.add_argument("--results-db", default=DEFAULT_RESULTS_DB, help="Arquivo SQLite do histórico de resultados.")
+    parser.add_argument("--pdf", action="store_true", help="Gera o relatório PDF de cada site no modo worker.")
+    parser.add_argument("--serve", action="store_true", help="Inicia o serviço HTTP de validações (processo de longa duração).")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Endereço do serviço HTTP.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Porta do serviço HTTP.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # Modo serviço: módulos, pool HTTP e navegador ficam aquecidos entre as requisições
+    if args.serve:
+        run_service(args.host, args.port, results_db=args.results_db)
+        return
+
+    # Modo worker: fila SQLite local consumida por vários processos
+    if args.enqueue or args.workers is not None:
+        if args.enqueue:
+            queue = JobQueue(args.queue_db)
+            added = queue.enqueue(_read_urls(args.enqueue))
+            queue.close()
+            print(f"{added} site(s) adicionados à fila {args.queue_db}.")
+        if args.workers is not None:
+            counts = run_workers(
+                args.queue_db, args.workers or None, generate_pdf=args.pdf, results_db=args.results_db, http2=args.http2,
+                rendered_dom=args.rendered_dom, throttling=args.throttling, full_run=args.full_run
+            )
+            print(f"Fila processada: {counts}")
+        return
+
+    asyncio.run(run_validation(args.results_db, url=args.url, record=args.record, replay=args.replay, profile_dir=args.profile, http2=args.http2, rendered_dom=args.rendered_dom, throttling=args.throttling,
+                               full_run=args.full_run))
+
+
 if __name__ == "__main__":
     try:
-        asyncio.run(run_validation())
+        main()
     except Exception as e:
         print(f"\nOcorreu um erro fatal: {e}")
\ No newline at end of file
@@ -2,6 +2,9 @@ import aiohttp
 import asyncio
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
+from core.http import open_session
+from core.parsing import run_parser
+from core.render import fetch_html
 
 # Limite de concorrência global
 CONCURRENCY_LIMIT = 5
@@ -27,24 +30,36 @@ BANNER_SELECTORS = [
     '.header-banner-container'
 ]
 
-async def validate_banner_links(url: str):
+def _extract_banner_hrefs(html):
+    """
+    Parse da página (roda no pool de processos): hrefs dos links do contêiner do banner,
+    ou None se nenhum dos BANNER_SELECTORS for encontrado.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    for selector in BANNER_SELECTORS:
+        banner_container = soup.select_one(selector)
+        if banner_container:
+            return [a_tag['href'] for a_tag in banner_container.find_all('a', href=True)]
+    return None
+
+async def validate_banner_links(url: str, session=None, renderer=None):
     
     base_url = url.strip('/')
     
     try:
-        async with aiohttp.ClientSession() as session:
+        async with open_session(session) as session:
             
             page_html = None
             async with SEMAPHORE:
                 try:
-                    async with session.get(base_url, timeout=20) as response:
-                        if response.status != 200:
-                             return {
-                                "module": "banner_link_checker",
-                                "result": "erro",
-                                "details": f"Erro ao acessar a URL: HTTP {response.status}"
-                            }
-                        page_html = await response.text()
+                    # HTML do servidor ou, no modo DOM renderizado, o da renderização compartilhada
+                    status, page_html = await fetch_html(session, base_url, renderer, timeout=20)
+                    if status != 200:
+                        return {
+                            "module": "banner_link_checker",
+                            "result": "erro",
+                            "details": f"Erro ao acessar a URL: HTTP {status}"
+                        }
                 except (asyncio.TimeoutError, aiohttp.ClientError) as e:
                     return {
                         "module": "banner_link_checker",
@@ -55,25 +70,17 @@ async def validate_banner_links(url: str):
             if not page_html:
                 return {"module": "banner_link_checker", "result": "erro", "details": "Conteúdo da página não obtido."}
 
-            soup = BeautifulSoup(page_html, 'html.parser')
-            
-            # 1. Tenta encontrar o contêiner do banner
-            banner_container = None
-            for selector in BANNER_SELECTORS:
-                banner_container = soup.select_one(selector)
-                if banner_container:
-                    break
+            # 1. Tenta encontrar o contêiner do banner e os links (<a>) dentro dele
+            all_links_in_banner = await run_parser(_extract_banner_hrefs, page_html)
             
-            if not banner_container:
+            if all_links_in_banner is None:
                 return {
                     "module": "banner_link_checker",
                     "result": "atencao",
                     "details": f"ATENÇÃO: Não foi possível identificar o contêiner do banner usando os seletores configurados ({', '.join(BANNER_SELECTORS)}). O teste não pode ser executado."
                 }
 
-            # 2. Busca todos os links (<a>) dentro do banner
-            all_links_in_banner = banner_container.find_all('a', href=True)
-            
+            # 2. Verifica se o banner possui links
             if not all_links_in_banner:
                  return {
                     "module": "banner_link_checker",
@@ -84,9 +91,7 @@ async def validate_banner_links(url: str):
             # 3. Filtra os links de acordo com as regras
             mpi_links = []
             
-            for link_tag in all_links_in_banner:
-                raw_href = link_tag['href']
-                
+            for raw_href in all_links_in_banner:
                 # Resolve links relativos para facilitar a checagem
                 absolute_url = urljoin(base_url + '/', raw_href)
                 
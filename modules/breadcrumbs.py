@@ -4,10 +4,15 @@ import re
 import json 
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
+from core.sitemap import run_page_checks, run_sampled_page_checks, SITEMAP_MAX_PAGES
+from core import sampling
+from core import redirects
+from core.http import open_session
+from core.parsing import run_parser
+from core.render import fetch_html
 
 # Define o limite de requisições simultâneas
 CONCURRENCY_LIMIT = 5
-SEMAPHORE = asyncio.Semaphore(CONCURRENCY_LIMIT)
 
 # --- Funções Auxiliares de Busca de Menu ---
 
@@ -44,19 +49,25 @@ def _find_top_menu_links(soup, base_url):
     unique_links.add(base_url) # Inclui a página inicial
     return list(unique_links)
 
+def _extract_menu_links(html, base_url):
+    """Parse da home (roda no pool de processos): devolve só os links do menu."""
+    return _find_top_menu_links(BeautifulSoup(html, 'html.parser'), base_url)
+
 # --- Lógica de Validação de Breadcrumbs ---
 
-async def _check_link_status(session, link_url):
+async def _check_link_status(session, link_url, semaphore):
     """Verifica o status HTTP de um link do breadcrumb (sem retentativas)."""
-    async with SEMAPHORE:
+    async with semaphore:
         try:
-            # Usa HEAD para ser mais rápido, só checa o status
-            async with session.head(link_url, allow_redirects=True, timeout=10) as response: 
-                if response.status != 200:
-                    return link_url, response.status
-                return link_url, None # OK
-        except (asyncio.TimeoutError, aiohttp.ClientError):
-            return link_url, "Erro de Conexão"
+            # Usa HEAD para ser mais rápido, só checa o status (os saltos ficam no cache da sessão)
+            chain = await redirects.follow(session, link_url, method='HEAD', timeout=10)
+            if chain.loop:
+                return link_url, "Loop de Redirecionamento"
+            if chain.status == 0:
+                return link_url, "Erro de Conexão"
+            if chain.status != 200:
+                return link_url, chain.status
+            return link_url, None # OK
         except Exception:
             return link_url, "Erro Inesperado"
 
@@ -130,24 +141,26 @@ def _extract_breadcrumb_links(soup, page_url, base_url):
     
     return list(set(links)) # Remove duplicatas
 
-async def _check_page_breadcrumbs(session, page_url, base_url):
+def _extract_page_breadcrumbs(html, page_url, base_url):
+    """Parse de uma página (roda no pool de processos): devolve só as URLs do breadcrumb."""
+    return _extract_breadcrumb_links(BeautifulSoup(html, 'html.parser'), page_url, base_url)
+
+async def _check_page_breadcrumbs(session, page_url, base_url, semaphore, renderer=None):
     """Acessa a página com retentativa, extrai links e checa o status deles."""
     
     # Sequência de timeouts para retentativa: 15s (inicial), 20s, 40s, 60s
     timeouts = [15, 20, 40, 60] 
     
-    async with SEMAPHORE:
+    async with semaphore:
         page_html = None
         for attempt, timeout_val in enumerate(timeouts):
             try:
                 # 1. Tenta obter o conteúdo da página (com retentativa em caso de Timeout)
-                async with session.get(page_url, timeout=timeout_val) as response:
-                    if response.status != 200:
-                        # Falha HTTP não é timeout, reporta imediatamente
-                        return page_url, f"Erro ao acessar a página de teste: HTTP {response.status}", False 
-                    
-                    page_html = await response.text()
-                    break 
+                status, page_html = await fetch_html(session, page_url, renderer, timeout=timeout_val)
+                if status != 200:
+                    # Falha HTTP não é timeout, reporta imediatamente
+                    return page_url, f"Erro ao acessar a página de teste: HTTP {status}", False 
+                break 
             
             except asyncio.TimeoutError:
                 if attempt < len(timeouts) - 1:
@@ -166,8 +179,7 @@ async def _check_page_breadcrumbs(session, page_url, base_url):
         return page_url, "Erro interno: Conteúdo da página não obtido.", False
 
     # 2. Extrai os links do breadcrumb (usando a URL da página atual para exclusão)
-    soup = BeautifulSoup(page_html, 'html.parser')
-    breadcrumb_links = _extract_breadcrumb_links(soup, page_url, base_url) # Alteração aqui!
+    breadcrumb_links = await run_parser(_extract_page_breadcrumbs, page_html, page_url, base_url)
 
     # 3. Verifica se a página interna deveria ter um breadcrumb
     is_internal_page = urlparse(page_url).path.strip('/') != ''
@@ -177,7 +189,7 @@ async def _check_page_breadcrumbs(session, page_url, base_url):
         return page_url, None, False # Home page ignorada
 
     # 4. Verifica o status de cada link do breadcrumb
-    link_check_tasks = [_check_link_status(session, link) for link in breadcrumb_links]
+    link_check_tasks = [_check_link_status(session, link, semaphore) for link in breadcrumb_links]
     link_results = await asyncio.gather(*link_check_tasks)
     
     broken_links = [link for link, status in link_results if status is not None]
@@ -194,42 +206,57 @@ async def _check_page_breadcrumbs(session, page_url, base_url):
         return page_url, None, False
 
 
-async def validate_breadcrumbs(url):
+async def validate_breadcrumbs(url, max_pages=SITEMAP_MAX_PAGES, session=None, renderer=None,
+                               sample_size=sampling.DEFAULT_PAGE_SAMPLE_SIZE, full_run=False):
+    """
+    Valida os breadcrumbs das páginas do menu principal e do sitemap: por padrão, todas as
+    do menu mais uma amostra estratificada de sample_size páginas do sitemap, com a taxa de
+    falha estimada para o site; com full_run, as páginas em ordem até max_pages (que não se
+    aplica ao modo amostragem).
+    No modo DOM renderizado (renderer.dom_mode), menu e breadcrumbs são lidos do HTML pós-JS.
+    """
     
     fail_results = {}
+    failed_pages = []
     has_structure_failure = False 
     unreachable_links = 0
     total_links_to_check = 0
     
     try:
-        global SEMAPHORE
-        SEMAPHORE = asyncio.Semaphore(CONCURRENCY_LIMIT)
+        # Semáforo por chamada: auditorias simultâneas (modo serviço) não dividem o limite
+        semaphore = asyncio.Semaphore(CONCURRENCY_LIMIT)
 
-        async with aiohttp.ClientSession() as session:
+        async with open_session(session) as session:
             # Encontra links para testar
-            async with session.get(url, timeout=15) as response:
-                if response.status != 200:
-                    return {
-                        "module": "breadcrumbs",
-                        "result": "erro",
-                        "details": f"Não foi possível acessar a home. Status: {response.status}"
-                    }
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                internal_links = _find_top_menu_links(soup, url)
-                total_links_to_check = len(internal_links)
+            status, html = await fetch_html(session, url, renderer, timeout=15)
+            if status != 200:
+                return {
+                    "module": "breadcrumbs",
+                    "result": "erro",
+                    "details": f"Não foi possível acessar a home. Status: {status}"
+                }
+            internal_links = await run_parser(_extract_menu_links, html, url)
 
-                if total_links_to_check == 0:
-                     return {
-                        "module": "breadcrumbs",
-                        "result": "reprovado",
-                        "details": "Não foram encontrados links válidos no menu de navegação principal para testar."
-                    }
+            check = lambda link: _check_page_breadcrumbs(session, link, url, semaphore, renderer)
+            sample = None
+            if full_run:
+                # Executa a validação nas páginas do menu e do sitemap, via fila limitada
+                page_results = await run_page_checks(
+                    session, url, check, seed_urls=internal_links, max_pages=max_pages, workers=CONCURRENCY_LIMIT
+                )
+            else:
+                page_results, sample, stratum_sizes, menu_pages, truncated = await run_sampled_page_checks(
+                    session, url, check, seed_urls=internal_links, sample_size=sample_size,
+                    workers=CONCURRENCY_LIMIT, seed=sampling.site_seed(url)
+                )
+            total_links_to_check = len(page_results)
 
-            # Executa a validação em todas as páginas
-            tasks = [_check_page_breadcrumbs(session, link, url) for link in internal_links]
-            page_results = await asyncio.gather(*tasks)
+            if total_links_to_check == 0:
+                 return {
+                    "module": "breadcrumbs",
+                    "result": "reprovado",
+                    "details": "Não foram encontrados links válidos no menu de navegação principal nem no sitemap para testar."
+                }
 
             # Processa os resultados
             for page_url, detail, is_structure_failure in page_results:
@@ -238,6 +265,7 @@ async def validate_breadcrumbs(url):
                     
                     if is_structure_failure:
                         has_structure_failure = True
+                        failed_pages.append(page_url)
                     elif "Erro ao acessar a página de teste" in detail:
                         unreachable_links += 1
 
@@ -252,12 +280,23 @@ async def validate_breadcrumbs(url):
             else:
                 final_status = "aprovado"
 
+            # Taxa de páginas reprovadas estimada para o site inteiro a partir da amostra
+            estimate_text = None
+            if sample is not None:
+                estimate_text = sampling.describe(
+                    sampling.estimate(failed_pages, sample, stratum_sizes, menu_pages, truncated), "páginas"
+                )
+
             # Define os detalhes finais
             if final_status == "aprovado":
                 links_checked = total_links_to_check - unreachable_links
                 final_details = f"Aprovado! Breadcrumbs verificados em {links_checked} páginas. ({unreachable_links} erros de acesso à página de teste ignorados, erro total: {error_percentage:.1f}%)."
+                if estimate_text:
+                    final_details += f" Taxa estimada de falha: {estimate_text}."
             else:
                 final_details = fail_results
+                if estimate_text:
+                    final_details["_Taxa Estimada de Falha"] = estimate_text
                 if final_status == "erro":
                     final_details["_Resumo"] = f"ERRO GERAL: Não foi possível acessar {unreachable_links} de {total_links_to_check} links do menu. (Erro: {error_percentage:.1f}%). Limite de tolerância excedido (30%)."
                 
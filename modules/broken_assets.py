@@ -0,0 +1,70 @@
+from collections import Counter
+from core.render import PageRenderer, describe, is_broken
+
+# Camada de execução (core.validator): APIs externas e navegador rodam por último
+TIER = 2
+
+# Tipos de recurso verificados por este módulo (as imagens ficam com o broken_images)
+ASSET_TYPES = ('stylesheet', 'script', 'font', 'media', 'fetch', 'xhr')
+
+ASSET_LABELS = {
+    'stylesheet': "Folhas de Estilo Quebradas",
+    'script': "Scripts Quebrados",
+    'font': "Fontes Quebradas",
+    'media': "Mídias Quebradas",
+    'fetch': "Requisições JS com Erro",
+    'xhr': "Requisições JS com Erro",
+}
+
+
+async def validate_broken_assets(url, renderer=None):
+    """
+    Verifica CSS, JS, fontes e mídias que falharam ao carregar a página no navegador.
+    Tudo vem do log de rede da renderização compartilhada (core.render): nenhuma
+    requisição extra é feita, e os recursos inseridos por JS também são cobertos.
+    """
+    own_renderer = renderer is None
+    if own_renderer:
+        renderer = PageRenderer()
+    try:
+        render = await renderer.render(url)
+        if render is None:
+            return {
+                "module": "broken_assets",
+                "result": "nao_se_aplica",
+                "details": f"{renderer.unavailable_reason or 'Navegador indisponível'}; não foi possível renderizar a página."
+            }
+
+        assets = [entry for entry in render.network_log if entry['type'] in ASSET_TYPES]
+        broken = [entry for entry in assets if is_broken(entry)]
+        if not broken:
+            return {
+                "module": "broken_assets",
+                "result": "aprovado",
+                "details": f"Nenhum recurso quebrado entre os {len(assets)} CSS, JS, fontes e mídias carregados."
+            }
+
+        details = {
+            "Total de Recursos Carregados": len(render.network_log),
+            "Recursos Quebrados por Tipo": [f"{kind}: {count}" for kind, count in Counter(e['type'] for e in broken).most_common()],
+        }
+        for entry in broken:
+            details.setdefault(ASSET_LABELS[entry['type']], []).append(describe(entry))
+
+        # Requisições de API com erro não quebram a página por si só
+        critical = any(entry['type'] not in ('fetch', 'xhr') for entry in broken)
+        return {
+            "module": "broken_assets",
+            "result": "reprovado" if critical else "atencao",
+            "details": details
+        }
+
+    except Exception as e:
+        return {
+            "module": "broken_assets",
+            "result": "erro",
+            "details": f"Ocorreu um erro ao verificar os recursos da página: {type(e).__name__}"
+        }
+    finally:
+        if own_renderer:
+            await renderer.close()
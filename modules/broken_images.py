@@ -1,76 +1,86 @@
-import aiohttp
 import asyncio
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
+from core.assets import asset_headers, static_page
+from core.http import open_session
+from core.parsing import run_parser
+from core.render import is_broken
 
-async def _check_image_status(session, url):
-    """
-    Função auxiliar para verificar o status HTTP de uma única imagem.
-    """
-    try:
-        async with session.head(url, timeout=5) as response:
-            return response.status
-    except aiohttp.ClientError:
-        return None
-    except asyncio.TimeoutError:
-        return None
-    except Exception:
-        return None
+# Camada de execução (core.validator): lê o log de rede da renderização no navegador
+TIER = 2
+
+def _extract_image_srcs(html):
+    """Parse da página (roda no pool de processos): o src de cada <img> que tiver um."""
+    return [img.get('src') for img in BeautifulSoup(html, 'html.parser').find_all('img') if img.get('src')]
 
-async def validate_broken_images(url):
+async def validate_broken_images(url, session=None, renderer=None):
     """
     Verifica se o site tem imagens quebradas.
+    Com a página renderizada (renderer), o status das imagens vem do log de rede do
+    navegador, o que inclui as inseridas por JS e as de CSS; só as que o navegador não
+    baixou (ex: lazy load fora da tela) são sondadas (core.assets.asset_headers).
     """
     broken_images = []
     
     try:
-        async with aiohttp.ClientSession() as session:
-            # Primeiro, obtenha o HTML da página
-            async with session.get(url, timeout=10) as response:
-                if response.status != 200:
+        render = await renderer.render(url) if renderer is not None else None
+
+        async with open_session(session) as session:
+            logged = {}
+            probed = {}
+            if render is not None:
+                if render.status != 200:
                     return {
                         "module": "broken_images",
                         "result": "erro",
-                        "details": f"Não foi possível acessar a página para validar as imagens. Status: {response.status}"
+                        "details": f"Não foi possível acessar a página para validar as imagens. Status: {render.status}"
                     }
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Encontre todas as tags <img>
-                image_tags = soup.find_all('img')
-                
-                # Crie uma lista de tarefas para verificar o status de cada imagem
-                tasks = []
-                for img in image_tags:
-                    src = img.get('src')
-                    if src:
-                        # Converte URLs relativas em absolutas
-                        absolute_url = urljoin(url, src)
-                        tasks.append(_check_image_status(session, absolute_url))
-                
-                # Execute todas as tarefas de forma assíncrona
-                statuses = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                # Verifique os resultados
-                for i, status in enumerate(statuses):
-                    image_url = urljoin(url, image_tags[i].get('src'))
-                    
-                    if not status or status != 200:
-                        broken_images.append(image_url)
-                
-                if broken_images:
-                    return {
-                        "module": "broken_images",
-                        "result": "reprovado",
-                        "details": f"Imagens quebradas encontradas: {', '.join(broken_images)}"
-                    }
-                else:
+                html = render.html
+                logged = {entry['url']: entry for entry in render.network_log if entry['type'] == 'image'}
+
+                # Encontre o src de todas as tags <img> (parse fora do loop)
+                image_srcs = await run_parser(_extract_image_srcs, html)
+                image_urls = list(dict.fromkeys(urljoin(render.final_url, src) for src in image_srcs))
+                image_urls += [image_url for image_url in logged if image_url not in image_urls]
+            else:
+                # Sem navegador: a página e as sondagens das imagens são as de core.assets,
+                # compartilhadas com os módulos de peso e de cache na mesma sessão
+                page = await static_page(session, url)
+                if page.status != 200:
                     return {
                         "module": "broken_images",
-                        "result": "aprovado",
-                        "details": "Nenhuma imagem quebrada foi encontrada."
+                        "result": "erro",
+                        "details": f"Não foi possível acessar a página para validar as imagens. Status: {page.status}"
                     }
+                probed = {asset_url: asset for asset_url, category, asset in page.assets if category == "image"}
+                image_urls = list(probed)
+
+            # As imagens fora do log de rede (ex: lazy load) são sondadas uma vez por sessão
+            # (HEAD, ou GET parcial nos hosts que recusam HEAD; o corpo nunca é baixado)
+            to_probe = [image_url for image_url in image_urls if image_url not in logged and image_url not in probed]
+            probed.update(zip(to_probe, await asyncio.gather(*(asset_headers(session, image_url) for image_url in to_probe))))
+            statuses = {image_url: asset.status for image_url, asset in probed.items()}
+
+            # Verifique os resultados
+            for image_url in image_urls:
+                if image_url in logged:
+                    if is_broken(logged[image_url]):
+                        broken_images.append(image_url)
+                elif statuses[image_url] != 200:
+                    broken_images.append(image_url)
+
+            if broken_images:
+                return {
+                    "module": "broken_images",
+                    "result": "reprovado",
+                    "details": f"Imagens quebradas encontradas: {', '.join(broken_images)}"
+                }
+            else:
+                return {
+                    "module": "broken_images",
+                    "result": "aprovado",
+                    "details": "Nenhuma imagem quebrada foi encontrada."
+                }
                         
     except Exception as e:
         return {
@@ -2,16 +2,28 @@ import aiohttp
 import asyncio
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
+from core import dns, redirects, sampling
+from core.findings import site_key
+from core.probe_scheduler import (
+    ProbeScheduler, parse_crawl_delay, RATE_LIMITED, CIRCUIT_OPEN, BUDGET_EXHAUSTED
+)
+from core.http import open_session
+from core.parsing import run_parser
 
 # Limites de concorrência
 CONCURRENCY_LIMIT = 20
-SEMAPHORE = asyncio.Semaphore(CONCURRENCY_LIMIT)
 
 # Status HTTP que indicam um link quebrado (erros de cliente ou servidor)
 BROKEN_STATUSES = list(range(400, 600))
 
-# Status HTTP que indicam que o link deve ser retestado (erros temporários)
-RETRY_STATUSES = [408, 429, 500, 502, 503, 504]
+# Requisições simultâneas a um mesmo host (o restante das vagas atende os outros hosts)
+PER_HOST_LIMIT = 4
+
+# Status interno para links em loop de redirecionamento (não é um status HTTP real)
+LOOP_STATUS = 999
+
+# Links internos com mais saltos que isso são reportados (http -> https -> www -> /)
+MAX_INTERNAL_REDIRECTS = 1
 
 # Domínios a serem ignorados (W3C e outros validadores/serviços comuns de ferramentas)
 DOMAINS_TO_EXCLUDE = [
@@ -54,61 +66,69 @@ def _get_links_from_html(html, base_url):
     return list(links)
 
 
-async def _check_link_status(session, url, max_retries=1):
-    """Verifica o status HTTP de uma URL com retentativas em caso de erro temporário."""
-    
-    for attempt in range(max_retries + 1):
-        async with SEMAPHORE:
-            try:
-                # Usa HEAD para ser rápido
-                method = 'HEAD' if attempt == 0 else 'GET'
-                
-                async with session.request(method, url, timeout=15, allow_redirects=True) as response:
-                    status = response.status
-                    
-                    if status not in RETRY_STATUSES:
-                        return url, status
-                    
-                    # Se for um status de retentativa, espera um pouco e tenta novamente
-                    if attempt < max_retries:
-                        await asyncio.sleep(1) 
-                        
-            except (asyncio.TimeoutError, aiohttp.ClientError):
-                return url, 0 # 0 para indicar erro de conexão/timeout
-            except Exception:
-                return url, 0
-                
-    return url, status if 'status' in locals() else 0
-
-
-async def validate_broken_links(url):
+async def _probe_link(session, url, attempt, chains):
+    """
+    Verifica o status HTTP de uma URL sem baixar o corpo: HEAD (com GET parcial de reserva)
+    na primeira tentativa e GET parcial nas seguintes, seguindo a cadeia de
+    redirecionamentos salto a salto. As cadeias com redirecionamento
+    ficam em `chains`. Retorna (status, Retry-After em segundos); status 0 indica erro de
+    conexão/timeout. A verificação do certificado fica a cargo dos módulos de TLS (ssl=False).
+    """
+    method = 'HEAD' if attempt == 0 else 'GET'
+    chain = await redirects.follow(session, url, method=method, timeout=15, ssl=False)
+    if chain.redirects or chain.loop:
+        chains[url] = chain
+    else:
+        chains.pop(url, None)
+    if chain.loop:
+        return LOOP_STATUS, None
+    return chain.status, chain.hops[-1].retry_after
+
+
+async def _fetch_crawl_delay(session, host_url):
+    """Crawl-delay do robots.txt do host (consultado só para hosts com muitos links)."""
+    try:
+        async with session.get(f"{host_url}/robots.txt", timeout=10, ssl=False) as response:
+            if response.status != 200:
+                return None
+            return parse_crawl_delay(await response.text(errors='ignore'))
+    except (asyncio.TimeoutError, aiohttp.ClientError):
+        return None
+
+
+async def validate_broken_links(url, session=None, sample_size=sampling.DEFAULT_LINK_SAMPLE_SIZE, full_run=False):
+    """
+    Verifica os links da página. Por padrão, páginas com mais de sample_size links têm uma
+    amostra estratificada verificada (por host, caminho e template), com a taxa de links
+    quebrados estimada para a página; full_run verifica todos.
+    """
     
     base_url = url.strip('/')
     
     try:
-        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=False)) as session:
+        async with open_session(session) as session:
             
             # 1. Acessa a página principal para extrair todos os links
             page_html = None
-            async with SEMAPHORE:
-                try:
-                    async with session.get(base_url, timeout=20) as response:
-                        if response.status != 200:
-                             return {
-                                "module": "broken_links",
-                                "result": "erro",
-                                "details": f"Erro ao acessar a URL base ({base_url}) para começar a rastrear: HTTP {response.status}"
-                            }
-                        page_html = await response.text()
-                except (asyncio.TimeoutError, aiohttp.ClientError) as e:
-                    return {
-                        "module": "broken_links",
-                        "result": "erro",
-                        "details": f"Erro de conexão ao acessar a URL base: {type(e).__name__}"
-                    }
+            # Uma única requisição: o limite de concorrência fica com o ProbeScheduler da chamada
+            try:
+                async with session.get(base_url, timeout=20, ssl=False) as response:
+                    if response.status != 200:
+                         return {
+                            "module": "broken_links",
+                            "result": "erro",
+                            "details": f"Erro ao acessar a URL base ({base_url}) para começar a rastrear: HTTP {response.status}"
+                        }
+                    page_html = await response.text()
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                return {
+                    "module": "broken_links",
+                    "result": "erro",
+                    "details": f"Erro de conexão ao acessar a URL base: {type(e).__name__}"
+                }
 
             # 2. Extrai, normaliza e FILTRA (W3C) todos os links encontrados
-            all_links = _get_links_from_html(page_html, base_url)
+            all_links = await run_parser(_get_links_from_html, page_html, base_url)
             
             if not all_links:
                 return {
@@ -117,23 +137,63 @@ async def validate_broken_links(url):
                     "details": "Nenhum link foi encontrado para ser testado nesta página."
                 }
 
-            # 3. Cria uma lista de tarefas assíncronas para checar o status de cada link
-            tasks = [_check_link_status(session, link) for link in all_links]
-            
-            # Executa todas as tarefas concorrentemente
-            link_results = await asyncio.gather(*tasks)
+            # Amostra estratificada quando a página tem links demais para a auditoria de rotina
+            stratum_sizes = None
+            links_to_check = all_links
+            if not full_run and len(all_links) > sample_size:
+                links_to_check, stratum_sizes = sampling.stratified_sample(all_links, sample_size, sampling.site_seed(url))
+
+            # 3. Resolve de uma vez os domínios dos links (domínios inexistentes falham na hora)
+            await dns.prefetch(session, {urlparse(link).hostname for link in links_to_check})
+
+            # Distribui os testes entre os hosts, respeitando Retry-After e Crawl-delay
+            chains = {}
+            scheduler = ProbeScheduler(
+                lambda link, attempt: _probe_link(session, link, attempt, chains),
+                global_limit=CONCURRENCY_LIMIT, per_host_limit=PER_HOST_LIMIT,
+                crawl_delay=lambda host_url: _fetch_crawl_delay(session, host_url)
+            )
+            link_results = await scheduler.run(links_to_check)
 
             # 4. Processa os resultados para identificar links quebrados
             broken_links = {}
-            
-            for link, status in link_results:
-                if status in BROKEN_STATUSES:
+            rate_limited = []
+            out_of_budget = []
+
+            for link, probe in link_results.items():
+                if probe.note == RATE_LIMITED:
+                    # O host limitou as requisições: o link não pôde ser verificado
+                    rate_limited.append(f"[{probe.status}] -> {link}")
+                elif probe.note == BUDGET_EXHAUSTED:
+                    # Crawl-delay/Retry-After longos demais para o orçamento de tempo do host
+                    out_of_budget.append(link)
+                elif probe.note == CIRCUIT_OPEN:
+                    broken_links[link] = "HOST FORA DO AR"
+                elif probe.status == LOOP_STATUS:
+                    broken_links[link] = "LOOP DE REDIRECIONAMENTO"
+                elif probe.status in BROKEN_STATUSES:
                     # Link quebrado (4xx ou 5xx)
-                    broken_links[link] = status
-                elif status == 0:
+                    broken_links[link] = probe.status
+                elif probe.status == 0:
                     # Erro de conexão/timeout
                     broken_links[link] = "TIMEOUT/CONEXÃO"
 
+            # Cadeias longas em links internos: cada salto custa uma ida e volta a todo visitante
+            site = site_key(base_url)
+            long_chains = [
+                f"{chain.redirects} saltos, {chain.elapsed_ms:.0f} ms: {chain.describe()}"
+                for link, chain in sorted(chains.items())
+                if not chain.loop and chain.redirects > MAX_INTERNAL_REDIRECTS and site_key(link) == site
+            ]
+
+            estimate_text = None
+            if stratum_sizes is not None:
+                # Links não verificados (limite de requisições, tempo esgotado) ficam fora da amostra
+                unchecked = set(out_of_budget) | {link for link, probe in link_results.items() if probe.note == RATE_LIMITED}
+                checked = [link for link in links_to_check if link not in unchecked]
+                estimate = sampling.estimate(list(broken_links), checked, stratum_sizes)
+                estimate_text = sampling.describe(estimate, "links")
+
             # 5. Gera o relatório final
             num_total = len(all_links)
             num_broken = len(broken_links)
@@ -149,6 +209,28 @@ async def validate_broken_links(url):
                     "Total de Links Quebrados": num_broken,
                     "Links Quebrados (URL e Status)": broken_details
                 }
+                if rate_limited:
+                    details["Links Não Verificados (Limite de Requisições)"] = rate_limited
+                if out_of_budget:
+                    details["Links Não Verificados (Tempo do Host Esgotado)"] = out_of_budget
+                if long_chains:
+                    details["Redirecionamentos em Cadeia (Links Internos)"] = long_chains
+                if estimate_text:
+                    details["Taxa Estimada de Links Quebrados"] = estimate_text
+            elif rate_limited or out_of_budget or long_chains:
+                status = "atencao"
+                details = {"Total de Links Encontrados (exceto W3C)": num_total}
+                if rate_limited:
+                    details["Links Não Verificados (Limite de Requisições)"] = rate_limited
+                if out_of_budget:
+                    details["Links Não Verificados (Tempo do Host Esgotado)"] = out_of_budget
+                if long_chains:
+                    details["Redirecionamentos em Cadeia (Links Internos)"] = long_chains
+                if estimate_text:
+                    details["Taxa Estimada de Links Quebrados"] = estimate_text
+            elif estimate_text:
+                status = "aprovado"
+                details = f"APROVADO: nenhum link quebrado na amostra. Taxa estimada: {estimate_text}."
             else:
                 status = "aprovado"
                 details = f"APROVADO: {num_total} links testados nesta página. Nenhum link quebrado encontrado."
@@ -0,0 +1,163 @@
+import re
+import time
+from email.utils import parsedate_to_datetime
+from core.assets import static_page
+from core.findings import site_key
+from core.http import open_session
+
+# Camada de execução (core.validator): os cabeçalhos vêm da renderização no navegador
+TIER = 2
+
+# Respostas de texto menores que isso não precisam de compressão
+MIN_COMPRESS_SIZE = 1024
+
+COMPRESSED_ENCODINGS = ('br', 'gzip', 'zstd', 'deflate')
+
+TEXT_CONTENT_TYPES = ('text/', 'javascript', 'json', 'xml', 'svg')
+
+# Cache mínimo (segundos) para fontes, imagens e arquivos versionados
+LONG_CACHE_MIN_AGE = 30 * 24 * 3600
+
+# Arquivo versionado: hash no nome (app.3f2a9c1d.js) ou versão na query (?v=12, ?ver=1.2)
+VERSIONED_RE = re.compile(r'[.\-_][0-9a-f]{8,}\.\w+($|\?)|[?&](v|ver|version)=', re.IGNORECASE)
+
+
+def _max_age(headers):
+    """Tempo de cache em segundos pelo Cache-Control (ou Expires); None se não houver."""
+    cache_control = headers.get('cache-control', '').lower()
+    if 'no-store' in cache_control or 'no-cache' in cache_control:
+        return 0
+    match = re.search(r'(?:s-maxage|max-age)=(\d+)', cache_control)
+    if match:
+        return int(match.group(1))
+    expires = headers.get('expires')
+    if expires:
+        try:
+            return max(0, int(parsedate_to_datetime(expires).timestamp() - time.time()))
+        except (TypeError, ValueError):
+            return 0
+    return None
+
+
+def _category(url, content_type, resource_type=None):
+    content_type = content_type.lower()
+    if resource_type == 'font' or 'font' in content_type or re.search(r'\.(woff2?|ttf|otf|eot)($|\?)', url, re.IGNORECASE):
+        return "font"
+    if resource_type == 'image' or content_type.startswith('image/'):
+        return "image"
+    return "other"
+
+
+def _check_response(url, headers, size, resource_type=None, partial=False):
+    """
+    Problemas de compressão e cache de uma resposta: lista de (tipo, mensagem).
+    partial: cabeçalhos de um GET parcial (206), em que a compressão não é avaliada.
+    """
+    problems = []
+    content_type = headers.get('content-type', '')
+    encoding = headers.get('content-encoding', '').lower()
+
+    is_text = any(kind in content_type.lower() for kind in TEXT_CONTENT_TYPES)
+    if is_text and not partial and (size is None or size >= MIN_COMPRESS_SIZE) and not encoding.startswith(COMPRESSED_ENCODINGS):
+        problems.append(("compressao", f"{url} ({content_type.split(';')[0] or 'texto'} sem Brotli/gzip)"))
+
+    if resource_type == 'document':
+        return problems
+
+    max_age = _max_age(headers)
+    category = _category(url, content_type, resource_type)
+    versioned = bool(VERSIONED_RE.search(url))
+    if (versioned or category in ("font", "image")) and (max_age is None or max_age < LONG_CACHE_MIN_AGE):
+        label = "arquivo versionado" if versioned else category
+        current = "sem Cache-Control" if max_age is None else f"max-age={max_age}"
+        problems.append(("cache", f"{url} ({label} com cache curto: {current})"))
+    if max_age is None and 'etag' not in headers and 'last-modified' not in headers:
+        problems.append(("validacao", f"{url} (sem Cache-Control, ETag nem Last-Modified)"))
+    return problems
+
+
+async def _static_responses(session, url):
+    """Homepage e arquivos dela quando não há página renderizada (core.assets, guardados na sessão)."""
+    page = await static_page(session, url)
+    if page.status != 200:
+        return page.status, []
+    responses = [(url, page.headers, page.size, 'document', False)]
+    for asset_url, _, asset in page.assets:
+        if 0 < asset.status < 400:
+            responses.append((asset_url, asset.headers, asset.size, None, asset.partial))
+    return 200, responses
+
+
+async def validate_caching_headers(url, session=None, renderer=None):
+    """
+    Verifica compressão (Brotli/gzip) das respostas de texto, cache longo de fontes,
+    imagens e arquivos versionados, validadores (ETag/Last-Modified) e keep-alive da
+    homepage. Usa as respostas do log de rede da renderização compartilhada; sem ela,
+    a homepage e os cabeçalhos dos arquivos guardados na sessão (core.assets.static_page).
+    Só os arquivos do próprio site são avaliados.
+    """
+    try:
+
+        render = await renderer.render(url) if renderer is not None else None
+        if render is not None:
+            status = render.status
+            responses = [
+                (entry['url'], entry['headers'], entry['decoded_size'] or entry['size'] or None, entry['type'], False)
+                for entry in render.network_log
+                if not entry['failure'] and 200 <= entry['status'] < 300
+            ]
+        else:
+            async with open_session(session) as session:
+                status, responses = await _static_responses(session, url)
+
+        if status != 200:
+            return {
+                "module": "caching_headers",
+                "result": "erro",
+                "details": f"Não foi possível acessar a página para verificar os cabeçalhos. Status: {status}"
+            }
+
+        site = site_key(url)
+        own = [r for r in responses if site_key(r[0]) == site or site_key(r[0]).endswith('.' + site)]
+
+        found = {"compressao": [], "cache": [], "validacao": []}
+        for response_url, headers, size, resource_type, partial in own:
+            for kind, message in _check_response(response_url, headers, size, resource_type, partial):
+                found[kind].append(message)
+
+        # Keep-alive: a homepage não deve fechar a conexão a cada resposta
+        document = next((r for r in own if r[3] == 'document'), None)
+        no_keep_alive = document is not None and document[1].get('connection', '').lower() == 'close'
+
+        if found["compressao"]:
+            result = "reprovado"
+        elif found["cache"] or found["validacao"] or no_keep_alive:
+            result = "atencao"
+        else:
+            result = "aprovado"
+
+        if result == "aprovado":
+            details = f"Compressão e cache adequados em {len(own)} respostas do site ({len(responses) - len(own)} de terceiros ignoradas)."
+        else:
+            details = {"Respostas Analisadas": f"{len(own)} do site ({len(responses) - len(own)} de terceiros ignoradas)"}
+            if found["compressao"]:
+                details["Respostas de Texto sem Compressão"] = found["compressao"]
+            if found["cache"]:
+                details[f"Cache Curto (< {LONG_CACHE_MIN_AGE // 86400} dias)"] = found["cache"]
+            if found["validacao"]:
+                details["Sem Validadores de Cache"] = found["validacao"]
+            if no_keep_alive:
+                details["Keep-Alive"] = [f"{document[0]} responde com 'Connection: close'"]
+
+        return {
+            "module": "caching_headers",
+            "result": result,
+            "details": details
+        }
+
+    except Exception as e:
+        return {
+            "module": "caching_headers",
+            "result": "erro",
+            "details": f"Ocorreu um erro ao verificar os cabeçalhos de cache: {type(e).__name__}"
+        }
@@ -1,9 +1,9 @@
-import aiohttp
 import asyncio
 from io import BytesIO
 from PIL import Image
 from urllib.parse import urljoin
 import re
+from core.http import open_session
 
 async def _find_favicon_url(session, url):
     """
@@ -35,14 +35,14 @@ async def _find_favicon_url(session, url):
 
     return None
 
-async def validate_favicon(url):
+async def validate_favicon(url, session=None):
     """
     Verifica se o site tem um favicon e se ele tem o tamanho 32x32.
     """
     # A biblioteca Pillow, que lida com imagens, pode ter problemas com certas imagens.
     # Usado 'try-except' para tratar qualquer erro que possa ocorrer.
     try:
-        async with aiohttp.ClientSession() as session:
+        async with open_session(session) as session:
             favicon_url = await _find_favicon_url(session, url)
 
             if not favicon_url:
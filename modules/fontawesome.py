@@ -1,14 +1,14 @@
-import aiohttp
 import asyncio
 import re
+from core.http import open_session
 
-async def validate_fontawesome(url):
+async def validate_fontawesome(url, session=None):
     """
     Verifica se o site carrega a biblioteca Font Awesome, buscando
     por qualquer link ou script que contenha "fontawesome".
     """
     try:
-        async with aiohttp.ClientSession() as session:
+        async with open_session(session) as session:
             async with session.get(url, timeout=5) as response:
                 if response.status != 200:
                     return {
@@ -1,30 +1,44 @@
 import aiohttp
 import asyncio
 from bs4 import BeautifulSoup
+from core.http import open_session
+from core.parsing import run_parser
+from core.render import fetch_html
 
 # Limite de concorrência global
 CONCURRENCY_LIMIT = 5
 SEMAPHORE = asyncio.Semaphore(CONCURRENCY_LIMIT)
 
 
-async def validate_footer_lazy_load(url: str):
+def _extract_footer_images(html):
+    """
+    Parse da página (roda no pool de processos): (src, loading) das imagens do <footer>,
+    ou None se a página não tiver <footer>.
+    """
+    footer_element = BeautifulSoup(html, 'html.parser').find('footer')
+    if not footer_element:
+        return None
+    return [(img.get('src'), img.get('loading')) for img in footer_element.find_all('img')]
+
+
+async def validate_footer_lazy_load(url: str, session=None, renderer=None):
     
     base_url = url.strip('/')
     
     try:
-        async with aiohttp.ClientSession() as session:
+        async with open_session(session) as session:
             
             page_html = None
             async with SEMAPHORE:
                 try:
-                    async with session.get(base_url, timeout=20) as response:
-                        if response.status != 200:
-                             return {
-                                "module": "footer_lazy_load_check",
-                                "result": "erro",
-                                "details": f"Erro ao acessar a URL: HTTP {response.status}"
-                            }
-                        page_html = await response.text()
+                    # HTML do servidor ou, no modo DOM renderizado, o da renderização compartilhada
+                    status, page_html = await fetch_html(session, base_url, renderer, timeout=20)
+                    if status != 200:
+                        return {
+                            "module": "footer_lazy_load_check",
+                            "result": "erro",
+                            "details": f"Erro ao acessar a URL: HTTP {status}"
+                        }
                 except (asyncio.TimeoutError, aiohttp.ClientError) as e:
                     return {
                         "module": "footer_lazy_load_check",
@@ -35,12 +49,10 @@ async def validate_footer_lazy_load(url: str):
             if not page_html:
                 return {"module": "footer_lazy_load_check", "result": "erro", "details": "Conteúdo da página não obtido."}
 
-            soup = BeautifulSoup(page_html, 'html.parser')
+            # 1. Tenta encontrar a tag <footer> principal e as imagens dentro dela
+            footer_images = await run_parser(_extract_footer_images, page_html)
             
-            # 1. Tenta encontrar a tag <footer> principal
-            footer_element = soup.find('footer')
-            
-            if not footer_element:
+            if footer_images is None:
                 # Se não houver tag <footer>, a validação é aprovada (não há o que validar)
                 return {
                     "module": "footer_lazy_load_check",
@@ -48,9 +60,7 @@ async def validate_footer_lazy_load(url: str):
                     "details": "APROVADO: A tag <footer> não foi encontrada. Nenhuma imagem no rodapé foi detectada para validação."
                 }
 
-            # 2. Busca por todas as imagens dentro do footer
-            footer_images = footer_element.find_all('img')
-            
+            # 2. Verifica se há imagens dentro do footer
             if not footer_images:
                  return {
                     "module": "footer_lazy_load_check",
@@ -61,13 +71,11 @@ async def validate_footer_lazy_load(url: str):
             # 3. Valida o atributo loading="lazy"
             missing_lazy_load = []
             
-            for index, img in enumerate(footer_images):
-                loading_attr = img.get('loading')
-                
+            for index, (src, loading_attr) in enumerate(footer_images):
                 # Se a imagem tiver um 'src' válido E não tiver o atributo loading="lazy"
-                if img.get('src') and loading_attr != 'lazy':
+                if src and loading_attr != 'lazy':
                     # Pega o 'src' para identificar qual imagem está com problema
-                    missing_lazy_load.append(f"Imagem #{index + 1} (src: {img.get('src')[:50]}...)")
+                    missing_lazy_load.append(f"Imagem #{index + 1} (src: {src[:50]}...)")
 
             
             # 4. Gera o Relatório Final
@@ -1,15 +1,99 @@
 import aiohttp
 import asyncio
+import re
+from bs4 import BeautifulSoup
+from urllib.parse import urlparse
+from core.http import open_session
+from core.parsing import run_parser
 
-async def validate_http_status(url):
-    """Verifica se a URL retorna um status HTTP 200 OK."""
+# Camada de execução (core.validator): roda primeiro e bloqueia as demais se a home falhar,
+# para que sites fora do ar ou estacionados custem uma única requisição
+TIER = 0
+GATING = True
+
+# Frases típicas de páginas de domínio estacionado/à venda
+PARKED_PHRASES = (
+    'this domain is for sale',
+    'domain is for sale',
+    'this domain is parked',
+    'buy this domain',
+    'este domínio está à venda',
+    'domínio estacionado',
+)
+# Serviços de estacionamento de domínios (redirecionamento, scripts e frames deles)
+PARKING_HOSTS = (
+    'sedoparking.com',
+    'parkingcrew.net',
+    'bodis.com',
+    'hugedomains.com',
+    'afternic.com',
+    'dan.com',
+)
+PARKED_SCAN_BYTES = 64 * 1024
+
+# Falha de conexão (DNS, TCP, TLS) ou resposta que não chega em RESPONSE_TIMEOUT bloqueiam
+# as camadas seguintes. O limite acompanha o timeout das páginas nos módulos da camada 1
+# (20s): uma home lenta que responde dentro dele passa, e uma que não responde faria
+# cada módulo seguinte esperar o próprio timeout à toa
+CONNECT_TIMEOUT = 10
+RESPONSE_TIMEOUT = 20
+
+
+def _is_parking_host(url):
+    host = (urlparse(url).hostname or '').lower()
+    return any(host == parking or host.endswith('.' + parking) for parking in PARKING_HOSTS)
+
+
+def _parking_signals(html):
+    """
+    Parse do início da home (roda no pool de processos): (título, texto visível, se algum
+    script/frame/meta refresh vem de um serviço de estacionamento). Links comuns não contam.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    title = soup.title.get_text(' ', strip=True).lower() if soup.title else ''
+    sources = [tag.get('src', '') for tag in soup.find_all(('script', 'iframe', 'frame'), src=True)]
+    sources += [
+        re.split(r'url\s*=', tag.get('content', ''), maxsplit=1, flags=re.IGNORECASE)[-1]
+        for tag in soup.find_all('meta', attrs={'http-equiv': lambda value: value and value.lower() == 'refresh'})
+    ]
+    has_provider = any(_is_parking_host(source.strip(' \'"')) for source in sources)
+    for tag in soup(('script', 'style', 'noscript', 'template')):
+        tag.decompose()
+    return title, soup.get_text(' ', strip=True).lower(), has_provider
+
+
+def _parked_reason(final_url, title, text, has_provider):
+    """Motivo para considerar a home um domínio estacionado, ou None."""
+    if _is_parking_host(final_url):
+        return f"redireciona para o serviço de estacionamento {urlparse(final_url).hostname}"
+    phrase = next((p for p in PARKED_PHRASES if p in title), None)
+    if phrase:
+        return f"título '{phrase}'"
+    # No texto da página a frase só conta junto com um recurso do serviço de estacionamento
+    phrase = next((p for p in PARKED_PHRASES if p in text), None)
+    if phrase and has_provider:
+        return f"texto '{phrase}' e conteúdo de serviço de estacionamento"
+    return None
+
+
+async def validate_http_status(url, session=None):
+    """Verifica se a URL retorna um status HTTP 200 OK (e não uma página de domínio estacionado)."""
     try:
-        # Usa um ClientSession para gerenciar as conexões
-        async with aiohttp.ClientSession() as session:
-            # Faz uma requisição GET com um timeout de 5 segundos
-            async with session.get(url, timeout=5) as response:
+        # Usa a sessão compartilhada (ou abre uma própria) para gerenciar as conexões
+        async with open_session(session) as session:
+            timeout = aiohttp.ClientTimeout(total=RESPONSE_TIMEOUT, sock_connect=CONNECT_TIMEOUT)
+            async with session.get(url, timeout=timeout) as response:
                 status = response.status
                 is_valid = status == 200
+                if is_valid:
+                    head = (await response.content.read(PARKED_SCAN_BYTES)).decode('utf-8', errors='ignore')
+                    reason = _parked_reason(str(response.url), *await run_parser(_parking_signals, head))
+                    if reason:
+                        return {
+                            "module": "http_status",
+                            "result": "reprovado",
+                            "details": f"Status code: {status}, mas a página parece ser de domínio estacionado ({reason})."
+                        }
                 return {
                     "module": "http_status",
                     "result": "aprovado" if is_valid else "reprovado",
@@ -23,11 +107,11 @@ async def validate_http_status(url):
             "details": f"Erro de conexão: {e}"
         }
     except asyncio.TimeoutError:
-        # Captura o erro de timeout
+        # Conectou, mas a resposta não chegou a tempo (o timeout de conexão é um ClientError)
         return {
             "module": "http_status",
             "result": "reprovado",
-            "details": "Tempo limite de conexão esgotado."
+            "details": f"A home conectou, mas não respondeu em {RESPONSE_TIMEOUT}s."
         }
     except Exception as e:
         # Captura qualquer outro erro inesperado
@@ -35,4 +119,4 @@ async def validate_http_status(url):
             "module": "http_status",
             "result": "erro",
             "details": f"Ocorreu um erro inesperado: {e}"
-        }
\ No newline at end of file
+        }
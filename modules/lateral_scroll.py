@@ -1,19 +1,16 @@
 import asyncio
 from playwright.async_api import async_playwright
+from core.render import SCREEN_RESOLUTIONS
 
-# Resoluções de tela para testes
-SCREEN_RESOLUTIONS = {
-    "desktop": {"width": 1920, "height": 1080},
-    "tablet": {"width": 768, "height": 1024},
-    "mobile": {"width": 375, "height": 667}
-}
+# Camada de execução (core.validator): APIs externas e navegador rodam por último
+TIER = 2
 
-async def _check_scroll_for_size(page, name, size):
+async def _check_scroll_for_size(page, url, name, size):
     """
     Função auxiliar para verificar o scroll lateral e encontrar o elemento causador.
     """
     await page.set_viewport_size(size)
-    await page.goto(page.url)  # Recarrega a página com o novo tamanho
+    await page.goto(url)  # Carrega a página com o novo tamanho
     
     # Script JavaScript para detectar scroll lateral e encontrar o elemento causador
     has_scroll_js = """
@@ -53,39 +50,60 @@ async def _check_scroll_for_size(page, name, size):
             "details": "Nenhum scroll lateral detectado."
         }
 
-async def validate_lateral_scroll(url):
+async def _check_all_sizes(browser, url):
+    """Abre a página no navegador e verifica cada resolução configurada."""
+    results = []
+    page = await browser.new_page()
+    try:
+        # Para cada resolução, verifique o scroll
+        for name, size in SCREEN_RESOLUTIONS.items():
+            result = await _check_scroll_for_size(page, url, name, size)
+            results.append(result)
+    finally:
+        await page.close()
+    return results
+
+async def validate_lateral_scroll(url, browser=None, renderer=None):
     """
     Valida a presença de scroll lateral em diferentes dispositivos, fornecendo o elemento causador.
+    Usa o navegador da execução (renderer) ou o já aberto (browser) quando fornecidos; caso
+    contrário, inicia um próprio. Com o renderer, o carregamento inicial da página é o
+    compartilhado, cujo log de rede é usado pelos módulos de recursos quebrados.
     """
-    results = []
-    
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch()
-            page = await browser.new_page()
-            await page.goto(url)
+        if renderer is not None:
+            await renderer.render(url)
+            browser = await renderer.get_browser()
+            if browser is None:
+                return {
+                    "module": "lateral_scroll",
+                    "result": "nao_se_aplica",
+                    "details": f"{renderer.unavailable_reason or 'Navegador indisponível'}; não foi possível verificar o scroll lateral."
+                }
+        if browser is not None:
+            results = await _check_all_sizes(browser, url)
+        else:
+            async with async_playwright() as p:
+                own_browser = await p.chromium.launch()
+                try:
+                    results = await _check_all_sizes(own_browser, url)
+                finally:
+                    await own_browser.close()
 
-            # Para cada resolução, verifique o scroll
-            for name, size in SCREEN_RESOLUTIONS.items():
-                result = await _check_scroll_for_size(page, name, size)
-                results.append(result)
+        # Formate o resultado final para o validador principal
+        status = "aprovado"
+        details_list = []
+        
+        for res in results:
+            details_list.append(f"{res['device']}: {res['details']} ({res['status']})")
+            if res['status'] == 'reprovado':
+                status = "reprovado"
                 
-            await browser.close()
-            
-            # Formate o resultado final para o validador principal
-            status = "aprovado"
-            details_list = []
-            
-            for res in results:
-                details_list.append(f"{res['device']}: {res['details']} ({res['status']})")
-                if res['status'] == 'reprovado':
-                    status = "reprovado"
-                    
-            return {
-                "module": "lateral_scroll",
-                "result": status,
-                "details": ", ".join(details_list)
-            }
+        return {
+            "module": "lateral_scroll",
+            "result": status,
+            "details": ", ".join(details_list)
+        }
 
     except Exception as e:
         return {
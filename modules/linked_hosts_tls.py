@@ -0,0 +1,140 @@
+import aiohttp
+import asyncio
+import ssl
+from urllib.parse import urlparse
+from core import sampling, tls
+from core.http import open_session
+from core.parsing import run_parser
+from core.sitemap import run_page_checks, run_sampled_page_checks, SITEMAP_MAX_PAGES
+from modules.broken_links import _get_links_from_html
+from modules.ssl_certificate import SSL_EXPIRY_WARNING_DAYS
+
+# Camada de execução (core.validator): rastreia páginas e contata hosts externos, roda por último
+TIER = 2
+
+# Páginas lidas em paralelo para extrair os links
+PAGE_CONCURRENCY = 5
+
+# Handshakes simultâneos (só TLS, nenhum conteúdo é baixado dos hosts linkados)
+CONCURRENCY_LIMIT = 20
+
+
+async def _collect_page_hosts(session, page_url):
+    """Lê uma página e retorna os hosts HTTPS (host, porta) dos links encontrados nela."""
+    try:
+        async with session.get(page_url, timeout=15, ssl=False) as response:
+            if response.status != 200:
+                return page_url, set()
+            html = await response.text()
+    except (asyncio.TimeoutError, aiohttp.ClientError):
+        return page_url, set()
+
+    hosts = set()
+    for link in await run_parser(_get_links_from_html, html, page_url):
+        parsed = urlparse(link)
+        if parsed.scheme == 'https' and parsed.hostname:
+            hosts.add((parsed.hostname.lower(), parsed.port or 443))
+    return page_url, hosts
+
+
+async def _audit_host(session, host, port, semaphore):
+    async with semaphore:
+        info, error = await tls.check_host(host, port, session=session)
+    return host, port, info, error
+
+
+def _host_label(host, port):
+    return host if port == 443 else f"{host}:{port}"
+
+
+async def validate_linked_hosts_tls(url, max_pages=SITEMAP_MAX_PAGES, session=None,
+                                    sample_size=sampling.DEFAULT_PAGE_SAMPLE_SIZE, full_run=False):
+    """
+    Audita o certificado TLS de cada host HTTPS para o qual o site aponta (subdomínios,
+    parceiros...). Cada host é verificado uma única vez, mesmo que apareça em várias páginas;
+    o cache do core.tls também evita repetir hosts entre os sites de um lote.
+    Os links vêm da home e da amostra do sitemap já sorteada para a execução (a mesma do
+    url_h1_coherence e do breadcrumbs, sem nova leitura do sitemap); com full_run, das
+    páginas em ordem até max_pages.
+    """
+    try:
+        async with open_session(session) as session:
+            collect = lambda page_url: _collect_page_hosts(session, page_url)
+            if full_run:
+                page_results = await run_page_checks(
+                    session, url, collect, seed_urls=[url], max_pages=max_pages, workers=PAGE_CONCURRENCY
+                )
+            else:
+                page_results, _, _, _, _ = await run_sampled_page_checks(
+                    session, url, collect, seed_urls=[url], sample_size=sample_size,
+                    workers=PAGE_CONCURRENCY, seed=sampling.site_seed(url)
+                )
+
+        # Host -> primeira página onde o link foi encontrado
+        linked_from = {}
+        for page_url, hosts in page_results:
+            for host_port in hosts:
+                linked_from.setdefault(host_port, page_url)
+
+        if not linked_from:
+            return {
+                "module": "linked_hosts_tls",
+                "result": "nao_se_aplica",
+                "details": "Nenhum link HTTPS foi encontrado nas páginas analisadas."
+            }
+
+        semaphore = asyncio.Semaphore(CONCURRENCY_LIMIT)
+        audits = await asyncio.gather(*(_audit_host(session, host, port, semaphore) for host, port in linked_from))
+
+        certificate_errors = []
+        expiring = []
+        unreachable = []
+        for host, port, info, error in audits:
+            label = _host_label(host, port)
+            page_url = linked_from[(host, port)]
+            if isinstance(error, ssl.SSLError):
+                reason = getattr(error, 'verify_message', None) or getattr(error, 'reason', None) or str(error)
+                certificate_errors.append(f"{label}: {reason} (linkado em {page_url})")
+            elif error is not None:
+                unreachable.append(f"{label}: {type(error).__name__} (linkado em {page_url})")
+            elif info is not None:
+                remaining = tls.days_remaining(info)
+                if remaining <= 0:
+                    certificate_errors.append(f"{label}: certificado expirado em {info['not_after']} (linkado em {page_url})")
+                elif remaining < SSL_EXPIRY_WARNING_DAYS:
+                    expiring.append(f"{label}: expira em {int(remaining)} dias ({info['not_after']}) (linkado em {page_url})")
+
+        total_hosts = len(linked_from)
+        if certificate_errors:
+            status = "reprovado"
+        elif expiring:
+            status = "atencao"
+        else:
+            status = "aprovado"
+
+        if status == "aprovado":
+            details = f"Certificados válidos em {total_hosts - len(unreachable)} hosts HTTPS linkados ({len(unreachable)} sem resposta)."
+        else:
+            details = {
+                "Total de Hosts HTTPS Linkados": total_hosts,
+                "Páginas Analisadas": len(page_results),
+            }
+            if certificate_errors:
+                details["Hosts com Erro de Certificado"] = certificate_errors
+            if expiring:
+                details[f"Hosts com Certificado Expirando (< {SSL_EXPIRY_WARNING_DAYS} dias)"] = expiring
+            if unreachable:
+                details["Hosts sem Resposta TLS"] = unreachable
+
+        return {
+            "module": "linked_hosts_tls",
+            "result": status,
+            "details": details
+        }
+
+    except Exception as e:
+        return {
+            "module": "linked_hosts_tls",
+            "result": "erro",
+            "details": f"Ocorreu um erro geral na auditoria TLS dos hosts linkados: {type(e).__name__}"
+        }
@@ -0,0 +1,181 @@
+from core.assets import static_page
+from core.http import open_session
+
+# Camada de execução (core.validator): os tamanhos vêm da renderização no navegador
+TIER = 2
+
+# Orçamentos por tipo (soma dos arquivos do tipo) e por arquivo individual, em bytes
+# transferidos. Podem ser sobrescritos pelos argumentos budgets/asset_budgets.
+KB = 1024
+MB = 1024 * KB
+TYPE_BUDGETS = {
+    "html": 150 * KB,
+    "css": 300 * KB,
+    "js": 1 * MB,
+    "image": 2 * MB,
+    "font": 300 * KB,
+}
+ASSET_BUDGETS = {
+    "html": 150 * KB,
+    "css": 150 * KB,
+    "js": 500 * KB,
+    "image": 500 * KB,
+    "font": 150 * KB,
+}
+PAGE_BUDGET = 3 * MB
+
+# Maiores arquivos listados no relatório
+TOP_OFFENDERS = 10
+
+ASSET_TYPES = ("html", "css", "js", "image", "font", "other")
+
+# Tipos de recurso do navegador -> categorias do orçamento
+RESOURCE_CATEGORIES = {
+    "document": "html",
+    "stylesheet": "css",
+    "script": "js",
+    "image": "image",
+    "font": "font",
+}
+
+
+def _format_size(size):
+    if size is None:
+        return "n/d"
+    if size >= MB:
+        return f"{size / MB:.2f} MB"
+    if size >= 10 * KB:
+        return f"{size / KB:.0f} KB"
+    return f"{size / KB:.1f} KB"
+
+
+async def _static_assets(session, url):
+    """
+    Arquivos da página sem navegador: HTML baixado, demais medidos pelos cabeçalhos guardados
+    na sessão (core.assets: Content-Length do HEAD ou total do Content-Range do GET parcial).
+    """
+    page = await static_page(session, url)
+    if page.status != 200:
+        return page.status, []
+
+    length = page.headers.get('content-length')
+    transfer = int(length) if length and length.isdigit() else None
+    assets = [{"url": url, "type": "html", "transfer": transfer, "decoded": page.size}]
+    for asset_url, category, asset in page.assets:
+        transfer = asset.size if 0 < asset.status < 400 else None
+        # Com Content-Encoding o tamanho é o comprimido; o descomprimido fica desconhecido
+        decoded = transfer if 'content-encoding' not in asset.headers else None
+        assets.append({"url": asset_url, "type": category, "transfer": transfer, "decoded": decoded})
+    return 200, assets
+
+
+def _rendered_assets(render):
+    """Arquivos da página a partir do log de rede da renderização (nenhuma requisição extra)."""
+    assets = []
+    for entry in render.network_log:
+        if entry['failure'] or entry['status'] >= 400:
+            continue
+        assets.append({
+            "url": entry['url'],
+            "type": RESOURCE_CATEGORIES.get(entry['type'], "other"),
+            "transfer": entry['transfer_size'] or None,
+            "decoded": entry['decoded_size'],
+        })
+    return assets
+
+
+def _weight(asset):
+    """Peso usado nos orçamentos: bytes transferidos ou, sem eles, descomprimidos."""
+    return asset['transfer'] if asset['transfer'] is not None else (asset['decoded'] or 0)
+
+
+async def validate_page_weight(url, session=None, renderer=None, budgets=None, asset_budgets=None, page_budget=PAGE_BUDGET):
+    """
+    Soma o peso transferido e descomprimido de HTML, CSS, JS, imagens e fontes da página,
+    lista os maiores arquivos e aponta os tipos e arquivos acima dos orçamentos.
+    Com a página renderizada, os tamanhos vêm do log de rede do navegador; sem ela, dos
+    cabeçalhos dos arquivos referenciados no HTML (core.assets.static_page).
+    """
+    try:
+        type_budgets = {**TYPE_BUDGETS, **(budgets or {})}
+        file_budgets = {**ASSET_BUDGETS, **(asset_budgets or {})}
+
+        render = await renderer.render(url) if renderer is not None else None
+        if render is not None:
+            status, assets = render.status, _rendered_assets(render)
+            source = "log de rede do navegador"
+        else:
+            async with open_session(session) as session:
+                status, assets = await _static_assets(session, url)
+            source = "HTML estático e cabeçalhos dos arquivos"
+
+        if status != 200:
+            return {
+                "module": "page_weight",
+                "result": "erro",
+                "details": f"Não foi possível acessar a página para medir o peso. Status: {status}"
+            }
+
+        # Tabela de peso por tipo
+        breakdown = []
+        over_budget = []
+        for category in ASSET_TYPES:
+            items = [a for a in assets if a['type'] == category]
+            if not items:
+                continue
+            transfer = sum(_weight(a) for a in items)
+            decoded = sum(a['decoded'] or 0 for a in items)
+            budget = type_budgets.get(category)
+            breakdown.append({
+                "Tipo": category,
+                "Arquivos": len(items),
+                "Transferido": _format_size(transfer),
+                "Descomprimido": _format_size(decoded) if decoded else "n/d",
+                "Orçamento": _format_size(budget) if budget else "-",
+            })
+            if budget and transfer > budget:
+                over_budget.append(f"{category}: {_format_size(transfer)} (orçamento {_format_size(budget)})")
+
+        total = sum(_weight(a) for a in assets)
+        if total > page_budget:
+            over_budget.insert(0, f"página inteira: {_format_size(total)} (orçamento {_format_size(page_budget)})")
+
+        oversized = [
+            f"{a['type']}: {_format_size(_weight(a))} (orçamento {_format_size(file_budgets[a['type']])}) {a['url']}"
+            for a in sorted(assets, key=_weight, reverse=True)
+            if a['type'] in file_budgets and _weight(a) > file_budgets[a['type']]
+        ]
+        largest = [
+            {"Arquivo": a['url'], "Tipo": a['type'], "Transferido": _format_size(_weight(a))}
+            for a in sorted(assets, key=_weight, reverse=True)[:TOP_OFFENDERS]
+        ]
+
+        if over_budget:
+            result = "reprovado"
+        elif oversized:
+            result = "atencao"
+        else:
+            result = "aprovado"
+
+        details = {
+            "Peso Total": f"{_format_size(total)} em {len(assets)} arquivos (fonte: {source})",
+            "Peso por Tipo": breakdown,
+        }
+        if over_budget:
+            details["Orçamentos Estourados"] = over_budget
+        if oversized:
+            details["Arquivos Acima do Orçamento"] = oversized
+        details[f"Maiores Arquivos (top {TOP_OFFENDERS})"] = largest
+
+        return {
+            "module": "page_weight",
+            "result": result,
+            "details": details
+        }
+
+    except Exception as e:
+        return {
+            "module": "page_weight",
+            "result": "erro",
+            "details": f"Ocorreu um erro ao medir o peso da página: {type(e).__name__}"
+        }
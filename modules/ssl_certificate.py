@@ -1,10 +1,40 @@
 import ssl
 import socket
 import asyncio
+import aiohttp
 from urllib.parse import urlparse
+from core import tls
 
-async def validate_ssl_certificate(url):
-    """Verifica o certificado SSL de uma URL."""
+# Certificados que vencem em menos dias que isso geram alerta
+SSL_EXPIRY_WARNING_DAYS = 30
+
+
+async def _get_certificate_info(url, hostname, port, session):
+    """
+    Obtém os dados do certificado: primeiro do cache (conexões já feitas pela sessão
+    compartilhada), depois por uma requisição na sessão e, por último, por um handshake próprio.
+    """
+    info = tls.get_cached(hostname, port)
+    if info is None and session is not None:
+        try:
+            async with session.head(url, timeout=10):
+                pass
+        except aiohttp.ClientSSLError as e:
+            # Repassa o erro original do ssl (certificado expirado, autoassinado, etc.)
+            raise e.os_error
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError):
+            pass
+        info = tls.get_cached(hostname, port)
+    if info is None:
+        # Handshake próprio (no replay, só o certificado gravado no cassete)
+        info, error = await tls.check_host(hostname, port, session=session)
+        if error is not None:
+            raise error
+    return info
+
+
+async def validate_ssl_certificate(url, session=None):
+    """Verifica o certificado SSL de uma URL e informa validade, emissor, SANs e cifra."""
     try:
         # Analisa a URL para obter o host e a porta (padrão 443 para HTTPS)
         parsed_url = urlparse(url)
@@ -16,23 +46,41 @@ async def validate_ssl_certificate(url):
             }
 
         hostname = parsed_url.hostname
-        port = 443
-        
-        # Cria um contexto SSL padrão
-        context = ssl.create_default_context()
-        
-        # Usa asyncio para conectar-se ao servidor de forma não bloqueante
-        reader, writer = await asyncio.open_connection(hostname, port, ssl=context)
-        
-        # Pega o certificado da conexão
-        writer.close()
-        await writer.wait_closed()
-        
-        # Se a conexão foi bem sucedida, o certificado existe e é válido
+        port = parsed_url.port or 443
+
+        info = await _get_certificate_info(url, hostname, port, session)
+        if not info:
+            return {
+                "module": "ssl_certificate",
+                "result": "erro",
+                "details": "Não foi possível ler os dados do certificado SSL."
+            }
+
+        remaining = tls.days_remaining(info)
+        details = {
+            "Expira em": info['not_after'],
+            "Dias Restantes": int(remaining),
+            "Emissor": info['issuer'],
+            "Titular": info['subject'],
+            "SANs": ', '.join(info['sans']),
+            "Protocolo": info['protocol'],
+            "Cifra": f"{info['cipher']} ({info['cipher_bits']} bits)",
+        }
+
+        if remaining <= 0:
+            status = "reprovado"
+            details["Status"] = "Certificado SSL expirado."
+        elif remaining < SSL_EXPIRY_WARNING_DAYS:
+            status = "atencao"
+            details["Status"] = f"Certificado SSL válido, mas expira em {int(remaining)} dias."
+        else:
+            status = "aprovado"
+            details["Status"] = "Certificado SSL válido encontrado."
+
         return {
             "module": "ssl_certificate",
-            "result": "aprovado",
-            "details": "Certificado SSL válido encontrado."
+            "result": status,
+            "details": details
         }
     except ssl.SSLError as e:
         # Erro de certificado (expirado, inválido, etc.)
@@ -41,7 +89,7 @@ async def validate_ssl_certificate(url):
             "result": "reprovado",
             "details": f"Erro no certificado SSL: {e}"
         }
-    except (socket.gaierror, ConnectionRefusedError) as e:
+    except (socket.gaierror, ConnectionRefusedError, asyncio.TimeoutError) as e:
         # Erros de conexão ou DNS
         return {
             "module": "ssl_certificate",
@@ -54,4 +102,4 @@ async def validate_ssl_certificate(url):
             "module": "ssl_certificate",
             "result": "erro",
             "details": f"Ocorreu um erro inesperado: {e}"
-        }
\ No newline at end of file
+        }
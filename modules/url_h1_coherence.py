@@ -1,12 +1,16 @@
 import aiohttp
 import asyncio
-import re
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin
+from core.coherence import score_pairs, COHERENCE_THRESHOLD
+from core import sampling
+from core.sitemap import run_page_checks, run_sampled_page_checks, SITEMAP_MAX_PAGES
+from core.http import open_session
+from core.parsing import run_parser
+from core.render import fetch_html
 
 # Define o limite de requisições simultâneas para evitar sobrecarga
 CONCURRENCY_LIMIT = 5
-SEMAPHORE = asyncio.Semaphore(CONCURRENCY_LIMIT)
 
 # --- Funções Auxiliares de Busca de Menu (Mantidas) ---
 
@@ -39,71 +43,41 @@ def _find_top_menu_links(soup, base_url):
     unique_links = set(link for text, link in best_menu_links)
     return list(unique_links)
 
-# --- Funções Auxiliares de Coerência URL/H1 ---
+def _extract_menu_links(html, base_url):
+    """Parse da home (roda no pool de processos): devolve só os links do menu."""
+    return _find_top_menu_links(BeautifulSoup(html, 'html.parser'), base_url)
 
-def _normalize_text(text):
-    stop_words = r'\b(a|o|as|os|e|de|do|da|dos|das|em|no|na|nos|nas|para|por|com|um|uma|uns|umas|se|que|mas|mais|ou|é|são|oito|sete|seis|cinco|quatro|tres|dois|um|zero|etc)\b'
+def _extract_h1(html):
+    """Parse de uma página (roda no pool de processos): devolve só o texto do primeiro H1."""
+    h1_tag = BeautifulSoup(html, 'html.parser').find('h1')
+    return h1_tag.get_text(strip=True) if h1_tag else None
 
-    normalized = text.lower()
-    normalized = normalized.replace('ç', 'c').replace('á', 'a').replace('ã', 'a').replace('à', 'a').replace('â', 'a')
-    normalized = normalized.replace('é', 'e').replace('ê', 'e')
-    normalized = normalized.replace('í', 'i')
-    normalized = normalized.replace('ó', 'o').replace('õ', 'o').replace('ô', 'o')
-    normalized = normalized.replace('ú', 'u')
-    
-    normalized = re.sub(stop_words, ' ', normalized)
-    
-    normalized = re.sub(r'[^a-z0-9\s-]', ' ', normalized)
-    normalized = re.sub(r'[\s-]+', '-', normalized).strip('-')
-    
-    return normalized
-
-async def _check_page_coherence(session, page_url):
-    """Função que tenta acessar a página, com retentativas em caso de Timeout."""
+async def _check_page_coherence(session, page_url, semaphore, renderer=None):
+    """
+    Função que tenta acessar a página, com retentativas em caso de Timeout.
+    Retorna (url, texto do H1, None) ou (url, None, mensagem de falha).
+    """
     
     # Tentativas de timeout: 15s (inicial), 20s, 40s, 60s
     timeouts = [15, 20, 40, 60] 
     last_error_type = None
 
-    async with SEMAPHORE:
+    async with semaphore:
         for attempt, timeout_val in enumerate(timeouts):
             try:
-                # 1. Tenta acessar a página
-                async with session.get(page_url, timeout=timeout_val) as response:
-                    
-                    if response.status != 200:
-                        # Falha HTTP não é timeout, tenta a próxima URL imediatamente
-                        return page_url, f"Erro HTTP: {response.status}"
-                    
-                    # Se o acesso for bem-sucedido, processa a página
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-
-                    # Processamento de Coerência (Mantido)
-                    h1_tag = soup.find('h1')
-                    if not h1_tag or not h1_tag.get_text(strip=True):
-                        return page_url, "Reprovado - Página sem tag H1 ou H1 vazio."
-                    
-                    h1_text = h1_tag.get_text(strip=True)
+                # 1. Tenta acessar a página (ou usa o DOM renderizado, no modo renderizado)
+                status, html = await fetch_html(session, page_url, renderer, timeout=timeout_val)
+                if status != 200:
+                    # Falha HTTP não é timeout, tenta a próxima URL imediatamente
+                    return page_url, None, f"Erro HTTP: {status}"
 
-                    path = urlparse(page_url).path
-                    path_segments = [s for s in path.strip('/').split('/') if s]
-                    last_segment = path_segments[-1] if path_segments else ""
-                    url_segment = last_segment.rsplit('.', 1)[0] 
-                    
-                    normalized_url = _normalize_text(url_segment)
-                    normalized_h1 = _normalize_text(h1_text)
-
-                    if normalized_url in normalized_h1 and normalized_url:
-                        return page_url, "" # Aprovado
-                    else:
-                        details = (
-                            f"Reprovado - Incoerência. "
-                            f"URL Segmento (s/ stop words): **{normalized_url}**. "
-                            f"H1 Normalizado (s/ stop words): **{normalized_h1}**. "
-                            f"H1 Original: '{h1_text}'"
-                        )
-                        return page_url, details
+                # O parse roda fora do loop, sem segurar a conexão
+                h1_text = await run_parser(_extract_h1, html)
+                if not h1_text:
+                    return page_url, None, "Reprovado - Página sem tag H1 ou H1 vazio."
+
+                # A pontuação de coerência é feita em lote depois que todas as páginas chegam
+                return page_url, h1_text, None
 
             except asyncio.TimeoutError:
                 last_error_type = "TimeoutError"
@@ -116,55 +90,81 @@ async def _check_page_coherence(session, page_url):
             
             except aiohttp.ClientError as e:
                 # Outros erros de conexão (DNS, SSL, etc.) não se beneficiam de mais tentativas
-                return page_url, f"Erro ao acessar (Conexão): {type(e).__name__}"
+                return page_url, None, f"Erro ao acessar (Conexão): {type(e).__name__}"
             
             except Exception as e:
-                return page_url, f"Erro inesperado ao acessar: {type(e).__name__}"
+                return page_url, None, f"Erro inesperado ao acessar: {type(e).__name__}"
 
     # Retorna o erro de Timeout se todas as tentativas falharem
-    return page_url, f"Erro ao acessar (Timeout/Conexão): {last_error_type} após {timeouts[-1]}s."
+    return page_url, None, f"Erro ao acessar (Timeout/Conexão): {last_error_type} após {timeouts[-1]}s."
 
-async def validate_url_h1_coherence(url):
+async def validate_url_h1_coherence(url, max_pages=SITEMAP_MAX_PAGES, session=None, renderer=None,
+                                    sample_size=sampling.DEFAULT_PAGE_SAMPLE_SIZE, full_run=False):
     """
     Valida a coerência URL/H1, com retentativa para Timeouts e tolerância final a erros de acesso.
+    As páginas testadas vêm do menu principal e do sitemap do site: por padrão, todas as do
+    menu mais uma amostra estratificada de sample_size páginas do sitemap (a mesma do
+    breadcrumbs), com a taxa de incoerência estimada para o site; com full_run, as páginas
+    em ordem até max_pages (max_pages só vale para full_run).
+    No modo DOM renderizado (renderer.dom_mode), menu e H1 são lidos do HTML pós-JS.
     """
     fail_results = {}
     has_content_failure = False # Flag para rastrear se houve falha de conteúdo/coerência
     
     try:
-        global SEMAPHORE
-        SEMAPHORE = asyncio.Semaphore(CONCURRENCY_LIMIT)
+        # Semáforo por chamada: auditorias simultâneas (modo serviço) não dividem o limite
+        semaphore = asyncio.Semaphore(CONCURRENCY_LIMIT)
 
-        async with aiohttp.ClientSession() as session:
+        async with open_session(session) as session:
             # Acesso à home
-            async with session.get(url, timeout=15) as response:
-                if response.status != 200:
-                    return {
-                        "module": "url_h1_coherence",
-                        "result": "erro",
-                        "details": f"Não foi possível acessar a home. Status: {response.status}"
-                    }
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                internal_links = _find_top_menu_links(soup, url)
-                total_links = len(internal_links)
-
-                if not internal_links:
-                    return {
-                        "module": "url_h1_coherence",
-                        "result": "reprovado",
-                        "details": "Não foram encontrados links válidos no menu de navegação principal para validação."
-                    }
-
-            tasks = [_check_page_coherence(session, link) for link in internal_links]
-            page_results = await asyncio.gather(*tasks)
+            status, html = await fetch_html(session, url, renderer, timeout=15)
+            if status != 200:
+                return {
+                    "module": "url_h1_coherence",
+                    "result": "erro",
+                    "details": f"Não foi possível acessar a home. Status: {status}"
+                }
+            internal_links = await run_parser(_extract_menu_links, html, url)
+
+            check = lambda link: _check_page_coherence(session, link, semaphore, renderer)
+            sample = None
+            if full_run:
+                # Páginas do menu primeiro, depois as do sitemap, consumidas por uma fila limitada
+                page_results = await run_page_checks(
+                    session, url, check, seed_urls=internal_links, max_pages=max_pages, workers=CONCURRENCY_LIMIT
+                )
+            else:
+                page_results, sample, stratum_sizes, menu_pages, truncated = await run_sampled_page_checks(
+                    session, url, check, seed_urls=internal_links, sample_size=sample_size,
+                    workers=CONCURRENCY_LIMIT, seed=sampling.site_seed(url)
+                )
+            total_links = len(page_results)
+
+            if not page_results:
+                return {
+                    "module": "url_h1_coherence",
+                    "result": "reprovado",
+                    "details": "Não foram encontrados links válidos no menu de navegação principal nem no sitemap para validação."
+                }
 
             # Contadores
             unreachable_links = 0
-            
-            for page_url, detail in page_results:
-                if detail: 
+
+            # Pontua todas as páginas com H1 em um único lote
+            h1_pairs = [(page_url, h1_text) for page_url, h1_text, detail in page_results if h1_text]
+            for score in score_pairs(h1_pairs):
+                if not score.coherent:
+                    fail_results[score.url] = (
+                        f"Reprovado - Incoerência. "
+                        f"Similaridade: {score.score:.0%} (mínimo {COHERENCE_THRESHOLD:.0%}). "
+                        f"URL Segmento (s/ stop words): **{score.url_tokens}**. "
+                        f"H1 Normalizado (s/ stop words): **{score.h1_tokens}**. "
+                        f"H1 Original: '{score.h1}'"
+                    )
+                    has_content_failure = True
+
+            for page_url, h1_text, detail in page_results:
+                if detail:
                     fail_results[page_url] = detail
                     
                     if detail.startswith("Reprovado"):
@@ -188,12 +188,24 @@ async def validate_url_h1_coherence(url):
                 # Prioridade 3: Se não houve falhas de conteúdo E os erros de conexão são toleráveis (abaixo de 30%)
                 final_status = "aprovado"
 
+            # Taxa de páginas reprovadas estimada para o site inteiro a partir da amostra
+            estimate_text = None
+            if sample is not None:
+                failed_pages = [page for page, detail in fail_results.items() if detail.startswith("Reprovado")]
+                estimate_text = sampling.describe(
+                    sampling.estimate(failed_pages, sample, stratum_sizes, menu_pages, truncated), "páginas"
+                )
+
             # 2. Define os detalhes finais
             if final_status == "aprovado":
                 links_checked = total_links - unreachable_links
                 final_details = f"Aprovado! Coerência URL/H1 verificada em {links_checked} páginas. ({unreachable_links} erros de acesso ignorados, erro total: {error_percentage:.1f}%)."
+                if estimate_text:
+                    final_details += f" Taxa estimada de incoerência: {estimate_text}."
             else:
                 final_details = fail_results
+                if estimate_text:
+                    final_details["_Taxa Estimada de Incoerência"] = estimate_text
                 if final_status == "erro":
                     final_details["_Resumo"] = f"ERRO GERAL: Não foi possível acessar {unreachable_links} de {total_links} links. (Erro: {error_percentage:.1f}%). Limite de tolerância excedido (30%)."
                 
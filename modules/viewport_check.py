@@ -1,30 +1,39 @@
 import aiohttp
 import asyncio
 from bs4 import BeautifulSoup
+from core.http import open_session
+from core.parsing import run_parser
+from core.render import fetch_html
 
 # Limite de concorrência global
 CONCURRENCY_LIMIT = 5
 SEMAPHORE = asyncio.Semaphore(CONCURRENCY_LIMIT)
 
 
-async def validate_viewport_meta_tag(url: str):
+def _extract_viewport_content(html):
+    """Parse da página (roda no pool de processos): conteúdo da meta viewport, ou None."""
+    viewport_tag = BeautifulSoup(html, 'html.parser').find('meta', attrs={'name': 'viewport'})
+    return viewport_tag.get('content', '') if viewport_tag else None
+
+
+async def validate_viewport_meta_tag(url: str, session=None, renderer=None):
     
     base_url = url.strip('/')
     
     try:
-        async with aiohttp.ClientSession() as session:
+        async with open_session(session) as session:
             
             page_html = None
             async with SEMAPHORE:
                 try:
-                    async with session.get(base_url, timeout=20) as response:
-                        if response.status != 200:
-                             return {
-                                "module": "viewport_check",
-                                "result": "erro",
-                                "details": f"Erro ao acessar a URL: HTTP {response.status}"
-                            }
-                        page_html = await response.text()
+                    # HTML do servidor ou, no modo DOM renderizado, o da renderização compartilhada
+                    status, page_html = await fetch_html(session, base_url, renderer, timeout=20)
+                    if status != 200:
+                        return {
+                            "module": "viewport_check",
+                            "result": "erro",
+                            "details": f"Erro ao acessar a URL: HTTP {status}"
+                        }
                 except (asyncio.TimeoutError, aiohttp.ClientError) as e:
                     return {
                         "module": "viewport_check",
@@ -35,21 +44,17 @@ async def validate_viewport_meta_tag(url: str):
             if not page_html:
                 return {"module": "viewport_check", "result": "erro", "details": "Conteúdo da página não obtido."}
 
-            soup = BeautifulSoup(page_html, 'html.parser')
-            
             # Procura pela tag meta viewport
-            viewport_tag = soup.find('meta', attrs={'name': 'viewport'})
+            content_attr = await run_parser(_extract_viewport_content, page_html)
             
             # --- 1. Verificação de Existência ---
-            if not viewport_tag:
+            if content_attr is None:
                 return {
                     "module": "viewport_check",
                     "result": "reprovado",
                     "details": "REPROVADO: A tag `<meta name=\"viewport\">` está **faltando** no `<head>` da página."
                 }
             
-            content_attr = viewport_tag.get('content', '')
-            
             # Converte o conteúdo para uma lista de atributos para facilitar a verificação
             attributes = {attr.strip().split('=')[0]: attr.strip().split('=')[1] 
                           for attr in content_attr.split(',') if '=' in attr}
@@ -1,17 +1,20 @@
-import aiohttp
 import asyncio
+from core.http import open_session
+
+# Camada de execução (core.validator): APIs externas e navegador rodam por último
+TIER = 2
 
 W3C_CSS_VALIDATOR_URL = "https://jigsaw.w3.org/css-validator/validator"
 CONCURRENCY_LIMIT = 3
 SEMAPHORE = asyncio.Semaphore(CONCURRENCY_LIMIT)
 
 
-async def validate_w3c_css(url):
+async def validate_w3c_css(url, session=None):
     base_url = url.strip('/')
     params = {'uri': base_url, 'profile': 'css3', 'output': 'json', 'medium': 'all'}
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with open_session(session) as session:
             async with SEMAPHORE:
                 async with session.get(W3C_CSS_VALIDATOR_URL, params=params, timeout=45) as response:
                     if response.status >= 500:
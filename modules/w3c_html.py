@@ -1,17 +1,20 @@
-import aiohttp
 import asyncio
+from core.http import open_session
+
+# Camada de execução (core.validator): APIs externas e navegador rodam por último
+TIER = 2
 
 W3C_HTML_VALIDATOR_URL = "https://validator.w3.org/nu/"
 CONCURRENCY_LIMIT = 3 
 SEMAPHORE = asyncio.Semaphore(CONCURRENCY_LIMIT)
 
 
-async def validate_w3c_html(url):
+async def validate_w3c_html(url, session=None):
     base_url = url.strip('/')
     params = {'doc': base_url, 'out': 'json'}
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with open_session(session) as session:
             async with SEMAPHORE:
                 async with session.get(W3C_HTML_VALIDATOR_URL, params=params, timeout=45) as response:
                     if response.status >= 500:
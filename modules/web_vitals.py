@@ -0,0 +1,206 @@
+from core.render import NetworkRecorder, PageRenderer, RENDER_TIMEOUT_MS, NETWORK_IDLE_TIMEOUT_MS, SCREEN_RESOLUTIONS
+
+# Camada de execução (core.validator): APIs externas e navegador rodam por último
+TIER = 2
+
+# Limites (bom, ruim) de cada métrica; acima de "ruim" reprova, entre os dois fica em atenção.
+# Tempos em ms; CLS sem unidade. Valores de referência do Core Web Vitals / Lighthouse.
+WEB_VITALS_THRESHOLDS = {
+    "ttfb": (800, 1800),
+    "fcp": (1800, 3000),
+    "lcp": (2500, 4000),
+    "cls": (0.1, 0.25),
+    "tbt": (200, 600),
+}
+
+# Perfis de throttling (CDP) que emulam dispositivos móveis; None = sem throttling
+THROTTLING_PROFILES = {
+    "mobile_4g": {"cpu_rate": 4, "latency_ms": 150, "download_kbps": 1600, "upload_kbps": 750},
+    "slow_3g": {"cpu_rate": 6, "latency_ms": 400, "download_kbps": 400, "upload_kbps": 400},
+}
+DEFAULT_THROTTLING = None
+
+# Tempo de espera após o load para o LCP e os layout shifts tardios se estabilizarem
+SETTLE_MS = 1000
+
+METRIC_LABELS = {"ttfb": "TTFB", "fcp": "FCP", "lcp": "LCP", "cls": "CLS", "tbt": "TBT"}
+
+# Observadores instalados antes de qualquer script da página
+OBSERVERS_JS = """
+(() => {
+    window.__vitals = {lcp: 0, cls: 0, longTasks: []};
+    const observe = (type, callback) => {
+        try { new PerformanceObserver(list => list.getEntries().forEach(callback)).observe({type, buffered: true}); }
+        catch (e) {}
+    };
+    observe('largest-contentful-paint', e => { window.__vitals.lcp = e.renderTime || e.loadTime || e.startTime; });
+    observe('layout-shift', e => { if (!e.hadRecentInput) window.__vitals.cls += e.value; });
+    observe('longtask', e => { window.__vitals.longTasks.push([e.startTime, e.duration]); });
+})();
+"""
+
+COLLECT_JS = """
+(() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+    const fcpTime = fcp ? fcp.startTime : null;
+    const vitals = window.__vitals || {lcp: 0, cls: 0, longTasks: []};
+    // TBT: parte de cada tarefa longa acima de 50 ms, depois do FCP
+    let tbt = 0;
+    for (const [start, duration] of vitals.longTasks) {
+        if (fcpTime === null || start >= fcpTime) tbt += Math.max(0, duration - 50);
+    }
+    return {
+        ttfb: nav ? nav.responseStart : null,
+        fcp: fcpTime,
+        lcp: vitals.lcp || null,
+        cls: vitals.cls,
+        tbt: tbt,
+    };
+})()
+"""
+
+
+async def _apply_throttling(context, page, profile):
+    cdp = await context.new_cdp_session(page)
+    await cdp.send("Network.enable")
+    await cdp.send("Network.emulateNetworkConditions", {
+        "offline": False,
+        "latency": profile["latency_ms"],
+        "downloadThroughput": profile["download_kbps"] * 1024 / 8,
+        "uploadThroughput": profile["upload_kbps"] * 1024 / 8,
+    })
+    await cdp.send("Emulation.setCPUThrottlingRate", {"rate": profile["cpu_rate"]})
+
+
+async def _measure_viewport(browser, url, size, profile):
+    """Carrega a página com cache vazio no tamanho de tela dado e coleta as métricas."""
+    context = await browser.new_context(viewport=size)
+    try:
+        await context.add_init_script(OBSERVERS_JS)
+        page = await context.new_page()
+        if profile:
+            await _apply_throttling(context, page, profile)
+        recorder = NetworkRecorder(page)
+        await page.goto(url, timeout=RENDER_TIMEOUT_MS, wait_until='load')
+        try:
+            await page.wait_for_load_state('networkidle', timeout=NETWORK_IDLE_TIMEOUT_MS)
+        except Exception:
+            pass
+        await page.wait_for_timeout(SETTLE_MS)
+        metrics = await page.evaluate(COLLECT_JS)
+        network_log = await recorder.finish()
+    finally:
+        await context.close()
+
+    metrics["requests"] = len(network_log)
+    metrics["transfer_size"] = sum(entry['transfer_size'] for entry in network_log)
+    return metrics
+
+
+def _format_metric(name, value):
+    if value is None:
+        return "n/d"
+    if name == "cls":
+        return f"{value:.3f}"
+    return f"{value / 1000:.2f} s" if value >= 1000 else f"{value:.0f} ms"
+
+
+def _rate(metrics, thresholds):
+    """Lista de (métrica, valor, limite, status) das métricas acima do limite 'bom'."""
+    exceeded = []
+    for name, (good, poor) in thresholds.items():
+        value = metrics.get(name)
+        if value is None:
+            continue
+        if value > poor:
+            exceeded.append((name, value, poor, "reprovado"))
+        elif value > good:
+            exceeded.append((name, value, good, "atencao"))
+    return exceeded
+
+
+async def validate_web_vitals(url, renderer=None, throttling=DEFAULT_THROTTLING, thresholds=None):
+    """
+    Mede TTFB, FCP, LCP, CLS, TBT, número de requisições e bytes transferidos em cada
+    resolução de SCREEN_RESOLUTIONS, opcionalmente sob um perfil de throttling de CPU e
+    rede (THROTTLING_PROFILES). Os limites de WEB_VITALS_THRESHOLDS podem ser sobrescritos.
+    Um renderer desativado (replay de cassete) não abre navegador: o módulo não se aplica.
+    """
+    own_renderer = renderer is None
+    if own_renderer:
+        renderer = PageRenderer()
+    try:
+        browser = await renderer.get_browser()
+        if browser is None:
+            return {
+                "module": "web_vitals",
+                "result": "nao_se_aplica",
+                "details": f"{renderer.unavailable_reason or 'Navegador indisponível'}; não foi possível medir a velocidade da página."
+            }
+
+        if throttling and throttling not in THROTTLING_PROFILES:
+            return {
+                "module": "web_vitals",
+                "result": "erro",
+                "details": f"Perfil de throttling desconhecido: {throttling} (disponíveis: {', '.join(THROTTLING_PROFILES)})."
+            }
+        profile = THROTTLING_PROFILES.get(throttling) if throttling else None
+        limits = {**WEB_VITALS_THRESHOLDS, **(thresholds or {})}
+
+        # As resoluções são medidas uma de cada vez para que não disputem CPU e banda
+        measurements = {}
+        for name, size in SCREEN_RESOLUTIONS.items():
+            try:
+                measurements[name] = await _measure_viewport(browser, url, size, profile)
+            except Exception as e:
+                measurements[name] = e
+
+        status = "aprovado"
+        summary = []
+        exceeded_list = []
+        failures = []
+        for name, metrics in measurements.items():
+            if isinstance(metrics, Exception):
+                failures.append(f"{name}: {type(metrics).__name__}")
+                continue
+            values = ", ".join(f"{METRIC_LABELS[m]} {_format_metric(m, metrics.get(m))}" for m in METRIC_LABELS)
+            summary.append(f"{name}: {values}, {metrics['requests']} requisições, {metrics['transfer_size'] / 1024:.0f} KB")
+            for metric, value, limit, level in _rate(metrics, limits):
+                exceeded_list.append(
+                    f"{name}: {METRIC_LABELS[metric]} {_format_metric(metric, value)} (limite {_format_metric(metric, limit)})"
+                )
+                if level == "reprovado" or status == "aprovado":
+                    status = level
+
+        if not summary:
+            return {
+                "module": "web_vitals",
+                "result": "erro",
+                "details": f"Não foi possível medir a página em nenhuma resolução: {', '.join(failures)}"
+            }
+
+        details = {
+            "Perfil de Throttling": throttling or "sem throttling",
+            "Métricas por Resolução": summary,
+        }
+        if exceeded_list:
+            details["Métricas Acima do Limite"] = exceeded_list
+        if failures:
+            details["Resoluções Não Medidas"] = failures
+
+        return {
+            "module": "web_vitals",
+            "result": status,
+            "details": details
+        }
+
+    except Exception as e:
+        return {
+            "module": "web_vitals",
+            "result": "erro",
+            "details": f"Ocorreu um erro ao medir a velocidade da página: {type(e).__name__}"
+        }
+    finally:
+        if own_renderer:
+            await renderer.close()